@@ -0,0 +1,4 @@
+"""
+Benchmarks for ComfyUI-VideoDescription
+Standalone scripts, not imported by ComfyUI
+"""
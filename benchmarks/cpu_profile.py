@@ -0,0 +1,135 @@
+"""
+CPU profile benchmark
+Builds a tiny random-weight Qwen3-VL from a config (no download) and compares
+decode tokens/sec on CPU for float16 (the old default), float32, bfloat16 and
+int8 dynamic quantization, each with CPUProfile's thread tuning.
+
+Random weights make the text meaningless but the compute identical to a real
+checkpoint of the same shape; scale --hidden-size/--layers up to approach the
+2B model's shape.
+
+Usage:
+    python benchmarks/cpu_profile.py --hidden-size 1024 --layers 8 --new-tokens 64
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import torch
+
+# Make the repo root importable when run as a script
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from models.cpu_profile import CPUProfile  # noqa: E402
+
+
+def build_tiny_model(hidden_size: int, layers: int, vocab_size: int, seed: int):
+    """Random-weight Qwen3-VL with a small text and vision tower"""
+    from transformers import Qwen3VLConfig, Qwen3VLForConditionalGeneration
+
+    head_dim = 64
+    heads = max(1, hidden_size // head_dim)
+    config = Qwen3VLConfig(
+        text_config={
+            "vocab_size": vocab_size,
+            "hidden_size": hidden_size,
+            "intermediate_size": hidden_size * 3,
+            "num_hidden_layers": layers,
+            "num_attention_heads": heads,
+            "num_key_value_heads": max(1, heads // 2),
+            "head_dim": head_dim,
+            "max_position_embeddings": 4096,
+            "rope_scaling": {"rope_type": "default", "mrope_section": [12, 10, 10], "mrope_interleaved": True},
+        },
+        vision_config={
+            "depth": 2,
+            "hidden_size": 128,
+            "intermediate_size": 256,
+            "num_heads": 2,
+            "out_hidden_size": hidden_size,
+            "deepstack_visual_indexes": [0],
+        },
+    )
+    torch.manual_seed(seed)
+    return Qwen3VLForConditionalGeneration(config).eval()
+
+
+def tokens_per_second(model, prompt_tokens: int, new_tokens: int, vocab_size: int, runs: int) -> float:
+    input_ids = torch.randint(0, vocab_size, (1, prompt_tokens))
+    generate_kwargs = dict(
+        input_ids=input_ids,
+        attention_mask=torch.ones_like(input_ids),
+        max_new_tokens=new_tokens,
+        min_new_tokens=new_tokens,
+        do_sample=False,
+    )
+
+    with torch.no_grad():
+        model.generate(**generate_kwargs)  # warm-up
+        start = time.perf_counter()
+        for _ in range(runs):
+            model.generate(**generate_kwargs)
+        elapsed = time.perf_counter() - start
+
+    return new_tokens * runs / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CPU inference profiles on a tiny Qwen3-VL")
+    parser.add_argument("--hidden-size", type=int, default=512)
+    parser.add_argument("--layers", type=int, default=4)
+    parser.add_argument("--vocab-size", type=int, default=32000)
+    parser.add_argument("--prompt-tokens", type=int, default=256)
+    parser.add_argument("--new-tokens", type=int, default=32)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None, help="Intra-op threads (default: physical cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    threads, interop = CPUProfile.tune_threads(args.threads)
+    profiles = [("float16", "none"), ("float32", "none"), ("float32", "int8")]
+    if CPUProfile.supports_bf16():
+        profiles.insert(2, ("bfloat16", "none"))
+
+    results = []
+    baseline = None
+    for dtype_name, quantization in profiles:
+        model = build_tiny_model(args.hidden_size, args.layers, args.vocab_size, args.seed)
+        model = model.to(getattr(torch, dtype_name))
+        if quantization == "int8":
+            model = CPUProfile.quantize_int8(model)
+
+        rate = tokens_per_second(model, args.prompt_tokens, args.new_tokens, args.vocab_size, args.runs)
+        if baseline is None:
+            baseline = rate
+
+        size_bytes = model.get_memory_footprint()
+        if quantization == "int8":
+            size_bytes += CPUProfile.packed_weight_bytes(model)
+
+        results.append({
+            "dtype": dtype_name,
+            "quantization": quantization,
+            "tokens_per_s": round(rate, 2),
+            "speedup_vs_float16": round(rate / baseline, 2),
+            "memory_mb": round(size_bytes / 1024 ** 2, 1),
+        })
+        del model
+
+    print(json.dumps({
+        "hidden_size": args.hidden_size,
+        "layers": args.layers,
+        "threads": {"intra_op": threads, "inter_op": interop},
+        "native_bf16": CPUProfile.supports_bf16(),
+        "selected_dtype": CPUProfile.select_dtype(),
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
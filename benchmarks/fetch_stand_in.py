@@ -0,0 +1,260 @@
+"""
+Offline stand-in for the Hugging Face hub, for testing download_models.py
+Serves a local directory as a model repo over HTTP with the two endpoints the
+fetcher uses:
+    GET /api/models/<org>/<name>/revision/<rev>   manifest with sizes and hashes
+    GET /<org>/<name>/resolve/<sha>/<file>        file, with Range support
+
+Failure injection (--fail-every, --no-range) exercises retries, resume and
+the single-stream fallback.
+
+Usage:
+    # serve a directory
+    python benchmarks/fetch_stand_in.py serve --repo-dir ./fake_repo --port 8765
+    python download_models.py --model 2B --endpoint http://127.0.0.1:8765 --models-root /tmp/models
+
+    # self-test: random shards, interrupted + resumed download, byte-for-byte check
+    python benchmarks/fetch_stand_in.py self-test --shard-mb 48 --shards 3
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import resource
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+# Make the repo root importable when run as a script
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import download_models  # noqa: E402
+
+# Files above this size (and all safetensors) are listed as LFS, like on the hub
+LFS_THRESHOLD = 10 * 1024 * 1024
+
+
+def build_manifest(repo_dir: Path) -> dict:
+    """Hub-style revision manifest for every file under repo_dir"""
+    siblings = []
+    for path in sorted(p for p in repo_dir.rglob("*") if p.is_file()):
+        name = path.relative_to(repo_dir).as_posix()
+        size = path.stat().st_size
+        if size > LFS_THRESHOLD or name.endswith(".safetensors"):
+            digest = download_models.file_digest(path, "sha256", size)
+            siblings.append({"rfilename": name, "size": size, "blobId": "0" * 40,
+                             "lfs": {"sha256": digest, "size": size, "pointerSize": 134}})
+        else:
+            digest = download_models.file_digest(path, "git-sha1", size)
+            siblings.append({"rfilename": name, "size": size, "blobId": digest})
+
+    sha = hashlib.sha1(json.dumps(siblings, sort_keys=True).encode()).hexdigest()
+    return {"sha": sha, "siblings": siblings}
+
+
+def make_handler(repo_id: str, repo_dir: Path, manifest: dict, fail_every: int, allow_range: bool):
+    """Request handler class bound to one repo"""
+    requests = {"count": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            path = unquote(urlparse(self.path).path)
+
+            if path.startswith(f"/api/models/{repo_id}/revision/"):
+                body = json.dumps(manifest).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            prefix = f"/{repo_id}/resolve/{manifest['sha']}/"
+            file_path = repo_dir / path[len(prefix):] if path.startswith(prefix) else None
+            if file_path is None or not file_path.is_file():
+                self.send_error(404)
+                return
+
+            size = file_path.stat().st_size
+            start, end = 0, size - 1
+            match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+            ranged = allow_range and match is not None
+            if ranged:
+                start = int(match.group(1))
+                end = min(int(match.group(2)) if match.group(2) else size - 1, size - 1)
+
+            with lock:
+                requests["count"] += 1
+                fail = fail_every and requests["count"] % fail_every == 0
+
+            self.send_response(206 if ranged else 200)
+            self.send_header("Content-Length", str(end - start + 1))
+            if ranged:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.end_headers()
+
+            with open(file_path, "rb") as f:
+                f.seek(start)
+                remaining = end - start + 1
+                # Injected failure: send half the body, then drop the connection
+                limit = remaining // 2 if fail else remaining
+                try:
+                    while limit > 0:
+                        chunk = f.read(min(1024 * 1024, limit))
+                        if not chunk:
+                            break
+                        self.wfile.write(chunk)
+                        limit -= len(chunk)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client gave up (e.g. the simulated interruption)
+                    self.close_connection = True
+            if fail:
+                self.close_connection = True
+
+    return Handler
+
+
+def serve(repo_id: str, repo_dir: Path, port: int, fail_every: int = 0, allow_range: bool = True):
+    """Start the stand-in in a background thread"""
+    manifest = build_manifest(repo_dir)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(repo_id, repo_dir, manifest, fail_every,
+                                                                   allow_range))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, manifest
+
+
+def self_test(args) -> int:
+    repo_id = "Qwen/Qwen3-VL-2B-Instruct"
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_dir = Path(tmp) / "repo"
+        repo_dir.mkdir()
+        shard_names = [f"model-{i + 1:05d}-of-{args.shards:05d}.safetensors" for i in range(args.shards)]
+        for name in shard_names:
+            with open(repo_dir / name, "wb") as f:
+                for _ in range(args.shard_mb):
+                    f.write(os.urandom(1024 * 1024))
+        (repo_dir / "config.json").write_text(json.dumps({"model_type": "qwen3_vl"}))
+        (repo_dir / "model.safetensors.index.json").write_text(
+            json.dumps({"weight_map": {f"layer.{i}": name for i, name in enumerate(shard_names)}})
+        )
+
+        # Pass 1: flaky server, parallel ranged parts with retries
+        server, manifest = serve(repo_id, repo_dir, args.port, fail_every=args.fail_every)
+        endpoint = f"http://127.0.0.1:{args.port}"
+        models_root = Path(tmp) / "models"
+
+        start = time.perf_counter()
+        snapshot_dir = download_models.fetch_repo(
+            repo_id, models_root, endpoint=endpoint, workers=args.workers, part_mb=args.part_mb
+        )
+        results["flaky_download_s"] = round(time.perf_counter() - start, 2)
+        server.shutdown()
+
+        # Pass 2: interrupted mid-file, then resumed from the parts sidecar
+        resume_root = Path(tmp) / "models_resume"
+        server, _ = serve(repo_id, repo_dir, args.port + 1)
+        resume_endpoint = f"http://127.0.0.1:{args.port + 1}"
+        original_fetch_range = download_models._fetch_range
+        calls = {"count": 0}
+
+        def interrupting_fetch_range(*fetch_args):
+            calls["count"] += 1
+            if calls["count"] > 2:
+                raise KeyboardInterrupt("simulated interruption")
+            return original_fetch_range(*fetch_args)
+
+        download_models._fetch_range = interrupting_fetch_range
+        try:
+            download_models.fetch_repo(repo_id, resume_root, endpoint=resume_endpoint, workers=1,
+                                       part_mb=args.part_mb)
+        except KeyboardInterrupt:
+            pass
+        download_models._fetch_range = original_fetch_range
+
+        leftover = list(resume_root.rglob("*.incomplete.parts"))
+        results["parts_sidecar_after_interrupt"] = len(leftover)
+        resumed_snapshot = download_models.fetch_repo(repo_id, resume_root, endpoint=resume_endpoint,
+                                                      workers=args.workers, part_mb=args.part_mb)
+        server.shutdown()
+
+        # Pass 3: server without Range support falls back to single streams
+        server, _ = serve(repo_id, repo_dir, args.port + 2, allow_range=False)
+        stream_snapshot = download_models.fetch_repo(
+            repo_id, Path(tmp) / "models_stream", endpoint=f"http://127.0.0.1:{args.port + 2}",
+            workers=args.workers, part_mb=args.part_mb
+        )
+        server.shutdown()
+
+        failures = []
+        for snapshot in (snapshot_dir, resumed_snapshot, stream_snapshot):
+            for sibling in manifest["siblings"]:
+                name = sibling["rfilename"]
+                if (snapshot / name).read_bytes() != (repo_dir / name).read_bytes():
+                    failures.append(f"{snapshot.parent.parent.parent.name}/{name} differs")
+            ref = snapshot.parent.parent / "refs" / "main"
+            if not ref.is_file() or ref.read_text() != snapshot.name:
+                failures.append(f"{ref} missing or wrong")
+        if not leftover:
+            failures.append("interrupted download left no parts sidecar to resume from")
+
+        results["total_mb"] = args.shard_mb * args.shards
+        # ru_maxrss is KB on Linux, bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        results["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1024 ** 2, 1)
+        results["failures"] = failures
+
+    print(json.dumps(results, indent=2))
+    return 1 if results["failures"] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Hugging Face hub stand-in for download_models.py")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = sub.add_parser("serve", help="Serve a directory as a model repo")
+    serve_parser.add_argument("--repo-dir", required=True)
+    serve_parser.add_argument("--repo-id", default="Qwen/Qwen3-VL-8B-Instruct")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--fail-every", type=int, default=0, help="Drop every Nth file response halfway")
+    serve_parser.add_argument("--no-range", action="store_true", help="Ignore Range headers")
+
+    test_parser = sub.add_parser("self-test", help="Download random shards through the stand-in and compare")
+    test_parser.add_argument("--shards", type=int, default=3)
+    test_parser.add_argument("--shard-mb", type=int, default=24)
+    test_parser.add_argument("--part-mb", type=int, default=4)
+    test_parser.add_argument("--workers", type=int, default=8)
+    test_parser.add_argument("--fail-every", type=int, default=5)
+    test_parser.add_argument("--port", type=int, default=8765)
+
+    args = parser.parse_args()
+    if args.command == "self-test":
+        sys.exit(self_test(args))
+
+    server, manifest = serve(args.repo_id, Path(args.repo_dir), args.port, args.fail_every, not args.no_range)
+    print(f"Serving {args.repo_id} ({len(manifest['siblings'])} files, revision {manifest['sha']}) "
+          f"at http://127.0.0.1:{args.port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
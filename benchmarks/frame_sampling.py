@@ -0,0 +1,81 @@
+"""
+Frame sampling benchmark
+Compares the full-decode (sequential) path with sparse grab/seek decoding
+on long synthetic videos.
+
+Usage:
+    python benchmarks/frame_sampling.py --duration 1800 --fps 1.0
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Make the repo root importable when run as a script
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.synthetic import make_synthetic_video  # noqa: E402
+from processing.video_processor import VideoProcessor  # noqa: E402
+
+
+def time_extraction(video_path: Path, fps: float, decode_mode: str) -> dict:
+    """Time a single extract_frames call"""
+    start = time.perf_counter()
+    frames = VideoProcessor.extract_frames(video_path, fps=fps, decode_mode=decode_mode)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "decode_mode": decode_mode,
+        "frames": len(frames),
+        "wall_time_s": round(elapsed, 4),
+        "frames_per_s": round(len(frames) / elapsed, 2) if elapsed > 0 else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sparse vs. sequential frame sampling")
+    parser.add_argument("--duration", type=float, nargs="+", default=[600.0],
+                        help="Synthetic video durations in seconds")
+    parser.add_argument("--video-fps", type=float, default=30.0, help="Source frame rate")
+    parser.add_argument("--fps", type=float, default=1.0, help="Sampling rate")
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=240)
+    parser.add_argument("--workdir", type=str, default=None, help="Directory for generated videos")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(args.workdir) if args.workdir else Path(tmp)
+
+        for duration in args.duration:
+            video_path = workdir / f"synthetic_{int(duration)}s.mp4"
+            if not video_path.exists():
+                make_synthetic_video(
+                    video_path,
+                    duration=duration,
+                    fps=args.video_fps,
+                    width=args.width,
+                    height=args.height
+                )
+
+            runs = [time_extraction(video_path, args.fps, mode) for mode in ("sequential", "sparse")]
+            speedup = runs[0]["wall_time_s"] / runs[1]["wall_time_s"] if runs[1]["wall_time_s"] > 0 else None
+
+            results.append({
+                "duration_s": duration,
+                "video_fps": args.video_fps,
+                "sampling_fps": args.fps,
+                "runs": runs,
+                "speedup": round(speedup, 2) if speedup else None,
+            })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
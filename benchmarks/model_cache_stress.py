@@ -0,0 +1,212 @@
+"""
+ModelCache concurrency check
+Hammers ModelCache from many threads with a tiny stand-in model in place of
+Qwen3-VL and asserts that:
+- each variant is never loaded by two threads at once (single-flight)
+- a leased model is never released or offloaded while the lease is held,
+  with the idle policy offloading (hot → warm) and restoring concurrently
+- every acquire returns the processor registered for its model, even while
+  clear_cache() runs concurrently
+- no leases or deferred releases are left over at the end
+
+Weight and processor loading and device detection are patched (the shared
+processor memo itself runs for real), and offloading is enabled for the CPU
+stand-in with a slow .to() so copies overlap other requests. This runs on
+CPU in seconds without any model files. Raises AssertionError and exits
+non-zero on any violation.
+
+Usage:
+    python benchmarks/model_cache_stress.py --threads 32 --iterations 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import torch
+
+# Make the repo root importable when run as a script
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from models.model_cache import ModelCache  # noqa: E402
+from models.model_registry import MODEL_REGISTRY  # noqa: E402
+
+
+class TinyModel(torch.nn.Module):
+    """Stand-in exposing the bits of the HF model API ModelCache touches"""
+
+    # Simulated device copy time, so offloads and restores overlap other requests
+    move_delay = 0.005
+
+    def __init__(self, hidden: int = 256):
+        super().__init__()
+        self.proj = torch.nn.Linear(hidden, hidden)
+
+    def to(self, *args, **kwargs):
+        time.sleep(self.move_delay)
+        return super().to(*args, **kwargs)
+
+    @property
+    def device(self) -> torch.device:
+        return self.proj.weight.device
+
+    def get_memory_footprint(self) -> int:
+        return sum(p.numel() * p.element_size() for p in self.parameters())
+
+
+class StandIn:
+    """Patches ModelCache's loading path and records load concurrency"""
+
+    def __init__(self, load_delay: float):
+        self.load_delay = load_delay
+        self.lock = threading.Lock()
+        self.active = Counter()
+        self.max_active = Counter()
+        self.loads = Counter()
+        self.transitions = Counter()
+
+    def install(self):
+        stand_in = self
+        record_transition = ModelCache._record_transition
+
+        def count_transition(cls, key, source, target, reason, seconds):
+            with stand_in.lock:
+                stand_in.transitions[(source, target)] += 1
+            record_transition(key, source, target, reason, seconds)
+
+        def load_model(cls, key, model_source, local_model_exists, model_path):
+            with stand_in.lock:
+                stand_in.active[key] += 1
+                stand_in.loads[key] += 1
+                stand_in.max_active[key] = max(stand_in.max_active[key], stand_in.active[key])
+            try:
+                time.sleep(stand_in.load_delay)
+                return TinyModel()
+            finally:
+                with stand_in.lock:
+                    stand_in.active[key] -= 1
+
+        ModelCache._load_model = classmethod(load_model)
+        ModelCache._load_processor = staticmethod(lambda *args: object())
+        ModelCache._resolve_model_source = classmethod(lambda cls, model_id: ("stand-in", True, REPO_ROOT))
+        ModelCache._detect_device = staticmethod(lambda: ("cpu", None))
+        # Real CPU variants never offload; the stand-in can, so hot → warm runs
+        ModelCache._can_offload = staticmethod(lambda key, model: True)
+        ModelCache._record_transition = classmethod(count_transition)
+        # Two variants on one device so budget evictions compete with leases
+        ModelCache.resolve_variant = classmethod(
+            lambda cls, use_4bit=False, model_size="8B": (
+                MODEL_REGISTRY[model_size]["repo_id"], "4bit" if use_4bit else "none", "float16", "cpu"
+            )
+        )
+
+
+def worker(iterations: int, seed: int, failures: list, counts: Counter, lock: threading.Lock):
+    rng = random.Random(seed)
+    for _ in range(iterations):
+        use_4bit = rng.random() < 0.5
+        key = ModelCache.resolve_variant(use_4bit)
+        action = rng.choices(["lease", "get", "clear", "idle"], weights=[70, 20, 5, 5])[0]
+
+        try:
+            if action == "lease":
+                with ModelCache.lease(use_4bit) as (model, processor):
+                    time.sleep(rng.uniform(0, 0.005))
+                    entry = ModelCache._entries.get(key)
+                    if entry is None or entry["model"] is not model:
+                        failures.append(f"leased model for {key[1]} was released")
+                    elif entry["tier"] != "hot":
+                        failures.append(f"leased model for {key[1]} was offloaded")
+                    if ModelCache._processors.get(key[0]) is not processor:
+                        failures.append(f"leased processor for {key[1]} was dropped or replaced")
+            elif action == "get":
+                _, processor = ModelCache.get_qwen3vl(use_4bit)
+                if processor is None:
+                    failures.append(f"get for {key[1]} returned no processor")
+            elif action == "clear":
+                ModelCache.clear_cache()
+            else:
+                ModelCache.apply_idle_policy(now=time.time() + rng.uniform(0, 0.1))
+        except Exception as e:
+            failures.append(f"{action} raised {type(e).__name__}: {e}")
+
+        with lock:
+            counts[action] += 1
+
+
+def check(threads: int = 32, iterations: int = 200, load_delay: float = 0.02, seed: int = 0) -> Counter:
+    """
+    Run the stress scenario and assert ModelCache's concurrency guarantees
+
+    Args:
+        threads: Worker threads
+        iterations: Operations per thread
+        load_delay: Simulated load time in seconds
+        seed: Base random seed (thread i uses seed + i)
+
+    Returns:
+        Operation counts
+
+    Raises:
+        AssertionError: If any guarantee was violated
+    """
+    stand_in = StandIn(load_delay)
+    stand_in.install()
+
+    # Room for one stand-in variant at a time, so loading the other one evicts
+    os.environ["VIDEO_DESCRIPTION_RAM_BUDGET_GB"] = str(1.5 * TinyModel().get_memory_footprint() / 1024 ** 3)
+    os.environ["VIDEO_DESCRIPTION_WARM_AFTER_S"] = "0.02"
+    os.environ["VIDEO_DESCRIPTION_COLD_AFTER_S"] = "0.05"
+
+    failures = []
+    counts = Counter()
+    counts_lock = threading.Lock()
+    workers = [
+        threading.Thread(target=worker, args=(iterations, seed + i, failures, counts, counts_lock))
+        for i in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    for key, entry in ModelCache._entries.items():
+        if entry["leases"]:
+            failures.append(f"{key[1]} still has {entry['leases']} lease(s)")
+        if "pending_release" in entry:
+            failures.append(f"{key[1]} still has a deferred release")
+        if "moving" in entry:
+            failures.append(f"{key[1]} is stuck {entry['tier']}")
+    for key, peak in stand_in.max_active.items():
+        if peak > 1:
+            failures.append(f"{key[1]} was loaded by {peak} threads at once")
+
+    assert sum(counts.values()) == threads * iterations, f"workers died early: {dict(counts)}"
+    assert sum(stand_in.loads.values()) > 0, "no variant was ever loaded"
+    assert stand_in.transitions[("hot", "warm")] > 0, "the idle policy never offloaded a variant"
+    assert stand_in.transitions[("warm", "hot")] > 0, "no warm variant was ever restored"
+    assert not failures, f"{len(failures)} failure(s):\n" + "\n".join(failures[:20])
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check ModelCache's concurrency guarantees under load")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=200, help="Operations per thread")
+    parser.add_argument("--load-delay", type=float, default=0.02, help="Simulated load time in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    counts = check(args.threads, args.iterations, args.load_delay, args.seed)
+    print(f"✓ ModelCache concurrency check passed ({sum(counts.values())} operations: {dict(counts)})")
+
+
+if __name__ == "__main__":
+    main()
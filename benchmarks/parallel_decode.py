@@ -0,0 +1,78 @@
+"""
+Parallel decode scaling benchmark
+Times VideoProcessor.extract_frames_parallel across worker counts on a
+long synthetic video and reports speedup relative to one worker.
+
+Usage:
+    python benchmarks/parallel_decode.py --duration 1800 --fps 2.0 --workers 1 2 4 8 16
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Make the repo root importable when run as a script
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.synthetic import make_synthetic_video  # noqa: E402
+from processing.video_processor import VideoProcessor  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel frame extraction scaling")
+    parser.add_argument("--duration", type=float, default=1200.0, help="Synthetic video duration in seconds")
+    parser.add_argument("--video-fps", type=float, default=30.0, help="Source frame rate")
+    parser.add_argument("--fps", type=float, default=2.0, help="Sampling rate")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--workdir", type=str, default=None, help="Directory for generated videos")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(args.workdir) if args.workdir else Path(tmp)
+        video_path = workdir / f"synthetic_{int(args.duration)}s_{args.width}x{args.height}.mp4"
+        if not video_path.exists():
+            make_synthetic_video(
+                video_path,
+                duration=args.duration,
+                fps=args.video_fps,
+                width=args.width,
+                height=args.height
+            )
+
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            timestamps, frames = VideoProcessor.extract_frames_parallel(
+                video_path, fps=args.fps, workers=workers
+            )
+            elapsed = time.perf_counter() - start
+
+            if baseline is None:
+                baseline = elapsed
+
+            results.append({
+                "workers": workers,
+                "frames": int(len(frames)),
+                "wall_time_s": round(elapsed, 4),
+                "speedup": round(baseline / elapsed, 2) if elapsed > 0 else None,
+                "efficiency": round(baseline / elapsed / workers, 2) if elapsed > 0 else None,
+            })
+
+    print(json.dumps({
+        "duration_s": args.duration,
+        "resolution": f"{args.width}x{args.height}",
+        "sampling_fps": args.fps,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
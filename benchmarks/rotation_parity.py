@@ -0,0 +1,109 @@
+"""
+Decode parity check on rotated video
+Tags a synthetic landscape clip as rotated by 90 degrees (as phone footage
+is), then asserts that extract_frames_array returns identical timestamps and
+frames with one worker and with several, and that keyframe sampling (PyAV)
+returns frames in the same orientation as the OpenCV paths. Exits non-zero
+on any mismatch.
+
+Requires the ffmpeg CLI to write the rotation tag; the keyframe check also
+needs PyAV and is skipped without it.
+
+Usage:
+    python benchmarks/rotation_parity.py --workers 4
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Make the repo root importable when run as a script
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.synthetic import make_synthetic_video, tag_rotation  # noqa: E402
+from processing.video_processor import VideoProcessor  # noqa: E402
+
+
+def check_parity(video_path: Path, fps: float, workers: int, resize: bool) -> tuple:
+    """Decode serially and in parallel and assert the outputs match"""
+    serial_timestamps, serial = VideoProcessor.extract_frames_array(video_path, fps=fps, resize=resize, workers=1)
+    parallel_timestamps, parallel = VideoProcessor.extract_frames_array(
+        video_path, fps=fps, resize=resize, workers=workers
+    )
+
+    label = f"{video_path.name} (resize={resize})"
+    assert len(serial) > 0, f"{label}: nothing decoded"
+    assert serial.shape == parallel.shape, f"{label}: serial {serial.shape} != parallel {parallel.shape}"
+    assert np.array_equal(serial_timestamps, parallel_timestamps), f"{label}: timestamps differ"
+    if not np.array_equal(serial, parallel):
+        diff = np.abs(serial.astype(np.int16) - parallel.astype(np.int16)).max()
+        raise AssertionError(f"{label}: frames differ (max abs diff {diff})")
+
+    return serial.shape
+
+
+def check_keyframes(video_path: Path, fps: float) -> tuple:
+    """Assert keyframe frames match the OpenCV decode in shape and orientation"""
+    _, uniform = VideoProcessor.extract_frames_array(video_path, fps=fps, resize=False)
+    key_timestamps, keyframes = VideoProcessor.extract_frames_array(
+        video_path, fps=fps, resize=False, sampling_mode="keyframes"
+    )
+
+    label = f"{video_path.name} (keyframes)"
+    assert len(keyframes) > 0, f"{label}: nothing decoded"
+    assert keyframes.shape[1:] == uniform.shape[1:], \
+        f"{label}: frame shape {keyframes.shape[1:]} != OpenCV {uniform.shape[1:]}"
+
+    # The first keyframe is frame 0, which the uniform path also returns first;
+    # a frame left unrotated (or turned the wrong way) differs far more than
+    # the two decoders' colour conversion does
+    assert key_timestamps[0] == 0.0, f"{label}: first keyframe at {key_timestamps[0]:.3f}s"
+    diff = np.abs(keyframes[0].astype(np.int16) - uniform[0].astype(np.int16)).mean()
+    assert diff < 8.0, f"{label}: first frame differs from OpenCV (mean abs diff {diff:.1f})"
+
+    return keyframes.shape
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check decode parity on a rotated video")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--fps", type=float, default=2.0, help="Sampling rate")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        landscape = make_synthetic_video(Path(tmp) / "landscape.mp4", duration=args.duration,
+                                         width=args.width, height=args.height)
+        rotated = tag_rotation(landscape, Path(tmp) / "rotated.mp4", degrees=90)
+
+        for video_path in (landscape, rotated):
+            for resize in (False, True):
+                shape = check_parity(video_path, args.fps, args.workers, resize)
+                print(f"ok  {video_path.name:<14} resize={resize!s:<5} frames {shape[0]} at {shape[2]}x{shape[1]}")
+
+        # With the tag honoured, decoded frames are portrait; if the backend
+        # ignores it both paths are landscape, which is still consistent
+        _, frames = VideoProcessor.extract_frames_array(rotated, fps=args.fps, resize=False, workers=args.workers)
+        orientation = "portrait" if frames.shape[1] > frames.shape[2] else "landscape (rotation tag ignored)"
+        print(f"rotated clip decodes as {orientation}")
+
+        try:
+            import av  # noqa: F401
+        except ImportError:
+            print("skip keyframes: PyAV not installed")
+            return
+
+        for video_path in (landscape, rotated):
+            shape = check_keyframes(video_path, args.fps)
+            print(f"ok  {video_path.name:<14} keyframes    frames {shape[0]} at {shape[2]}x{shape[1]}")
+
+
+if __name__ == "__main__":
+    main()
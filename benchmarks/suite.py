@@ -0,0 +1,212 @@
+"""
+Frame extraction benchmark suite
+Generates deterministic synthetic videos locally and times VideoProcessor
+entry points, reporting frames/sec, wall time and peak RSS as JSON.
+
+Runs on a CPU-only box with no network access. Each case runs in a fresh
+spawned process so peak RSS is measured per case.
+
+Usage:
+    python benchmarks/suite.py --preset quick
+    python benchmarks/suite.py --preset full --output bench_output.json
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Make the repo root importable when run as a script
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.synthetic import make_synthetic_video  # noqa: E402
+
+# Codec -> container extension accepted by cv2.VideoWriter
+CODECS = {
+    "mp4v": ".mp4",
+    "MJPG": ".avi",
+    "XVID": ".avi",
+}
+
+PRESETS = {
+    "quick": {
+        "resolutions": [(320, 240), (1280, 720)],
+        "durations": [10.0],
+        "codecs": ["mp4v"],
+        "contents": ["static", "motion"],
+    },
+    "full": {
+        "resolutions": [(320, 240), (1280, 720), (1920, 1080)],
+        "durations": [10.0, 120.0],
+        "codecs": ["mp4v", "MJPG"],
+        "contents": ["static", "motion"],
+    },
+}
+
+CASES = [
+    "get_video_info",
+    "extract_frames_sequential",
+    "extract_frames_sparse",
+    "extract_frames_array",
+    "extract_frames_scene",
+    "extract_frames_parallel",
+]
+
+
+def _peak_rss_mb(who: int) -> float:
+    """Peak resident set size in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(who).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / divisor
+
+
+def _run_case(case: str, video_path: str, fps: float, repeats: int) -> dict:
+    """Run one benchmark case in the current (fresh) process"""
+    from processing.video_processor import VideoProcessor
+
+    baseline_rss = _peak_rss_mb(resource.RUSAGE_SELF)
+
+    def run():
+        if case == "get_video_info":
+            # Bypass the memoized probe so every repeat opens the container
+            VideoProcessor._probe_cache.clear()
+            VideoProcessor.get_video_info(video_path)
+            return 0
+        if case == "extract_frames_sequential":
+            return len(VideoProcessor.extract_frames(video_path, fps=fps, decode_mode="sequential"))
+        if case == "extract_frames_sparse":
+            return len(VideoProcessor.extract_frames(video_path, fps=fps, decode_mode="sparse"))
+        if case == "extract_frames_array":
+            return len(VideoProcessor.extract_frames_array(video_path, fps=fps)[1])
+        if case == "extract_frames_scene":
+            return len(VideoProcessor.extract_frames_array(video_path, fps=fps, sampling_mode="scene")[1])
+        if case == "extract_frames_parallel":
+            workers = min(4, os.cpu_count() or 1)
+            return len(VideoProcessor.extract_frames_parallel(video_path, fps=fps, workers=workers)[1])
+        raise ValueError(f"Unknown case: {case}")
+
+    times = []
+    frames = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        frames = run()
+        times.append(time.perf_counter() - start)
+
+    wall = statistics.median(times)
+    return {
+        "case": case,
+        "frames": frames,
+        "wall_time_s": round(wall, 5),
+        "wall_time_min_s": round(min(times), 5),
+        "frames_per_s": round(frames / wall, 2) if frames and wall > 0 else None,
+        "peak_rss_mb": round(_peak_rss_mb(resource.RUSAGE_SELF), 1),
+        "peak_rss_delta_mb": round(_peak_rss_mb(resource.RUSAGE_SELF) - baseline_rss, 1),
+        "children_peak_rss_mb": round(_peak_rss_mb(resource.RUSAGE_CHILDREN), 1),
+    }
+
+
+def run_isolated(case: str, video_path: Path, fps: float, repeats: int) -> dict:
+    """Run a case in a fresh spawned process"""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_run_case, case, str(video_path), fps, repeats).result()
+
+
+def environment_info() -> dict:
+    """Describe the machine and library versions for comparing runs"""
+    import cv2
+    import numpy as np
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame extraction benchmark suite")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--fps", type=float, default=1.0, help="Sampling rate")
+    parser.add_argument("--video-fps", type=float, default=30.0, help="Source frame rate")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per case (median reported)")
+    parser.add_argument("--workdir", type=str, default=None,
+                        help="Directory for generated videos (reused between runs)")
+    parser.add_argument("--output", type=str, default=None, help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    preset = PRESETS[args.preset]
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(args.workdir) if args.workdir else Path(tmp)
+
+        matrix = itertools.product(
+            preset["resolutions"], preset["durations"], preset["codecs"], preset["contents"]
+        )
+        for (width, height), duration, codec, content in matrix:
+            name = f"{content}_{width}x{height}_{int(duration)}s_{codec}{CODECS[codec]}"
+            video_path = workdir / name
+            if not video_path.exists():
+                try:
+                    make_synthetic_video(
+                        video_path,
+                        duration=duration,
+                        fps=args.video_fps,
+                        width=width,
+                        height=height,
+                        codec=codec,
+                        content=content
+                    )
+                except RuntimeError as e:
+                    print(f"Skipping {name}: {e}", file=sys.stderr)
+                    continue
+
+            video = {
+                "name": name,
+                "width": width,
+                "height": height,
+                "duration_s": duration,
+                "codec": codec,
+                "content": content,
+                "size_bytes": video_path.stat().st_size,
+            }
+            for case in args.cases:
+                result = run_isolated(case, video_path, args.fps, args.repeats)
+                results.append({**video, **result})
+                print(f"{name} {case}: {result['wall_time_s']}s", file=sys.stderr)
+
+    report = {
+        "environment": environment_info(),
+        "config": {
+            "preset": args.preset,
+            "sampling_fps": args.fps,
+            "video_fps": args.video_fps,
+            "repeats": args.repeats,
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Synthetic video generation for benchmarks
+Writes deterministic test clips locally with cv2.VideoWriter (no network needed)
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Union
+
+import cv2
+import numpy as np
+
+
+def make_synthetic_video(
+    output_path: Union[str, Path],
+    duration: float = 60.0,
+    fps: float = 30.0,
+    width: int = 320,
+    height: int = 240,
+    codec: str = "mp4v",
+    content: str = "motion",
+    seed: int = 0
+) -> Path:
+    """
+    Write a deterministic synthetic video
+
+    Args:
+        output_path: Destination file (extension should match the codec container)
+        duration: Clip length in seconds
+        fps: Frame rate written to the container
+        width: Frame width in pixels
+        height: Frame height in pixels
+        codec: FourCC code passed to cv2.VideoWriter (e.g. mp4v, MJPG, XVID)
+        content: "motion" (moving shapes + noise) or "static" (fixed frame)
+        seed: Random seed for reproducible content
+
+    Returns:
+        Path to the written video
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    writer = cv2.VideoWriter(
+        str(output_path),
+        cv2.VideoWriter_fourcc(*codec),
+        fps,
+        (width, height)
+    )
+    if not writer.isOpened():
+        raise RuntimeError(f"Could not open VideoWriter for codec {codec}: {output_path}")
+
+    rng = np.random.default_rng(seed)
+    total_frames = int(round(duration * fps))
+
+    # Static background gradient shared by both content types
+    gradient = np.linspace(0, 255, width, dtype=np.uint8)
+    background = np.empty((height, width, 3), dtype=np.uint8)
+    background[:] = gradient[None, :, None]
+
+    box = max(8, min(width, height) // 6)
+
+    try:
+        for i in range(total_frames):
+            if content == "static":
+                writer.write(background)
+                continue
+
+            frame = background.copy()
+            x = int((i * 7) % max(1, width - box))
+            y = int((i * 3) % max(1, height - box))
+            color = tuple(int(c) for c in (i * 5 % 256, i * 11 % 256, i * 17 % 256))
+            cv2.rectangle(frame, (x, y), (x + box, y + box), color, -1)
+
+            # Low-amplitude noise keeps the encoder from collapsing frames
+            noise = rng.integers(0, 16, size=(height // 8, width // 8, 1), dtype=np.uint8)
+            frame += cv2.resize(noise, (width, height), interpolation=cv2.INTER_NEAREST)[:, :, None]
+
+            # Timecode so every frame is distinguishable
+            cv2.putText(frame, f"{i}", (4, height - 6), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            writer.write(frame)
+    finally:
+        writer.release()
+
+    return output_path
+
+
+def tag_rotation(input_path: Union[str, Path], output_path: Union[str, Path], degrees: int = 90) -> Path:
+    """
+    Copy a video with display-rotation metadata, like portrait phone footage
+
+    The stream itself is not re-encoded; decoders that honour the tag (OpenCV's
+    FFmpeg backend does by default) return rotated frames while the container
+    still reports the stored width and height. Requires the ffmpeg CLI.
+
+    Args:
+        input_path: Source video
+        output_path: Destination file
+        degrees: Rotation to record (90, 180 or 270)
+
+    Returns:
+        Path to the tagged video
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("Tagging rotation requires the ffmpeg CLI on PATH")
+
+    output_path = Path(output_path)
+    attempts = [
+        # FFmpeg 6+: display matrix set as an input option
+        [ffmpeg, "-y", "-loglevel", "error", "-display_rotation", str(degrees), "-i", str(input_path),
+         "-c", "copy", str(output_path)],
+        # Older FFmpeg: legacy rotate tag
+        [ffmpeg, "-y", "-loglevel", "error", "-i", str(input_path), "-c", "copy",
+         "-metadata:s:v:0", f"rotate={degrees}", str(output_path)],
+    ]
+    for command in attempts:
+        if subprocess.run(command, capture_output=True).returncode == 0:
+            return output_path
+
+    raise RuntimeError(f"ffmpeg could not tag rotation on {input_path}")
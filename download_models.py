@@ -1,66 +1,396 @@
 """
 Model Download Script for ComfyUI-VideoDescription
-Downloads Qwen3-VL model to ComfyUI models directory
+Downloads Qwen3-VL models to ComfyUI models directory
+
+Files are streamed straight to disk in the Hugging Face cache layout
+(models--<org>--<name>/blobs, snapshots/<sha>, refs/<revision>) that
+ModelCache loads from, without importing torch or loading any weights:
+- large files are fetched as parallel HTTP range requests
+- interrupted downloads resume from the parts already on disk
+- every file is checked against the sha256 (LFS) or git blob id in the
+  repo manifest before it is moved into place
+
+Works against huggingface.co, an HF-compatible mirror (--endpoint or
+HF_ENDPOINT), or the offline stand-in in benchmarks/fetch_stand_in.py.
+
+Usage:
+    python download_models.py                # 8B (default)
+    python download_models.py --model 2B     # one size
+    python download_models.py --model all    # every registered size
+    python download_models.py --endpoint http://mirror.local:8080 --workers 16
 """
 
-from transformers import Qwen3VLForConditionalGeneration, AutoProcessor
-import torch
+import argparse
+import hashlib
+import http.client
+import json
+import os
 import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+from models.model_registry import DEFAULT_MODEL_SIZE, MODEL_REGISTRY, MODEL_SIZES, get_models_root
+
+DEFAULT_ENDPOINT = "https://huggingface.co"
+# Read/write buffer; memory use is this times the number of workers
+BUFFER_SIZE = 1024 * 1024
+DEFAULT_PART_MB = 64
+DEFAULT_WORKERS = 8
+RETRIES = 4
+TIMEOUT_S = 60
 
 
-def get_model_path():
+class RangeNotSupported(Exception):
+    """Server ignored a Range header and sent the whole file"""
+
+
+def get_model_path(model_size=DEFAULT_MODEL_SIZE, models_root=None):
     """Get the target model path in ComfyUI models directory"""
-    # Get script directory
-    script_dir = Path(__file__).resolve().parent
-    # Go up to custom_nodes, then to ComfyUI root
-    comfyui_root = script_dir.parent.parent
-    # ComfyUI models directory
-    model_path = comfyui_root / "models" / "video_description" / "Qwen3-VL-8B-Instruct"
-    return model_path
+    root = Path(models_root) if models_root else get_models_root()
+    return root / MODEL_REGISTRY[model_size]["local_dir"]
+
+
+def _open(url: str, token: Optional[str], headers: Optional[Dict[str, str]] = None):
+    request = urllib.request.Request(url, headers=headers or {})
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    return urllib.request.urlopen(request, timeout=TIMEOUT_S)
+
+
+def fetch_manifest(endpoint: str, repo_id: str, revision: str, token: Optional[str]) -> Dict[str, Any]:
+    """
+    Get the commit sha and file list (with sizes and hashes) of a repo revision
+
+    Returns:
+        Dict with "sha" and "files": [{"name", "size", "etag", "algorithm"}]
+    """
+    url = f"{endpoint}/api/models/{repo_id}/revision/{quote(revision, safe='')}?blobs=true"
+    with _open(url, token) as response:
+        data = json.load(response)
+
+    files = []
+    for sibling in data["siblings"]:
+        lfs = sibling.get("lfs")
+        files.append({
+            "name": sibling["rfilename"],
+            "size": lfs["size"] if lfs else sibling.get("size"),
+            # LFS blobs are named by sha256, regular files by git blob id
+            "etag": lfs["sha256"] if lfs else sibling["blobId"],
+            "algorithm": "sha256" if lfs else "git-sha1",
+        })
+
+    return {"sha": data["sha"], "files": files}
+
+
+def file_digest(path: Path, algorithm: str, size: int) -> str:
+    """Hash a file the way the manifest does (sha256 for LFS, git blob sha1 otherwise)"""
+    if algorithm == "sha256":
+        digest = hashlib.sha256()
+    else:
+        digest = hashlib.sha1(f"blob {size}\0".encode())
+
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(8 * BUFFER_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class _Progress:
+    """Thread-safe byte counter for the progress line"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, count: int):
+        with self._lock:
+            self.done += count
+
+    def line(self) -> str:
+        elapsed = max(time.perf_counter() - self.start, 1e-6)
+        return (f"  {self.done / 1024 ** 3:.2f} / {self.total / 1024 ** 3:.2f} GB "
+                f"({self.done / 1024 ** 2 / elapsed:.1f} MB/s)")
+
+
+def _with_retries(fn, *args):
+    for attempt in range(RETRIES):
+        try:
+            return fn(*args)
+        except RangeNotSupported:
+            raise
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            if attempt == RETRIES - 1:
+                raise
+            delay = 2 ** attempt
+            print(f"  Retrying in {delay}s after: {e}")
+            time.sleep(delay)
+
+
+def _fetch_range(url: str, token: Optional[str], path: Path, start: int, end: int, progress: _Progress):
+    """Write bytes [start, end] of url into path at the same offset"""
+    written = 0
+    try:
+        with _open(url, token, {"Range": f"bytes={start}-{end}"}) as response:
+            if response.status != 206:
+                raise RangeNotSupported(url)
+
+            with open(path, "r+b") as f:
+                f.seek(start)
+                while True:
+                    chunk = response.read(BUFFER_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    written += len(chunk)
+                    progress.add(len(chunk))
+
+        if written != end - start + 1:
+            raise IOError(f"Short read: {written} of {end - start + 1} bytes")
+    except BaseException:
+        # A retry rewrites the part from its start
+        progress.add(-written)
+        raise
+
+
+def _fetch_stream(url: str, token: Optional[str], path: Path, progress: _Progress):
+    """Download a whole file in one request"""
+    written = 0
+    try:
+        with _open(url, token) as response, open(path, "wb") as f:
+            expected = response.headers.get("Content-Length")
+            while True:
+                chunk = response.read(BUFFER_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                written += len(chunk)
+                progress.add(len(chunk))
+
+        if expected is not None and written != int(expected):
+            raise IOError(f"Short read: {written} of {expected} bytes")
+    except BaseException:
+        progress.add(-written)
+        raise
 
 
-def download_qwen3vl():
-    """Download Qwen3-VL-8B-Instruct model and processor"""
+def _fetch_parts(url: str, token: Optional[str], incomplete: Path, size: int, part_size: int,
+                 pool: ThreadPoolExecutor, progress: _Progress):
+    """
+    Download a file as parallel ranged parts, resuming from a parts sidecar
 
-    model_path = get_model_path()
+    The sidecar (<blob>.incomplete.parts) lists finished parts, so an
+    interrupted download only refetches parts that never completed.
+    """
+    state_path = incomplete.with_name(incomplete.name + ".parts")
+    part_count = (size + part_size - 1) // part_size
+
+    done = set()
+    if incomplete.exists() and state_path.exists():
+        try:
+            state = json.loads(state_path.read_text())
+            if state["size"] == size and state["part_size"] == part_size:
+                done = set(state["done"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    if not done:
+        with open(incomplete, "wb") as f:
+            f.truncate(size)
+    else:
+        print(f"  Resuming {incomplete.name}: {len(done)}/{part_count} parts on disk")
+        progress.add(sum(min(part_size, size - i * part_size) for i in done))
+
+    state_lock = threading.Lock()
+
+    def fetch_part(index: int):
+        start = index * part_size
+        end = min(start + part_size, size) - 1
+        _with_retries(_fetch_range, url, token, incomplete, start, end, progress)
+        with state_lock:
+            done.add(index)
+            tmp = state_path.with_name(state_path.name + ".tmp")
+            tmp.write_text(json.dumps({"size": size, "part_size": part_size, "done": sorted(done)}))
+            os.replace(tmp, state_path)
+
+    futures = [pool.submit(fetch_part, i) for i in range(part_count) if i not in done]
+    finished, pending = wait(futures, return_when=FIRST_EXCEPTION)
+    for future in pending:
+        future.cancel()
+    for future in finished:
+        future.result()
+
+    state_path.unlink(missing_ok=True)
+
+
+def _link_snapshot(blob: Path, target: Path):
+    """Point snapshots/<sha>/<file> at its blob (moves the blob where symlinks aren't allowed)"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.is_symlink() or target.exists():
+        target.unlink()
+    try:
+        os.symlink(os.path.relpath(blob, target.parent), target)
+    except OSError:
+        # e.g. Windows without developer mode; same fallback huggingface_hub uses
+        os.replace(blob, target)
+
+
+def fetch_file(entry: Dict[str, Any], url: str, repo_dir: Path, snapshot_dir: Path, token: Optional[str],
+               part_size: int, verify: bool, pool: ThreadPoolExecutor, progress: _Progress) -> str:
+    """
+    Download one manifest entry into the cache layout
+
+    Returns:
+        "cached" if it was already complete, else "downloaded"
+    """
+    size = entry["size"]
+    blob = repo_dir / "blobs" / entry["etag"]
+    target = snapshot_dir / entry["name"]
+
+    # Blobs only get their final name after verification, so presence means complete
+    if target.is_file() and (size is None or target.stat().st_size == size):
+        progress.add(size or 0)
+        return "cached"
+    if blob.is_file() and (size is None or blob.stat().st_size == size):
+        _link_snapshot(blob, target)
+        progress.add(size or 0)
+        return "cached"
+
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    incomplete = blob.with_name(blob.name + ".incomplete")
+
+    if size is not None and size > part_size:
+        try:
+            _fetch_parts(url, token, incomplete, size, part_size, pool, progress)
+        except RangeNotSupported:
+            print(f"  Server doesn't support range requests, streaming {entry['name']} in one piece")
+            incomplete.with_name(incomplete.name + ".parts").unlink(missing_ok=True)
+            _with_retries(_fetch_stream, url, token, incomplete, progress)
+    else:
+        _with_retries(_fetch_stream, url, token, incomplete, progress)
+
+    actual_size = incomplete.stat().st_size
+    if verify:
+        expected = entry["etag"]
+        actual = file_digest(incomplete, entry["algorithm"], actual_size)
+        if actual != expected:
+            incomplete.unlink()
+            raise ValueError(f"Checksum mismatch for {entry['name']}: expected {expected}, got {actual}")
+    elif size is not None and actual_size != size:
+        incomplete.unlink()
+        raise ValueError(f"Size mismatch for {entry['name']}: expected {size}, got {actual_size}")
+
+    os.replace(incomplete, blob)
+    _link_snapshot(blob, target)
+    return "downloaded"
+
+
+def fetch_repo(repo_id: str, model_path: Path, endpoint: str = DEFAULT_ENDPOINT, revision: str = "main",
+               token: Optional[str] = None, workers: int = DEFAULT_WORKERS, part_mb: int = DEFAULT_PART_MB,
+               verify: bool = True) -> Path:
+    """
+    Download a repo revision into model_path in the Hugging Face cache layout
+
+    Args:
+        repo_id: e.g. Qwen/Qwen3-VL-8B-Instruct
+        model_path: Cache root (models/video_description/<local dir>)
+        endpoint: Hub or mirror base URL
+        revision: Branch, tag or commit sha
+        token: Optional access token
+        workers: Parallel range requests
+        part_mb: Size of each ranged part in MB
+        verify: Check each file against the manifest hash
+
+    Returns:
+        Snapshot directory
+    """
+    endpoint = endpoint.rstrip("/")
+    manifest = fetch_manifest(endpoint, repo_id, revision, token)
+    sha = manifest["sha"]
+
+    repo_dir = model_path / ("models--" + repo_id.replace("/", "--"))
+    snapshot_dir = repo_dir / "snapshots" / sha
+    files: List[Dict[str, Any]] = manifest["files"]
+    progress = _Progress(sum(f["size"] or 0 for f in files))
+    print(f"Revision {revision} → {sha}, {len(files)} files, {progress.total / 1024 ** 3:.2f} GB")
+
+    # Parts go to part_pool; file_pool only orchestrates, so waiting on parts can't deadlock
+    part_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="FetchPart")
+    file_pool = ThreadPoolExecutor(max_workers=min(4, workers), thread_name_prefix="FetchFile")
+    try:
+        futures = {
+            file_pool.submit(
+                fetch_file, entry, f"{endpoint}/{repo_id}/resolve/{sha}/{quote(entry['name'])}",
+                repo_dir, snapshot_dir, token, part_mb * 1024 * 1024, verify, part_pool, progress
+            ): entry["name"]
+            for entry in files
+        }
+
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, timeout=2, return_when=FIRST_EXCEPTION)
+            for future in finished:
+                status = future.result()
+                print(f"  ✓ {futures[future]} ({status})")
+            if pending:
+                print(progress.line())
+    finally:
+        # On failure, stop queued work; finished parts stay on disk for the next run
+        file_pool.shutdown(cancel_futures=True)
+        part_pool.shutdown(cancel_futures=True)
+
+    if revision != sha:
+        refs_dir = repo_dir / "refs"
+        refs_dir.mkdir(parents=True, exist_ok=True)
+        (refs_dir / revision).write_text(sha)
+
+    print(progress.line())
+    return snapshot_dir
+
+
+def download_qwen3vl(model_size=DEFAULT_MODEL_SIZE, endpoint=DEFAULT_ENDPOINT, revision="main", token=None,
+                     workers=DEFAULT_WORKERS, part_mb=DEFAULT_PART_MB, verify=True, models_root=None):
+    """Download a Qwen3-VL-Instruct model and processor from the registry"""
+
+    spec = MODEL_REGISTRY[model_size]
+    repo_id = spec["repo_id"]
+    model_path = get_model_path(model_size, models_root)
 
     print("=" * 60)
     print("Qwen3-VL Model Download")
     print("=" * 60)
-    print("\nModel: Qwen3-VL-8B-Instruct")
-    print("Size: ~16GB (FP16)")
+    print(f"\nModel: {repo_id.split('/')[-1]}")
+    print(f"Size: ~{spec['fp16_gb']:g}GB (FP16)")
+    print(f"Source: {endpoint}")
     print(f"Download location: {model_path}")
-    print("\nThis may take 10-30 minutes depending on network speed.")
+    print("\nDownload time depends only on network speed; interrupted downloads resume.")
     print("=" * 60)
 
     # Create directory if it doesn't exist
     model_path.mkdir(parents=True, exist_ok=True)
 
     try:
-        # Download model
-        print("\n[1/2] Downloading model weights...")
-        print(f"Saving to: {model_path}")
-        model = Qwen3VLForConditionalGeneration.from_pretrained(
-            "Qwen/Qwen3-VL-8B-Instruct",
-            torch_dtype=torch.float16,
-            device_map="auto",
-            cache_dir=str(model_path)
+        snapshot_dir = fetch_repo(
+            repo_id, model_path,
+            endpoint=endpoint, revision=revision, token=token,
+            workers=workers, part_mb=part_mb, verify=verify
         )
-        print("✓ Model downloaded successfully")
-
-        # Download processor
-        print("\n[2/2] Downloading processor...")
-        processor = AutoProcessor.from_pretrained(
-            "Qwen/Qwen3-VL-8B-Instruct",
-            cache_dir=str(model_path)
-        )
-        print("✓ Processor downloaded successfully")
 
         print("\n" + "=" * 60)
         print("✓ Download Complete!")
         print("=" * 60)
-        print(f"\nModel location: {model_path}")
+        print(f"\nModel location: {snapshot_dir}")
         print("Model is ready to use.")
         print("You can now run ComfyUI and use the Video Description node.")
 
@@ -69,14 +399,34 @@ def download_qwen3vl():
     except Exception as e:
         print(f"\n✗ Error during download: {e}")
         print("\nTroubleshooting:")
-        print("1. Check your internet connection")
-        print("2. Ensure you have ~20GB free disk space")
+        print("1. Check your internet connection (or --endpoint / HF_ENDPOINT)")
+        print(f"2. Ensure you have ~{spec['fp16_gb'] + 3:g}GB free disk space")
         print(f"3. Verify write permissions for: {model_path}")
-        print("4. Try running: pip install --upgrade transformers")
+        print("4. Run the command again: finished files and parts are kept and the download resumes")
         return False
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Download Qwen3-VL models for ComfyUI-VideoDescription")
+    parser.add_argument("--model", choices=MODEL_SIZES + ["all"], default=DEFAULT_MODEL_SIZE,
+                        help=f"Model size to download (default: {DEFAULT_MODEL_SIZE})")
+    parser.add_argument("--endpoint", default=os.environ.get("HF_ENDPOINT", DEFAULT_ENDPOINT),
+                        help="Hub or mirror base URL (default: HF_ENDPOINT or huggingface.co)")
+    parser.add_argument("--revision", default="main", help="Branch, tag or commit sha")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Parallel range requests")
+    parser.add_argument("--part-mb", type=int, default=DEFAULT_PART_MB, help="Size of each ranged part in MB")
+    parser.add_argument("--models-root", default=None,
+                        help="Override ComfyUI/models/video_description as the download root")
+    parser.add_argument("--skip-verify", action="store_true", help="Skip checksum verification (sizes still checked)")
+    args = parser.parse_args()
+
     print("\nStarting download process...\n")
-    success = download_qwen3vl()
+    sizes = MODEL_SIZES if args.model == "all" else [args.model]
+    success = all([
+        download_qwen3vl(
+            size, endpoint=args.endpoint, revision=args.revision, token=os.environ.get("HF_TOKEN"),
+            workers=args.workers, part_mb=args.part_mb, verify=not args.skip_verify, models_root=args.models_root
+        )
+        for size in sizes
+    ])
     sys.exit(0 if success else 1)
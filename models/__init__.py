@@ -1,8 +1,22 @@
 """
 Model management package
+Exports are imported on first access, so lightweight modules (model_registry)
+can be used without pulling in torch, e.g. by download_models.py
 """
 
-from .model_cache import ModelCache
-from .qwen3vl_inference import Qwen3VLInference
+import importlib
 
-__all__ = ['ModelCache', 'Qwen3VLInference']
+_EXPORTS = {
+    'ModelCache': '.model_cache',
+    'MODEL_REGISTRY': '.model_registry',
+    'Qwen3VLInference': '.qwen3vl_inference',
+    'VisionFeatureCache': '.vision_feature_cache',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
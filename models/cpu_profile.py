@@ -0,0 +1,213 @@
+"""
+CPU Execution Profile for Qwen3-VL
+Dtype selection, dynamic int8 quantization and thread tuning for CPU-only
+inference, where float16 is slow or emulated and bitsandbytes is unavailable
+"""
+
+import os
+import platform
+import subprocess
+from typing import Any, Optional, Sequence, Tuple
+import logging
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+class CPUProfile:
+    """
+    Settings for running Qwen3-VL on CPU
+
+    - dtype: bfloat16 where the CPU has native bf16 instructions (AVX512-BF16 /
+      AMX on x86, BF16 on ARM), float32 otherwise. Override with
+      VIDEO_DESCRIPTION_CPU_DTYPE=bfloat16|float32.
+    - int8: dynamic quantization of nn.Linear weights (activations stay float32
+      and are quantized per batch), roughly halving memory against bf16.
+    - threads: torch's thread pools are process-wide, so they are only tuned
+      on request: VIDEO_DESCRIPTION_CPU_THREADS=auto sets intra-op threads to
+      the physical cores available to the process (or a count to that count)
+      and inter-op threads to 1. Unset, torch's current settings are kept.
+    """
+
+    # Output projection stays in float: quantizing it costs noticeably more accuracy
+    INT8_SKIP_MODULES = ("lm_head",)
+
+    _threads_tuned = False
+
+    @staticmethod
+    def _cpu_flags() -> set:
+        """CPU feature flags on Linux/macOS (empty when they can't be read)"""
+        if platform.system() == "Linux":
+            try:
+                with open("/proc/cpuinfo") as f:
+                    for line in f:
+                        # x86 lists "flags", ARM lists "Features"
+                        if line.startswith(("flags", "Features")):
+                            return set(line.split(":", 1)[1].split())
+            except OSError:
+                pass
+        elif platform.system() == "Darwin" and platform.machine() == "arm64":
+            try:
+                result = subprocess.run(
+                    ["sysctl", "-n", "hw.optional.arm.FEAT_BF16"],
+                    capture_output=True, text=True, timeout=2
+                )
+                if result.stdout.strip() == "1":
+                    return {"bf16"}
+            except (OSError, subprocess.SubprocessError):
+                pass
+        return set()
+
+    @classmethod
+    def supports_bf16(cls) -> bool:
+        """
+        Check for native bfloat16 arithmetic
+
+        Emulated bf16 (e.g. plain AVX512) is slower than float32 for matmuls,
+        so only native instructions count.
+        """
+        flags = cls._cpu_flags()
+        if flags:
+            return bool(flags & {"avx512_bf16", "amx_bf16", "bf16"})
+
+        # No flag list (e.g. Windows): fall back to oneDNN's own check
+        check = getattr(torch.ops.mkldnn, "_is_mkldnn_bf16_supported", None)
+        try:
+            return bool(check()) if check is not None else False
+        except Exception:
+            return False
+
+    @classmethod
+    def select_dtype(cls) -> str:
+        """
+        Pick the CPU compute dtype
+
+        Returns:
+            "bfloat16" or "float32"
+        """
+        configured = os.environ.get("VIDEO_DESCRIPTION_CPU_DTYPE", "").strip().lower()
+        if configured in ("bfloat16", "float32"):
+            return configured
+        return "bfloat16" if cls.supports_bf16() else "float32"
+
+    @staticmethod
+    def physical_cores() -> int:
+        """Physical cores available to this process"""
+        try:
+            available = len(os.sched_getaffinity(0))
+        except AttributeError:
+            available = os.cpu_count() or 1
+
+        try:
+            import psutil
+
+            physical = psutil.cpu_count(logical=False) or available
+        except ImportError:
+            physical = available
+
+        # Hyperthreads share the FPUs, so matmul threads beyond physical cores just contend
+        return max(1, min(available, physical))
+
+    @classmethod
+    def tune_threads(cls, threads: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Set torch's intra- and inter-op thread counts for CPU inference, if asked to
+
+        The counts are process-wide, so inside ComfyUI they change threading for
+        every other node too. Without an explicit threads argument or
+        VIDEO_DESCRIPTION_CPU_THREADS ("auto" = physical cores, or a count),
+        torch's current settings are left alone.
+
+        Args:
+            threads: Intra-op threads (default: from VIDEO_DESCRIPTION_CPU_THREADS)
+
+        Returns:
+            Tuple of (intra-op threads, inter-op threads) in effect
+        """
+        if threads is None:
+            configured = os.environ.get("VIDEO_DESCRIPTION_CPU_THREADS", "").strip().lower()
+            if not configured:
+                threads, interop = torch.get_num_threads(), torch.get_num_interop_threads()
+                logger.info(f"CPU threads: {threads} intra-op, {interop} inter-op (torch settings kept)")
+                return threads, interop
+            threads = cls.physical_cores() if configured == "auto" else int(configured)
+
+        try:
+            torch.set_num_threads(threads)
+        except RuntimeError as e:
+            logger.warning(f"Could not set the intra-op thread count: {e}")
+            threads = torch.get_num_threads()
+        if not cls._threads_tuned:
+            try:
+                # Autoregressive decoding is one op at a time; extra inter-op pools only add overhead
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                # Can only be set before any inter-op parallel work has started
+                logger.debug("Inter-op thread count already fixed, leaving it as is")
+            cls._threads_tuned = True
+
+        interop = torch.get_num_interop_threads()
+        logger.info(f"CPU threads: {threads} intra-op, {interop} inter-op")
+        return threads, interop
+
+    @classmethod
+    def quantize_int8(cls, model: Any, skip: Sequence[str] = INT8_SKIP_MODULES) -> Any:
+        """
+        Apply dynamic int8 quantization to a model's linear layers in place
+
+        The model must be in float32 (dynamic quantized linears take float32
+        activations).
+
+        Args:
+            model: Float32 model
+            skip: Module names (last path component) left in float
+
+        Returns:
+            The quantized model
+        """
+        from torch.ao.quantization import per_channel_dynamic_qconfig, quantize_dynamic
+
+        qconfig_spec = {
+            name: per_channel_dynamic_qconfig
+            for name, module in model.named_modules()
+            if isinstance(module, torch.nn.Linear) and name.rsplit(".", 1)[-1] not in skip
+        }
+        logger.info(f"Quantizing {len(qconfig_spec)} linear layers to int8...")
+        return quantize_dynamic(model, qconfig_spec=qconfig_spec, dtype=torch.qint8, inplace=True)
+
+    @staticmethod
+    def packed_weight_bytes(model: Any) -> int:
+        """
+        Bytes held by dynamically quantized linear weights
+
+        They live in packed params rather than parameters, so
+        get_memory_footprint() doesn't see them.
+        """
+        from torch.ao.nn.quantized.dynamic import Linear as DynamicQuantizedLinear
+
+        total = 0
+        for module in model.modules():
+            if isinstance(module, DynamicQuantizedLinear):
+                weight = module.weight()
+                # int8 values plus per-channel scales and zero points
+                total += weight.numel() + weight.shape[0] * 16
+        return total
+
+    @classmethod
+    def apply(cls, model: Any, quantization: str) -> Any:
+        """
+        Prepare a CPU-loaded model for inference
+
+        Args:
+            model: Model on CPU in the profile's dtype
+            quantization: "int8" for dynamic quantization, anything else leaves weights as is
+
+        Returns:
+            The prepared model
+        """
+        cls.tune_threads()
+        model.eval()
+        if quantization == "int8":
+            model = cls.quantize_int8(model)
+        return model
@@ -4,194 +4,934 @@ Singleton pattern to avoid loading models multiple times
 """
 
 import torch
+import importlib.util
+import json
 import os
+import threading
+import time
 import warnings
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Tuple, Optional, Any
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import logging
 
+from .cpu_profile import CPUProfile
+from .model_registry import (
+    ANALYSIS_ROUTES, DEFAULT_MODEL_SIZE, MODEL_SIZES, choose_model_size, get_models_root, model_spec
+)
+
 logger = logging.getLogger(__name__)
 
+# (model id, quantization, dtype, device)
+VariantKey = Tuple[str, str, str, str]
+
 
 class ModelCache:
     """
-    Singleton cache for Qwen3-VL model and processor
-    Ensures models are loaded only once per session
+    Singleton cache for Qwen3-VL models and processors
+
+    Models are cached per variant, keyed by (model id, quantization, dtype,
+    device), so switching e.g. use_4bit or the model size (see
+    model_registry and route()) loads and returns the right model
+    instead of whichever variant was loaded first. Processors do not depend
+    on the variant and are shared per model id. When the cached variants on
+    a device exceed its memory budget, the least recently used ones are
+    evicted.
+
+    Budgets (GB) come from VIDEO_DESCRIPTION_VRAM_BUDGET_GB (CUDA/MPS) and
+    VIDEO_DESCRIPTION_RAM_BUDGET_GB (CPU). Without them, CUDA defaults to 90%
+    of device memory and other devices are unbounded.
+
+    Idle variants move through tiers: after VIDEO_DESCRIPTION_WARM_AFTER_S
+    seconds unused the weights are parked in CPU RAM ("warm", restored with a
+    device copy instead of a disk reload), after VIDEO_DESCRIPTION_COLD_AFTER_S
+    seconds, or when system RAM runs short, they are released ("cold").
+    Setting either to 0 disables that tier. Transitions are logged and
+    available from transitions().
+
+    All cache state is guarded by one lock, and concurrent requests for a
+    variant that is still loading wait for that single load. Callers that
+    hold a model across a long generation should use lease(): a leased
+    variant is never offloaded, and evicting or clearing it is deferred until
+    the last lease is returned.
     """
 
     _instance = None
-    _qwen3vl_model: Optional[Any] = None
-    _qwen3vl_processor: Optional[Any] = None
-    _model_name = "Qwen/Qwen3-VL-8B-Instruct"
+
+    # key -> {"model", "tier", "size_bytes", "load_time_s", "load_phases", "loaded_at",
+    #         "last_used", "uses", "leases"[, "pending_release"][, "moving"]}
+    # While weights are copied between devices the tier is "restoring" or
+    # "offloading" and "moving" holds a Future that resolves when the copy is done
+    _entries: "OrderedDict[VariantKey, Dict[str, Any]]" = OrderedDict()
+    # model id -> processor
+    _processors: Dict[str, Any] = {}
+    # key -> size_bytes of the last load, used to make room before reloading
+    _known_sizes: Dict[VariantKey, int] = {}
+    # key -> Future of the load currently in flight
+    _inflight: Dict[VariantKey, Future] = {}
+
+    # Idle policy defaults (seconds, 0 = tier disabled)
+    WARM_AFTER_S = 300
+    COLD_AFTER_S = 1800
+    # Release warm variants while system RAM usage is above this percentage
+    RAM_PRESSURE_PERCENT = 90
+    IDLE_CHECK_INTERVAL_S = 15
+    # Most recent tier transitions, oldest first
+    _transitions: "deque[Dict[str, Any]]" = deque(maxlen=200)
+    # Guards _entries, _processors and _inflight
+    _lock = threading.RLock()
+    _reaper: Optional[threading.Thread] = None
 
     @classmethod
-    def _get_model_path(cls) -> Path:
+    def _get_model_path(cls, model_id: str) -> Path:
         """
         Get the local model path in ComfyUI models directory
 
+        Args:
+            model_id: Registry repo id, e.g. Qwen/Qwen3-VL-8B-Instruct
+
         Returns:
-            Path to models/video_description/Qwen3-VL-8B-Instruct/
+            Path to models/video_description/<local dir>/, e.g. Qwen3-VL-8B-Instruct/
         """
-        # Find ComfyUI root directory (go up from custom_nodes)
-        current_file = Path(__file__).resolve()
-        custom_nodes_dir = current_file.parent.parent.parent
-        comfyui_root = custom_nodes_dir.parent
-
-        # ComfyUI models directory
-        model_path = comfyui_root / "models" / "video_description" / "Qwen3-VL-8B-Instruct"
-
-        return model_path
+        return get_models_root() / model_spec(model_id)["local_dir"]
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ModelCache, cls).__new__(cls)
         return cls._instance
 
+    @staticmethod
+    def _detect_device() -> Tuple[str, Optional[str]]:
+        """
+        Determine the inference device
+
+        Returns:
+            Tuple of (device, device_map)
+        """
+        if torch.cuda.is_available():
+            return "cuda", "auto"
+        if torch.backends.mps.is_available():
+            return "mps", None  # MPS doesn't support device_map
+        return "cpu", None
+
+    @classmethod
+    def resolve_variant(cls, use_4bit: bool = False, model_size: str = DEFAULT_MODEL_SIZE) -> VariantKey:
+        """
+        Resolve the cache key a request will actually load
+
+        4-bit requests fall back to FP16 when bitsandbytes is not installed,
+        so they share the FP16 entry instead of loading it twice.
+
+        On CPU the dtype comes from CPUProfile (bfloat16 with native support,
+        else float32) and a 4-bit request maps to dynamic int8 quantization,
+        since bitsandbytes is effectively GPU-only.
+
+        Args:
+            use_4bit: Whether 4-bit quantization is requested
+            model_size: Registry size (2B, 4B, 8B)
+
+        Returns:
+            Tuple of (model id, quantization, dtype, device)
+        """
+        device, _ = cls._detect_device()
+        model_id = model_spec(model_size)["repo_id"]
+
+        if device == "cpu":
+            # Dynamic int8 linears compute from float32 activations
+            if use_4bit:
+                logger.warning("4-bit quantization needs a GPU; using dynamic int8 (float32 activations) "
+                               "on CPU, which takes roughly twice the memory of 4-bit")
+                return (model_id, "int8", "float32", device)
+            return (model_id, "none", CPUProfile.select_dtype(), device)
+
+        quantization = "none"
+        if use_4bit:
+            if importlib.util.find_spec("bitsandbytes") is not None:
+                quantization = "4bit"
+            else:
+                logger.warning("bitsandbytes not available, 4-bit request will use FP16")
+                logger.warning("  pip install bitsandbytes")
+
+        return (model_id, quantization, "float16", device)
+
+    @classmethod
+    def is_downloaded(cls, model_size: str) -> bool:
+        """Check whether a registry size has a complete local snapshot"""
+        model_id = model_spec(model_size)["repo_id"]
+        model_path = cls._get_model_path(model_id)
+        return model_path.exists() and cls._find_snapshot(model_path, model_id) is not None
+
+    @classmethod
+    def route(cls, analysis_type: str, override: str = "auto") -> str:
+        """
+        Pick the model size for an analysis type
+
+        Lightweight presets go to smaller models (ANALYSIS_ROUTES). If the
+        routed size isn't downloaded but another one is, the nearest larger
+        downloaded size (else the largest downloaded one) is used rather than
+        starting a download; with nothing downloaded, the default size is.
+
+        Args:
+            analysis_type: Analysis preset (detailed, summary, keywords); anything
+                else uses the default size
+            override: Explicit size, or "auto" to route
+
+        Returns:
+            Model size (2B, 4B, 8B)
+        """
+        if override and override != "auto":
+            model_spec(override)  # Raises KeyError for sizes not in the registry
+            return override
+
+        preferred = ANALYSIS_ROUTES.get(analysis_type, DEFAULT_MODEL_SIZE)
+        return choose_model_size(preferred, [size for size in MODEL_SIZES if cls.is_downloaded(size)])
+
+    @staticmethod
+    def _budget_bytes(device: str) -> Optional[int]:
+        """Memory budget for a device in bytes (None = unbounded)"""
+        env_name = "VIDEO_DESCRIPTION_RAM_BUDGET_GB" if device == "cpu" else "VIDEO_DESCRIPTION_VRAM_BUDGET_GB"
+        configured = os.environ.get(env_name)
+        if configured:
+            return int(float(configured) * 1024 ** 3)
+
+        if device == "cuda":
+            return int(torch.cuda.get_device_properties(0).total_memory * 0.9)
+
+        return None
+
+    @classmethod
+    def _estimate_size(cls, key: VariantKey, model_source: str) -> int:
+        """Estimate a variant's footprint before loading it"""
+        if key in cls._known_sizes:
+            return cls._known_sizes[key]
+
+        source = Path(model_source)
+        if not source.is_dir():
+            return 0
+
+        weights = sum(f.stat().st_size for f in source.glob("*.safetensors"))
+        # Relative to the 16-bit checkpoint: 4-bit weights take roughly a third,
+        # int8 linears about half, float32 twice
+        if key[1] == "4bit":
+            return int(weights * 0.35)
+        if key[1] == "int8":
+            return int(weights * 0.55)
+        return weights * 2 if key[2] == "float32" else weights
+
     @classmethod
-    def get_qwen3vl(cls, use_4bit: bool = False) -> Tuple[Any, Any]:
+    def _evict_for(cls, device: str, incoming_bytes: int, keep: Optional[VariantKey] = None):
+        """
+        Evict least recently used variants on a device until incoming_bytes fits
+
+        Args:
+            device: Device whose budget applies
+            incoming_bytes: Bytes that must fit alongside the remaining entries
+            keep: Key that must not be evicted
+        """
+        budget = cls._budget_bytes(device)
+        if budget is None:
+            return
+
+        # Warm variants sit in CPU RAM and don't count against the device budget;
+        # variants mid-copy do until the copy finishes, but can't be evicted yet
+        def resident() -> List[VariantKey]:
+            return [
+                k for k, e in cls._entries.items()
+                if k[3] == device and e["tier"] in ("hot", "restoring", "offloading")
+                and k != keep and "pending_release" not in e
+            ]
+
+        with cls._lock:
+            for key in [k for k in resident() if "moving" not in cls._entries[k]]:
+                if sum(cls._entries[k]["size_bytes"] for k in resident()) + incoming_bytes <= budget:
+                    break
+                logger.info(
+                    f"Evicting {key[0]} ({key[1]}, {key[2]}) from {device}: "
+                    f"{cls._entries[key]['size_bytes'] / 1024 ** 3:.2f} GB, budget {budget / 1024 ** 3:.2f} GB"
+                )
+                cls._release(key, "over budget")
+
+    @staticmethod
+    def _is_complete_snapshot(snapshot_dir: Path) -> bool:
+        """
+        Check that a snapshot has its config and every weight shard
+
+        Interrupted downloads leave snapshots with a config but missing (or
+        dangling symlinked) shards, which only fail deep inside from_pretrained.
+        """
+        if not (snapshot_dir / "config.json").is_file():
+            return False
+
+        index_file = snapshot_dir / "model.safetensors.index.json"
+        if index_file.is_file():
+            try:
+                with open(index_file) as f:
+                    shards = set(json.load(f)["weight_map"].values())
+            except (OSError, ValueError, KeyError):
+                return False
+            return all((snapshot_dir / shard).is_file() for shard in shards)
+
+        return (snapshot_dir / "model.safetensors").is_file()
+
+    @classmethod
+    def _find_snapshot(cls, model_path: Path, model_id: str) -> Optional[Path]:
+        """
+        Pick the snapshot to load from the local HF cache
+
+        Prefers the revision refs/main points at, then the newest complete
+        snapshot, so the choice doesn't depend on directory listing order.
+
+        Returns:
+            Snapshot directory, or None if no complete snapshot exists
+        """
+        # HF downloads to: model_path/models--Qwen--Qwen3-VL-8B-Instruct/snapshots/[hash]/
+        repo_dir = model_path / ("models--" + model_id.replace("/", "--"))
+
+        ref_file = repo_dir / "refs" / "main"
+        if ref_file.is_file():
+            snapshot_dir = repo_dir / "snapshots" / ref_file.read_text().strip()
+            if cls._is_complete_snapshot(snapshot_dir):
+                return snapshot_dir
+            logger.warning(f"refs/main points at an incomplete snapshot: {snapshot_dir}")
+
+        snapshots_dir = repo_dir / "snapshots"
+        if not snapshots_dir.is_dir():
+            return None
+
+        snapshots = sorted(
+            (d for d in snapshots_dir.iterdir() if d.is_dir()),
+            key=lambda d: (d.stat().st_mtime, d.name),
+            reverse=True
+        )
+        for snapshot_dir in snapshots:
+            if cls._is_complete_snapshot(snapshot_dir):
+                return snapshot_dir
+            logger.warning(f"Skipping incomplete snapshot: {snapshot_dir}")
+
+        return None
+
+    @classmethod
+    def _resolve_model_source(cls, model_id: str) -> Tuple[str, bool, Path]:
+        """
+        Locate the model in the local HF cache structure
+
+        Args:
+            model_id: Registry repo id
+
+        Returns:
+            Tuple of (model_source, local_model_exists, model_path)
+        """
+        # Get local model path
+        model_path = cls._get_model_path(model_id)
+
+        if model_path.exists():
+            snapshot_dir = cls._find_snapshot(model_path, model_id)
+            if snapshot_dir is not None:
+                logger.info(f"Found model in HF cache: {snapshot_dir}")
+                return str(snapshot_dir), True, model_path
+
+        logger.info(f"Local model not found at: {model_path}")
+        logger.info(f"Will download from Hugging Face: {model_id}")
+        logger.info(f"Saving to: {model_path}")
+        # Create directory if it doesn't exist
+        model_path.mkdir(parents=True, exist_ok=True)
+        return model_id, False, model_path
+
+    @classmethod
+    def _load_model(cls, key: VariantKey, model_source: str, local_model_exists: bool, model_path: Path) -> Any:
+        """
+        Load the model weights for a variant
+
+        Safetensors shards are memory-mapped and copied tensor by tensor
+        (low_cpu_mem_usage), so peak RAM stays near one copy of the weights.
+
+        Returns:
+            Loaded model; on its target device when a device_map or
+            quantization placed it, otherwise on CPU for _move_to_device()
+        """
+        # Lazy import: transformers model classes are heavy and slow to import
+        from transformers import Qwen3VLForConditionalGeneration
+
+        _, quantization, dtype_name, device = key
+        _, device_map = cls._detect_device()
+        dtype = getattr(torch, dtype_name)
+
+        load_kwargs = {"low_cpu_mem_usage": True, "use_safetensors": True}
+        if quantization == "int8":
+            # Loaded in float32; CPUProfile quantizes the linear layers afterwards
+            load_kwargs["dtype"] = dtype
+            logger.info("Loading model in float32 for int8 dynamic quantization...")
+        elif quantization == "4bit":
+            from transformers import BitsAndBytesConfig
+
+            load_kwargs["quantization_config"] = BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_compute_dtype=dtype
+            )
+            logger.info("Loading model with 4-bit quantization...")
+        else:
+            load_kwargs["dtype"] = dtype
+            logger.info(f"Loading model in {dtype_name}...")
+
+        if device_map:
+            load_kwargs["device_map"] = device_map
+        if not local_model_exists:
+            load_kwargs["cache_dir"] = str(model_path)
+
+        return Qwen3VLForConditionalGeneration.from_pretrained(
+            model_source,
+            **load_kwargs
+        )
+
+    @classmethod
+    def _move_to_device(cls, key: VariantKey, model: Any) -> Any:
+        """Move a freshly loaded model to its variant's device if the loader didn't"""
+        _, device_map = cls._detect_device()
+        # device_map and bitsandbytes place weights themselves
+        if device_map or key[1] == "4bit":
+            return model
+        return model.to(key[3])
+
+    @classmethod
+    def _get_processor(cls, model_id: str, model_source: str, local_model_exists: bool, model_path: Path) -> Any:
+        """Get or load the processor shared by every variant of a model"""
+        with cls._lock:
+            processor = cls._processors.get(model_id)
+        if processor is not None:
+            return processor
+
+        # Loaded outside the lock; if two variants race, the first one stored wins
+        processor = cls._load_processor(model_source, local_model_exists, model_path)
+        with cls._lock:
+            return cls._processors.setdefault(model_id, processor)
+
+    @staticmethod
+    def _load_processor(model_source: str, local_model_exists: bool, model_path: Path) -> Any:
+        """Load a processor from the hub or a local snapshot"""
+        from transformers import AutoProcessor
+
+        processor_kwargs = {}
+        if not local_model_exists:
+            processor_kwargs["cache_dir"] = str(model_path)
+
+        return AutoProcessor.from_pretrained(
+            model_source,
+            **processor_kwargs
+        )
+
+    @classmethod
+    def _acquire(cls, key: VariantKey, lease: bool) -> Tuple[Any, Any, Dict[str, Any]]:
+        """
+        Get a variant from the cache, loading it at most once across threads
+
+        The first caller to miss owns the load; concurrent callers for the same
+        variant wait on its future. Warm variants are restored the same way:
+        the first caller copies the weights back outside the lock while others
+        wait on the entry's "moving" future, so a multi-GB copy never blocks
+        requests for other variants. The hit path (and the lease count) is
+        taken under the lock, so a returned entry can't be evicted in between.
+
+        Args:
+            key: Variant to get
+            lease: Whether to take a lease on the entry
+
+        Returns:
+            Tuple of (model, processor, entry)
+        """
+        while True:
+            with cls._lock:
+                entry = cls._entries.get(key)
+                moving = None
+                if entry is not None:
+                    if "pending_release" in entry:
+                        logger.info(f"Cancelling deferred release of {key[0]} ({key[1]}, {key[2]}): requested again")
+                        del entry["pending_release"]
+                    entry["last_used"] = time.time()
+                    moving = entry.get("moving")
+                    restore = moving is None and entry["tier"] == "warm"
+                    if restore:
+                        cls._evict_for(key[3], entry["size_bytes"], keep=key)
+                        moving = cls._begin_move(entry, "restoring")
+                    elif moving is None:
+                        cls._entries.move_to_end(key)
+                        entry["uses"] += 1
+                        if lease:
+                            entry["leases"] += 1
+                        return entry["model"], cls._processors[key[0]], entry
+                else:
+                    future = cls._inflight.get(key)
+                    owner = future is None
+                    if owner:
+                        future = Future()
+                        cls._inflight[key] = future
+
+            if moving is not None:
+                if restore:
+                    cls._restore(key, entry)
+                else:
+                    logger.info(f"Waiting for {key[0]} ({key[1]}, {key[2]}) to finish {entry['tier']}...")
+                    wait([moving])
+                # Loop back to take the entry through the hit path
+                continue
+
+            if not owner:
+                logger.info("Waiting for in-flight model load to finish...")
+                future.result()
+                continue
+
+            try:
+                result = cls._load_entry(key)
+            except BaseException as e:
+                with cls._lock:
+                    cls._inflight.pop(key, None)
+                future.set_exception(e)
+                raise
+
+            with cls._lock:
+                cls._inflight.pop(key, None)
+            future.set_result(result)
+            # Loop back to take the entry through the hit path
+
+    @classmethod
+    def get_qwen3vl(cls, use_4bit: bool = False, model_size: str = DEFAULT_MODEL_SIZE) -> Tuple[Any, Any]:
         """
         Get or load Qwen3-VL model and processor
 
+        Concurrent calls for a variant that is loading (including a background
+        preload) wait for that load instead of starting a second one. The
+        returned model is not leased; use lease() to keep it from being offloaded
+        or evicted while in use.
+
         Args:
             use_4bit: Whether to use 4-bit quantization for memory efficiency
+            model_size: Registry size (2B, 4B, 8B), see route()
 
         Returns:
             Tuple of (model, processor)
         """
-        if cls._qwen3vl_model is None or cls._qwen3vl_processor is None:
-            # Lazy import: transformers model classes are heavy and slow to import
-            from transformers import Qwen3VLForConditionalGeneration, AutoProcessor
-
-            # Suppress known deprecation warnings from transformers library
-            warnings.filterwarnings('ignore', message='.*torchvision.*deprecated.*')
-            warnings.filterwarnings('ignore', category=FutureWarning, module='transformers')
-            # Get local model path
-            model_path = cls._get_model_path()
-
-            # Check if model exists locally in Hugging Face cache structure
-            # HF downloads to: model_path/models--Qwen--Qwen3-VL-8B-Instruct/snapshots/[hash]/
-            local_model_exists = False
-            if model_path.exists():
-                # Look for HF cache structure
-                hf_cache_dirs = list(model_path.glob("models--Qwen--Qwen3-VL-8B-Instruct/snapshots/*"))
-                if hf_cache_dirs:
-                    # Use the HF cache directory
-                    snapshot_dir = hf_cache_dirs[0]
-                    if (snapshot_dir / "config.json").exists():
-                        local_model_exists = True
-                        model_source = str(snapshot_dir)
-                        logger.info(f"Found model in HF cache: {snapshot_dir}")
-
-            if not local_model_exists:
-                logger.info(f"Local model not found at: {model_path}")
-                logger.info(f"Will download from Hugging Face: {cls._model_name}")
-                logger.info(f"Saving to: {model_path}")
-                model_source = cls._model_name
-                # Create directory if it doesn't exist
-                model_path.mkdir(parents=True, exist_ok=True)
-
-            logger.info(f"4-bit quantization: {use_4bit}")
-
-            # Determine device
-            if torch.cuda.is_available():
-                device = "cuda"
-                device_map = "auto"
-            elif torch.backends.mps.is_available():
-                device = "mps"
-                device_map = None  # MPS doesn't support device_map
-            else:
-                device = "cpu"
-                device_map = None
+        model, processor, _ = cls._acquire(cls.resolve_variant(use_4bit, model_size), lease=False)
+        return model, processor
+
+    @classmethod
+    @contextmanager
+    def lease(cls, use_4bit: bool = False, model_size: str = DEFAULT_MODEL_SIZE) -> Iterator[Tuple[Any, Any]]:
+        """
+        Get or load Qwen3-VL model and processor for the duration of a block
+
+        While any lease on a variant is held it stays on its device: the idle
+        policy skips it, and budget evictions or clear_cache() only mark it for
+        release once the last lease is returned.
+
+        Example:
+            with ModelCache.lease(use_4bit) as (model, processor):
+                ...
+
+        Args:
+            use_4bit: Whether to use 4-bit quantization for memory efficiency
+            model_size: Registry size (2B, 4B, 8B), see route()
+
+        Yields:
+            Tuple of (model, processor)
+        """
+        key = cls.resolve_variant(use_4bit, model_size)
+        model, processor, entry = cls._acquire(key, lease=True)
+        try:
+            yield model, processor
+        finally:
+            with cls._lock:
+                entry["leases"] -= 1
+                entry["last_used"] = time.time()
+                if not entry["leases"] and "pending_release" in entry and cls._entries.get(key) is entry:
+                    cls._release(key, entry["pending_release"])
+
+    @classmethod
+    def preload(cls, use_4bit: bool = False, model_size: str = DEFAULT_MODEL_SIZE) -> Future:
+        """
+        Start loading a variant in a background thread
+
+        Returns immediately; the variant is resolved (device and dtype probing)
+        on the background thread too. get_qwen3vl() calls for the same variant
+        wait on the in-flight load instead of starting their own.
 
-            logger.info(f"Using device: {device}")
+        Args:
+            use_4bit: Whether to use 4-bit quantization for memory efficiency
+            model_size: Registry size (2B, 4B, 8B)
 
+        Returns:
+            Future resolving to (model, processor)
+        """
+        future = Future()
+
+        def run():
             try:
-                if use_4bit:
-                    try:
-                        from transformers import BitsAndBytesConfig
-
-                        quantization_config = BitsAndBytesConfig(
-                            load_in_4bit=True,
-                            bnb_4bit_compute_dtype=torch.float16
-                        )
-
-                        logger.info("Loading model with 4-bit quantization...")
-                        load_kwargs = {
-                            "quantization_config": quantization_config,
-                        }
-                        if device_map:
-                            load_kwargs["device_map"] = device_map
-                        if not local_model_exists:
-                            load_kwargs["cache_dir"] = str(model_path)
-
-                        cls._qwen3vl_model = Qwen3VLForConditionalGeneration.from_pretrained(
-                            model_source,
-                            **load_kwargs
-                        )
-                    except ImportError as e:
-                        logger.warning(f"bitsandbytes not available: {e}")
-                        logger.warning("Falling back to FP16 loading. Install bitsandbytes for 4-bit quantization:")
-                        logger.warning("  pip install bitsandbytes")
-
-                        # Fall back to FP16
-                        logger.info("Loading model in FP16...")
-                        load_kwargs = {"dtype": torch.float16}
-                        if device_map:
-                            load_kwargs["device_map"] = device_map
-                        if not local_model_exists:
-                            load_kwargs["cache_dir"] = str(model_path)
-
-                        cls._qwen3vl_model = Qwen3VLForConditionalGeneration.from_pretrained(
-                            model_source,
-                            **load_kwargs
-                        )
-                        if not device_map:
-                            cls._qwen3vl_model = cls._qwen3vl_model.to(device)
-                else:
-                    logger.info("Loading model in FP16...")
-                    load_kwargs = {"dtype": torch.float16}
-                    if device_map:
-                        load_kwargs["device_map"] = device_map
-                    if not local_model_exists:
-                        load_kwargs["cache_dir"] = str(model_path)
-
-                    cls._qwen3vl_model = Qwen3VLForConditionalGeneration.from_pretrained(
-                        model_source,
-                        **load_kwargs
-                    )
-                    if not device_map:
-                        cls._qwen3vl_model = cls._qwen3vl_model.to(device)
-
-                processor_kwargs = {}
-                if not local_model_exists:
-                    processor_kwargs["cache_dir"] = str(model_path)
-
-                cls._qwen3vl_processor = AutoProcessor.from_pretrained(
-                    model_source,
-                    **processor_kwargs
+                key = cls.resolve_variant(use_4bit, model_size)
+                logger.info(f"Preloading {key[0]} ({key[1]}, {key[2]}) on {key[3]} in the background")
+                future.set_result(cls._acquire(key, lease=False)[:2])
+            except BaseException as e:
+                logger.error(f"Background model preload failed: {e}")
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="Qwen3VLPreload", daemon=True).start()
+
+        return future
+
+    @classmethod
+    def preload_from_env(cls) -> Optional[Future]:
+        """
+        Start a background preload if VIDEO_DESCRIPTION_PRELOAD is set
+
+        Accepted values: "1", "true", "yes" or "fp16" preload the FP16 variant,
+        "4bit" the 4-bit variant. Anything else (or unset) does nothing.
+        VIDEO_DESCRIPTION_PRELOAD_SIZE picks the model size (default 8B).
+
+        Returns:
+            The preload future, or None if preloading is off
+        """
+        setting = os.environ.get("VIDEO_DESCRIPTION_PRELOAD", "").strip().lower()
+        model_size = os.environ.get("VIDEO_DESCRIPTION_PRELOAD_SIZE", DEFAULT_MODEL_SIZE).strip().upper()
+        if setting in ("1", "true", "yes", "fp16"):
+            return cls.preload(use_4bit=False, model_size=model_size)
+        if setting == "4bit":
+            return cls.preload(use_4bit=True, model_size=model_size)
+        return None
+
+    @classmethod
+    def _load_entry(cls, key: VariantKey) -> Tuple[Any, Any]:
+        """
+        Load a variant and register it in the cache
+
+        Returns:
+            Tuple of (model, processor)
+        """
+        # Suppress known deprecation warnings from transformers library
+        warnings.filterwarnings('ignore', message='.*torchvision.*deprecated.*')
+        warnings.filterwarnings('ignore', category=FutureWarning, module='transformers')
+
+        phases = {}
+        start = time.perf_counter()
+        model_id, quantization, dtype_name, device = key
+        model_source, local_model_exists, model_path = cls._resolve_model_source(model_id)
+        phases["resolve"] = time.perf_counter() - start
+
+        logger.info(f"Quantization: {quantization} ({dtype_name})")
+        logger.info(f"Using device: {device}")
+
+        # Make room before loading so two variants never overshoot the budget together
+        cls._evict_for(device, cls._estimate_size(key, model_source))
+        cls._ensure_reaper()
+
+        def timed(phase, fn, *args):
+            phase_start = time.perf_counter()
+            result = fn(*args)
+            phases[phase] = time.perf_counter() - phase_start
+            return result
+
+        try:
+            # The processor (tokenizer files, preprocessor config) loads while the weights stream in
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="Qwen3VLProcessor") as pool:
+                processor_future = pool.submit(
+                    timed, "processor", cls._get_processor, model_id, model_source, local_model_exists, model_path
                 )
+                model = timed("weights", cls._load_model, key, model_source, local_model_exists, model_path)
+                processor = processor_future.result()
+            model = timed("device_move", cls._move_to_device, key, model)
+            if device == "cpu":
+                model = timed("cpu_profile", CPUProfile.apply, model, quantization)
+            load_time = time.perf_counter() - start
+            phases = {
+                name: phases[name]
+                for name in ("resolve", "weights", "processor", "device_move", "cpu_profile")
+                if name in phases
+            }
+
+            size_bytes = int(model.get_memory_footprint())
+            if quantization == "int8":
+                size_bytes += CPUProfile.packed_weight_bytes(model)
+            cls._known_sizes[key] = size_bytes
+            now = time.time()
+            with cls._lock:
+                cls._processors[model_id] = processor
+                cls._entries[key] = {
+                    "model": model,
+                    "tier": "hot",
+                    "size_bytes": size_bytes,
+                    "load_time_s": load_time,
+                    "load_phases": phases,
+                    "loaded_at": now,
+                    "last_used": now,
+                    "uses": 0,
+                    "leases": 0,
+                }
+                cls._evict_for(device, 0, keep=key)
+
+            logger.info("✓ Model loaded successfully")
+            logger.info(f"Model device: {model.device}")
+            logger.info(f"Model location: {model_path}")
+            logger.info(f"Variant: {quantization}/{dtype_name} on {device}, "
+                        f"{size_bytes / 1024 ** 3:.2f} GB in {load_time:.1f}s")
+            logger.info("Load phases: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in phases.items()))
+
+        except Exception as e:
+            logger.error(f"Failed to load model: {e}")
+            raise
+
+        return model, processor
+
+    @staticmethod
+    def _can_offload(key: VariantKey, model: Any) -> bool:
+        """Whether a variant can be parked in CPU RAM and copied back"""
+        # CPU variants have nowhere to go; bitsandbytes weights can't round-trip through .to()
+        if key[3] == "cpu" or key[1] == "4bit":
+            return False
+        # Models dispatched across several devices (or disk) keep their placement
+        device_map = getattr(model, "hf_device_map", None) or {}
+        return len(set(device_map.values())) <= 1
+
+    @staticmethod
+    def _ram_status() -> Optional[Tuple[int, float]]:
+        """System RAM as (available bytes, percent used), None if psutil is missing"""
+        try:
+            import psutil
+        except ImportError:
+            return None
+
+        memory = psutil.virtual_memory()
+        return memory.available, memory.percent
 
-                logger.info("✓ Model loaded successfully")
-                logger.info(f"Model device: {cls._qwen3vl_model.device}")
-                logger.info(f"Model location: {model_path}")
+    @classmethod
+    def _record_transition(cls, key: VariantKey, source: str, target: str, reason: str, seconds: float):
+        """Log a tier transition and keep it for transitions()"""
+        cls._transitions.append({
+            "model_id": key[0],
+            "quantization": key[1],
+            "dtype": key[2],
+            "device": key[3],
+            "from": source,
+            "to": target,
+            "reason": reason,
+            "seconds": seconds,
+            "at": time.time(),
+        })
+        logger.info(f"{key[0]} ({key[1]}, {key[2]}) on {key[3]}: {source} → {target} ({reason}) in {seconds:.2f}s")
+
+    @staticmethod
+    def _begin_move(entry: Dict[str, Any], tier: str) -> Future:
+        """Mark an entry as copying between devices (caller holds the lock)"""
+        entry["moving"] = Future()
+        entry["tier"] = tier
+        return entry["moving"]
 
-            except Exception as e:
-                logger.error(f"Failed to load model: {e}")
-                raise
+    @classmethod
+    def _finish_move(cls, key: VariantKey, entry: Dict[str, Any], tier: str):
+        """Settle an entry after a copy, run any release deferred meanwhile, and wake waiters"""
+        with cls._lock:
+            moving = entry.pop("moving")
+            entry["tier"] = tier
+            if not entry["leases"] and "pending_release" in entry and cls._entries.get(key) is entry:
+                cls._release(key, entry["pending_release"])
+        moving.set_result(tier)
+
+    @classmethod
+    def _move(cls, key: VariantKey, entry: Dict[str, Any], source: str, target: str, device: str, reason: str):
+        """
+        Copy an entry's weights for a tier change, outside the lock
+
+        The caller marks the entry with _begin_move() under the lock first, so
+        requests for this variant wait on it while every other variant stays
+        available. A failed copy leaves the weights in an unknown state, so the
+        entry is released and the next request reloads it.
+        """
+        start = time.perf_counter()
+        try:
+            entry["model"].to(device)
+            if key[3] == "cuda" and target == "warm":
+                torch.cuda.empty_cache()
+        except BaseException as e:
+            logger.error(f"{key[0]} ({key[1]}, {key[2]}): {source} → {target} failed: {e}")
+            with cls._lock:
+                entry["pending_release"] = f"{source} → {target} failed"
+            cls._finish_move(key, entry, source)
+            raise
+
+        cls._record_transition(key, source, target, reason, time.perf_counter() - start)
+        cls._finish_move(key, entry, target)
+
+    @classmethod
+    def _offload(cls, key: VariantKey, entry: Dict[str, Any], reason: str):
+        """Move a hot variant's weights to CPU RAM (hot → warm), marked "offloading" by the caller"""
+        cls._move(key, entry, "hot", "warm", "cpu", reason)
+
+    @classmethod
+    def _restore(cls, key: VariantKey, entry: Dict[str, Any]):
+        """Copy a warm variant's weights back to its device (warm → hot), marked "restoring" by the caller"""
+        cls._move(key, entry, "warm", "hot", key[3], "requested")
+
+    @classmethod
+    def _release(cls, key: VariantKey, reason: str):
+        """Drop a variant from the cache (hot/warm → cold), deferred while it is leased or moving"""
+        entry = cls._entries[key]
+        if entry["leases"] or "moving" in entry:
+            if "pending_release" not in entry:
+                holder = f"{entry['leases']} lease(s) held" if entry["leases"] else f"{entry['tier']} in progress"
+                logger.info(f"Deferring release of {key[0]} ({key[1]}, {key[2]}): {holder} ({reason})")
+            entry["pending_release"] = reason
+            return
+
+        start = time.perf_counter()
+        entry = cls._entries.pop(key)
+        tier = entry["tier"]
+        del entry
+        if tier == "hot" and key[3] == "cuda":
+            torch.cuda.empty_cache()
+        cls._record_transition(key, tier, "cold", reason, time.perf_counter() - start)
+
+    @staticmethod
+    def _idle_seconds(env_name: str, default: float) -> float:
+        configured = os.environ.get(env_name)
+        return float(configured) if configured else float(default)
 
-        return cls._qwen3vl_model, cls._qwen3vl_processor
+    @classmethod
+    def apply_idle_policy(cls, now: Optional[float] = None):
+        """
+        Move idle variants down a tier
+
+        Called periodically by the reaper thread; safe to call directly.
+        Offloads are copied outside the lock, like restores in _acquire().
+
+        Args:
+            now: Current time (defaults to time.time())
+        """
+        warm_after = cls._idle_seconds("VIDEO_DESCRIPTION_WARM_AFTER_S", cls.WARM_AFTER_S)
+        cold_after = cls._idle_seconds("VIDEO_DESCRIPTION_COLD_AFTER_S", cls.COLD_AFTER_S)
+        now = time.time() if now is None else now
+
+        offloads = []
+        with cls._lock:
+            for key, entry in list(cls._entries.items()):
+                # Leased variants are in use, not idle; moving ones are being handled
+                if entry["leases"] or "moving" in entry:
+                    continue
+                idle = now - entry["last_used"]
+                if cold_after and idle >= cold_after:
+                    cls._release(key, f"idle {idle:.0f}s")
+                elif (warm_after and idle >= warm_after and entry["tier"] == "hot"
+                        and cls._can_offload(key, entry["model"])):
+                    ram = cls._ram_status()
+                    if ram is not None and ram[0] < entry["size_bytes"]:
+                        cls._release(key, f"idle {idle:.0f}s, not enough RAM to keep warm")
+                    else:
+                        cls._begin_move(entry, "offloading")
+                        offloads.append((key, entry, f"idle {idle:.0f}s"))
+
+        for key, entry, reason in offloads:
+            try:
+                cls._offload(key, entry, reason)
+            except Exception:
+                # Already logged and released by _move(); don't strand the other offloads
+                continue
+
+        with cls._lock:
+            # Warm variants are the first thing to give back when RAM runs short
+            for key in [k for k, e in cls._entries.items() if e["tier"] == "warm" and not e["leases"]]:
+                ram = cls._ram_status()
+                if ram is None or ram[1] < cls.RAM_PRESSURE_PERCENT:
+                    break
+                cls._release(key, f"memory pressure, RAM {ram[1]:.0f}% used")
+
+    @classmethod
+    def _ensure_reaper(cls):
+        """Start the idle policy thread once"""
+        with cls._lock:
+            if cls._reaper is not None and cls._reaper.is_alive():
+                return
+
+            def run():
+                while True:
+                    time.sleep(cls.IDLE_CHECK_INTERVAL_S)
+                    try:
+                        cls.apply_idle_policy()
+                    except Exception as e:
+                        logger.error(f"Idle policy check failed: {e}")
+
+            cls._reaper = threading.Thread(target=run, name="Qwen3VLIdleReaper", daemon=True)
+            cls._reaper.start()
+
+    @classmethod
+    def transitions(cls) -> List[Dict[str, Any]]:
+        """
+        Get recent tier transitions, oldest first
+
+        Returns:
+            List of dicts with model_id, quantization, dtype, device, from, to,
+            reason, seconds and at
+        """
+        return list(cls._transitions)
+
+    @staticmethod
+    def _entry_stats(key: VariantKey, entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "model_id": key[0],
+            "quantization": key[1],
+            "dtype": key[2],
+            "device": key[3],
+            **{name: value for name, value in entry.items() if name not in ("model", "moving")},
+        }
+
+    @classmethod
+    def stats(cls) -> List[Dict[str, Any]]:
+        """
+        Get per-variant cache statistics, least recently used first
+
+        Returns:
+            List of dicts with model_id, quantization, dtype, device, tier,
+            size_bytes, load_time_s, load_phases, loaded_at, last_used and uses
+        """
+        with cls._lock:
+            return [cls._entry_stats(key, entry) for key, entry in cls._entries.items()]
+
+    @classmethod
+    def variant_stats(cls, use_4bit: bool = False, model_size: str = DEFAULT_MODEL_SIZE) -> Optional[Dict[str, Any]]:
+        """
+        Get cache statistics for the variant a request resolves to
+
+        Args:
+            use_4bit: Whether 4-bit quantization is requested
+            model_size: Registry size (2B, 4B, 8B)
+
+        Returns:
+            Same dict as a stats() item, or None if the variant isn't cached
+        """
+        key = cls.resolve_variant(use_4bit, model_size)
+        with cls._lock:
+            entry = cls._entries.get(key)
+            return None if entry is None else cls._entry_stats(key, entry)
 
     @classmethod
     def clear_cache(cls):
         """Clear cached models to free memory"""
         logger.info("Clearing model cache")
-        cls._qwen3vl_model = None
-        cls._qwen3vl_processor = None
+        with cls._lock:
+            for key in list(cls._entries):
+                cls._release(key, "cleared")
+            # Variants whose release was deferred still need their processor
+            in_use = {key[0] for key in cls._entries}
+            for model_id in [m for m in cls._processors if m not in in_use]:
+                del cls._processors[model_id]
 
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
 
     @classmethod
-    def is_loaded(cls) -> bool:
-        """Check if model is already loaded"""
-        return cls._qwen3vl_model is not None and cls._qwen3vl_processor is not None
+    def is_loaded(cls, use_4bit: Optional[bool] = None, model_size: str = DEFAULT_MODEL_SIZE) -> bool:
+        """
+        Check if a model is already loaded
+
+        Args:
+            use_4bit: Check the variant this request resolves to (None = any variant)
+            model_size: Registry size the variant check applies to
+        """
+        if use_4bit is None:
+            return bool(cls._entries)
+        return cls.resolve_variant(use_4bit, model_size) in cls._entries
@@ -0,0 +1,99 @@
+"""
+Model Registry for Qwen3-VL
+Known model sizes, where each one lives locally, and which size each
+analysis type is routed to
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+# Smallest first; routing falls back along this order
+MODEL_REGISTRY: Dict[str, Dict[str, Any]] = {
+    "2B": {
+        "repo_id": "Qwen/Qwen3-VL-2B-Instruct",
+        "local_dir": "Qwen3-VL-2B-Instruct",
+        "fp16_gb": 4.5,
+    },
+    "4B": {
+        "repo_id": "Qwen/Qwen3-VL-4B-Instruct",
+        "local_dir": "Qwen3-VL-4B-Instruct",
+        "fp16_gb": 9,
+    },
+    "8B": {
+        "repo_id": "Qwen/Qwen3-VL-8B-Instruct",
+        "local_dir": "Qwen3-VL-8B-Instruct",
+        "fp16_gb": 17,
+    },
+}
+
+MODEL_SIZES: List[str] = list(MODEL_REGISTRY)
+DEFAULT_MODEL_SIZE = "8B"
+
+# The summary and keywords presets produce ~128 tokens from a short prompt;
+# smaller models handle them at a fraction of the latency and memory
+ANALYSIS_ROUTES: Dict[str, str] = {
+    "summary": "2B",
+    "keywords": "4B",
+    "detailed": "8B",
+}
+
+
+def get_models_root() -> Path:
+    """
+    Get the ComfyUI models directory for this extension
+
+    Returns:
+        Path to models/video_description/
+    """
+    # Find ComfyUI root directory (go up from custom_nodes)
+    current_file = Path(__file__).resolve()
+    custom_nodes_dir = current_file.parent.parent.parent
+    comfyui_root = custom_nodes_dir.parent
+
+    return comfyui_root / "models" / "video_description"
+
+
+def model_spec(model: str) -> Dict[str, Any]:
+    """
+    Look up a registry entry by size ("2B") or repo id ("Qwen/Qwen3-VL-2B-Instruct")
+
+    Raises:
+        KeyError: If the model is not in the registry
+    """
+    if model in MODEL_REGISTRY:
+        return MODEL_REGISTRY[model]
+
+    for spec in MODEL_REGISTRY.values():
+        if spec["repo_id"] == model:
+            return spec
+
+    raise KeyError(f"Unknown model: {model} (known sizes: {', '.join(MODEL_SIZES)})")
+
+
+def choose_model_size(preferred: str, available: Sequence[str]) -> str:
+    """
+    Pick the model size to use given what is downloaded
+
+    Uses the preferred size if it is available. Otherwise prefers the next
+    larger downloaded size over a smaller one, so routing never trades
+    quality for a download. With nothing downloaded it returns
+    DEFAULT_MODEL_SIZE, so auto routing fetches the one default model rather
+    than a different size per analysis type; other sizes are only downloaded
+    when picked explicitly.
+
+    Args:
+        preferred: Size the routing policy asks for
+        available: Sizes with a complete local snapshot
+
+    Returns:
+        Model size
+    """
+    if not available:
+        return DEFAULT_MODEL_SIZE
+    if preferred in available:
+        return preferred
+
+    rank = MODEL_SIZES.index(preferred)
+    ordered = sorted(available, key=MODEL_SIZES.index)
+    larger = [size for size in ordered if MODEL_SIZES.index(size) > rank]
+    return larger[0] if larger else ordered[-1]
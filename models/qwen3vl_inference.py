@@ -3,116 +3,980 @@ Qwen3-VL Inference Wrapper
 Handles video description generation with Qwen3-VL model
 """
 
+import numpy as np
+import threading
+import time
 import torch
+import warnings
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Union, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Pre-decoded RGB frames shaped (N, H, W, 3): uint8, or float in [0, 1]
+FrameInput = Union[np.ndarray, torch.Tensor]
+
+# One time window: (start, end, timestamps, frames)
+WindowInput = Tuple[float, float, np.ndarray, FrameInput]
+
+# Streaming progress callback: (text so far, tokens so far, decode tokens/sec, done)
+ProgressCallback = Callable[[str, int, float, bool], None]
+
+# One generate_batch request: {"frames", "timestamps", "video_fps"},
+# {"load_frames", "video_fps", "video_shape"} or {"video_path"[, "fps"][, "video_shape"]},
+# plus optional "prompt", "max_new_tokens", "temperature", "top_p". load_frames
+# returns (timestamps, frames) when the item's batch runs; video_shape is the
+# (frames, height, width) the processor will see, used to size batches
+BatchItem = Dict[str, Any]
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as M:SS or H:MM:SS"""
+    total = int(round(seconds))
+    hours, remainder = divmod(total, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
 
 class Qwen3VLInference:
     """
     Wrapper for Qwen3-VL video description inference
     """
 
-    def __init__(self, model, processor):
+    # Frame sides must be multiples of this (16px patches merged 2x2)
+    PATCH_FACTOR = 32
+
+    # Per-window output length in windowed (map-reduce) mode
+    WINDOW_MAX_NEW_TOKENS = 160
+
+    # generate_batch limits: padded tokens per batch (batch x (longest prompt + longest output))
+    BATCH_TOKEN_BUDGET = 32768
+    MAX_BATCH_SIZE = 8
+
+    def __init__(self, model, processor, feature_cache=None):
         """
         Initialize inference wrapper
 
         Args:
             model: Qwen3VLForConditionalGeneration model instance
             processor: AutoProcessor instance
+            feature_cache: Optional VisionFeatureCache; installed on the model so
+                calls inside visual_features_key() reuse vision-encoder output
         """
         self.model = model
         self.processor = processor
         self.device = model.device
+        self.feature_cache = feature_cache
+        self._visual_key: Optional[str] = None
+
+        if feature_cache is not None:
+            feature_cache.install(model)
+
+    @contextmanager
+    def visual_features_key(self, key: Optional[str]) -> Iterator[None]:
+        """
+        Reuse vision-encoder output for single-video generations in this block
+
+        The key must identify the exact frames the model will see: video
+        content, sampling settings and model variant. On a hit the vision
+        tower is skipped and only the text prompt is prefilled; a grid
+        mismatch falls back to encoding. No-op without a feature cache.
+
+        Args:
+            key: Feature cache key (None = encode as usual)
+        """
+        previous = self._visual_key
+        self._visual_key = key
+        try:
+            yield
+        finally:
+            self._visual_key = previous
+
+    def _bind_visual_features(self, inputs):
+        """Context binding the inputs' video pixels to the active feature cache key"""
+        if self.feature_cache is None or self._visual_key is None:
+            return nullcontext()
+        return self.feature_cache.bind(inputs.get("pixel_values_videos"), self._visual_key)
 
     def generate_description(
         self,
-        video_path: Union[str, Path],
+        video_path: Optional[Union[str, Path]] = None,
         prompt: str = "Describe this video in detail.",
         max_new_tokens: int = 256,
         fps: float = 1.0,
         temperature: float = 0.7,
-        top_p: float = 0.9
+        top_p: float = 0.9,
+        frames: Optional[FrameInput] = None,
+        timestamps: Optional[np.ndarray] = None,
+        video_fps: Optional[float] = None,
+        on_progress: Optional[ProgressCallback] = None
     ) -> str:
         """
         Generate video description using Qwen3-VL
 
+        Pass either a video path (decoded by the processor's own backend) or
+        frames already decoded by VideoProcessor with their timestamps and
+        source frame rate (passed straight to the processor, no re-decode).
+        With on_progress, tokens are streamed to the callback while generating;
+        the returned text is the same either way.
+
         Args:
             video_path: Path to video file
             prompt: Text prompt for description
             max_new_tokens: Maximum tokens to generate
-            fps: Frames per second for video sampling
+            fps: Frames per second for video sampling (video_path only)
             temperature: Sampling temperature (0.0-1.0)
             top_p: Top-p sampling parameter
+            frames: RGB uint8 frames shaped (N, H, W, 3), NumPy array or tensor
+            timestamps: Source timestamp of each frame in seconds, shaped (N,)
+            video_fps: Source video frame rate
+            on_progress: Optional callback(text so far, tokens, tokens/sec, done)
 
         Returns:
             Generated description text
         """
+        if frames is not None:
+            return self.generate_description_from_frames(
+                frames=frames,
+                timestamps=timestamps,
+                video_fps=video_fps,
+                prompt=prompt,
+                max_new_tokens=max_new_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                on_progress=on_progress
+            )
+
+        if video_path is None:
+            raise ValueError("Either video_path or frames must be provided")
+
         logger.info(f"Generating description for: {Path(video_path).name}")
         logger.info(f"Prompt: {prompt}")
         logger.info(f"Max tokens: {max_new_tokens}, FPS: {fps}")
 
         try:
-            # Prepare conversation format
-            conversation = [{
-                "role": "user",
-                "content": [
-                    {"type": "video", "video": str(video_path)},
-                    {"type": "text", "text": prompt}
-                ]
-            }]
-
-            # Apply chat template and tokenize
             logger.info("Processing video and tokenizing...")
-            inputs = self.processor.apply_chat_template(
-                conversation,
-                fps=fps,
-                add_generation_prompt=True,
-                tokenize=True,
-                return_dict=True,
-                return_tensors="pt"
-            ).to(self.device)
-
-            # Generate
-            logger.info("Generating description...")
-            with torch.no_grad():
-                output_ids = self.model.generate(
-                    **inputs,
-                    max_new_tokens=max_new_tokens,
-                    temperature=temperature,
-                    top_p=top_p,
-                    do_sample=temperature > 0
-                )
+            inputs = self._prepare_path_inputs(video_path, fps, prompt)
+
+            return self._generate(inputs, max_new_tokens, temperature, top_p, on_progress)
+
+        except Exception as e:
+            logger.error(f"Error during inference: {e}")
+            raise
 
-            # Decode output
-            generated_ids = [
-                output_ids[len(input_ids):]
-                for input_ids, output_ids in zip(inputs.input_ids, output_ids)
+    def stream_description(
+        self,
+        video_path: Optional[Union[str, Path]] = None,
+        prompt: str = "Describe this video in detail.",
+        max_new_tokens: int = 256,
+        fps: float = 1.0,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        frames: Optional[FrameInput] = None,
+        timestamps: Optional[np.ndarray] = None,
+        video_fps: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Generate a video description as a stream of text chunks
+
+        Takes the same inputs as generate_description. Generation runs on a
+        background thread; the first chunk arrives once the prompt has been
+        prefilled. Joining all chunks gives the generate_description text.
+        Closing the iterator early stops generation at the next token.
+
+        Yields:
+            Newly decoded text, roughly one word at a time
+        """
+        if frames is not None:
+            if timestamps is None or not video_fps:
+                raise ValueError("Pre-decoded frames need timestamps and video_fps")
+            inputs = self._prepare_frame_inputs(frames, timestamps, video_fps, prompt)
+        elif video_path is not None:
+            inputs = self._prepare_path_inputs(video_path, fps, prompt)
+        else:
+            raise ValueError("Either video_path or frames must be provided")
+
+        with self._bind_visual_features(inputs):
+            yield from self._stream(inputs, max_new_tokens, temperature, top_p, {})
+
+    def _prepare_path_inputs(self, video_path: Union[str, Path], fps: float, prompt: str):
+        """Processor output for a video file decoded by the processor, moved to the model device"""
+        conversation = [{
+            "role": "user",
+            "content": [
+                {"type": "video", "video": str(video_path)},
+                {"type": "text", "text": prompt}
             ]
+        }]
+
+        return self.processor.apply_chat_template(
+            conversation,
+            fps=fps,
+            add_generation_prompt=True,
+            tokenize=True,
+            return_dict=True,
+            return_tensors="pt"
+        ).to(self.device)
+
+    def _generate(
+        self,
+        inputs,
+        max_new_tokens: int,
+        temperature: float,
+        top_p: float,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> str:
+        """
+        Run generation on prepared processor inputs and decode the new tokens
+
+        Args:
+            inputs: Processor output already moved to the model device
+            max_new_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0.0 = greedy)
+            top_p: Top-p sampling parameter
+            on_progress: Optional callback(text so far, tokens, tokens/sec, done);
+                when set, tokens are streamed to it during generation
+
+        Returns:
+            Generated text
+        """
+        logger.info("Generating description...")
+        with self._bind_visual_features(inputs):
+            if on_progress is None:
+                description = self._generate_batch(inputs, [max_new_tokens], temperature, top_p)[0]
+            else:
+                stats: Dict[str, Any] = {}
+                text = ""
+                for chunk in self._stream(inputs, max_new_tokens, temperature, top_p, stats):
+                    text += chunk
+                    on_progress(text, stats["tokens"], stats["tokens_per_s"], False)
+                description = stats["description"]
+                on_progress(description, stats["tokens"], stats["tokens_per_s"], True)
+
+        logger.info(f"✓ Generated description ({len(description)} chars)")
+
+        return description
+
+    def _stream(
+        self,
+        inputs,
+        max_new_tokens: int,
+        temperature: float,
+        top_p: float,
+        stats: Dict[str, Any]
+    ) -> Iterator[str]:
+        """
+        Run generate on a background thread and yield text as tokens arrive
+
+        stats is filled in as the stream advances: tokens, prefill_s and
+        tokens_per_s (decode rate after the first token) while streaming, and
+        description once the stream is exhausted. The description is decoded
+        from the full output ids exactly as in the non-streaming path, so it
+        doesn't depend on how the streamer split the text.
+        """
+        from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+
+        class TokenCountingStreamer(TextIteratorStreamer):
+            """TextIteratorStreamer that also counts generated tokens"""
+
+            def __init__(self, tokenizer, **kwargs):
+                super().__init__(tokenizer, **kwargs)
+                self.tokens = 0
+                self.first_token_at = None
+
+            def put(self, value):
+                if not self.next_tokens_are_prompt:
+                    self.tokens += 1
+                    if self.first_token_at is None:
+                        self.first_token_at = time.perf_counter()
+                super().put(value)
+
+        class StopWhenCancelled(StoppingCriteria):
+            """Ends generation once the consumer has stopped reading"""
+
+            def __init__(self, event: threading.Event):
+                self.event = event
+
+            def __call__(self, input_ids, scores, **kwargs):
+                return torch.full((input_ids.shape[0],), self.event.is_set(), dtype=torch.bool,
+                                  device=input_ids.device)
+
+        streamer = TokenCountingStreamer(
+            self.processor.tokenizer,
+            skip_prompt=True,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=True
+        )
+        cancelled = threading.Event()
+        outcome: Dict[str, Any] = {}
+
+        def run():
+            try:
+                # no_grad is thread-local, so it has to be entered on this thread
+                with torch.no_grad():
+                    outcome["output_ids"] = self.model.generate(
+                        **inputs,
+                        max_new_tokens=max_new_tokens,
+                        temperature=temperature,
+                        top_p=top_p,
+                        do_sample=temperature > 0,
+                        streamer=streamer,
+                        stopping_criteria=StoppingCriteriaList([StopWhenCancelled(cancelled)])
+                    )
+            except BaseException as e:
+                outcome["error"] = e
+                # Unblock the consumer; generate never reached streamer.end()
+                streamer.end()
+
+        start = time.perf_counter()
+        stats.update(tokens=0, prefill_s=None, tokens_per_s=0.0)
+        thread = threading.Thread(target=run, name="qwen3vl-generate", daemon=True)
+        thread.start()
+
+        try:
+            for chunk in streamer:
+                stats["tokens"] = streamer.tokens
+                if streamer.first_token_at is not None:
+                    stats["prefill_s"] = streamer.first_token_at - start
+                    decode_s = time.perf_counter() - streamer.first_token_at
+                    if decode_s > 0:
+                        stats["tokens_per_s"] = (streamer.tokens - 1) / decode_s
+                if chunk:
+                    yield chunk
+        finally:
+            cancelled.set()
+            thread.join()
+
+        if "error" in outcome:
+            raise outcome["error"]
+
+        prompt_length = inputs["input_ids"].shape[1]
+        stats["tokens"] = streamer.tokens
+        stats["description"] = self.processor.batch_decode(
+            outcome["output_ids"][:, prompt_length:],
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=True
+        )[0]
+        if stats["prefill_s"] is not None:
+            logger.info(f"Streamed {streamer.tokens} tokens: prefill {stats['prefill_s']:.2f}s, "
+                        f"{stats['tokens_per_s']:.1f} tokens/s")
+
+    def _generate_batch(self, inputs, max_new_tokens: Sequence[int], temperature: float, top_p: float) -> List[str]:
+        """
+        Run one generate call over left-padded batched inputs
+
+        Args:
+            inputs: Processor output (or _collate result) on the model device
+            max_new_tokens: Per-row output limit; the batch runs to the largest
+                and each row is cut back to its own limit
+            temperature: Sampling temperature (0.0 = greedy)
+            top_p: Top-p sampling parameter
+
+        Returns:
+            Generated text per row
+        """
+        with torch.no_grad():
+            output_ids = self.model.generate(
+                **inputs,
+                max_new_tokens=max(max_new_tokens),
+                temperature=temperature,
+                top_p=top_p,
+                do_sample=temperature > 0
+            )
+
+        # Left padding: every prompt ends at the same position
+        prompt_length = inputs["input_ids"].shape[1]
+        generated_ids = [
+            output[prompt_length:prompt_length + limit]
+            for output, limit in zip(output_ids, max_new_tokens)
+        ]
+
+        return self.processor.batch_decode(
+            generated_ids,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=True
+        )
+
+    def _needs_resize(self, frames: torch.Tensor) -> bool:
+        """
+        Check whether pre-decoded (T, C, H, W) frames must be resized by the processor
+
+        Frames from VideoProcessor.extract_frames_array are already patch
+        aligned; the processor only needs to resize them if they are not, or
+        if the clip exceeds its total pixel budget.
+        """
+        factor = self.PATCH_FACTOR
+        num_frames, _, height, width = frames.shape
+        if height % factor or width % factor:
+            return True
+
+        max_total_pixels = self._max_total_pixels()
+        return bool(max_total_pixels) and num_frames * height * width > max_total_pixels
+
+    def _max_total_pixels(self) -> Optional[int]:
+        """The video processor's pixel budget for a whole clip (None if it has none)"""
+        size = getattr(getattr(self.processor, "video_processor", None), "size", None) or {}
+        return size.get("longest_edge")
+
+    @staticmethod
+    def _to_video_tensor(frames: FrameInput) -> torch.Tensor:
+        """
+        View (N, H, W, 3) frames as the (N, 3, H, W) tensor the processor expects
+
+        NumPy arrays (including read-only memory-mapped cache hits) are wrapped
+        without copying. uint8 input is rescaled by the processor; float input
+        is expected in [0, 1] (e.g. a ComfyUI IMAGE batch) and passed as is.
+        """
+        if isinstance(frames, np.ndarray):
+            with warnings.catch_warnings():
+                # Memory-mapped cache hits are read-only; the processor never writes to them
+                warnings.filterwarnings("ignore", message=".*non-writable.*")
+                frames = torch.from_numpy(np.ascontiguousarray(frames))
+
+        return frames.permute(0, 3, 1, 2)
+
+    def _prepare_frame_inputs(
+        self,
+        frames: FrameInput,
+        timestamps: np.ndarray,
+        video_fps: float,
+        prompt: str
+    ):
+        """
+        Build model inputs for pre-decoded frames
+
+        Args:
+            frames: RGB uint8 frames shaped (N, H, W, 3)
+            timestamps: Source timestamp of each frame in seconds, shaped (N,)
+            video_fps: Source video frame rate
+            prompt: Text prompt
+
+        Returns:
+            Processor output moved to the model device
+        """
+        return self._encode_frames(frames, timestamps, video_fps, prompt).to(self.device)
+
+    def _encode_frames(
+        self,
+        frames: FrameInput,
+        timestamps: np.ndarray,
+        video_fps: float,
+        prompt: str
+    ):
+        """Processor output for pre-decoded frames, left on CPU"""
+        conversation = [{
+            "role": "user",
+            "content": [
+                {"type": "video"},
+                {"type": "text", "text": prompt}
+            ]
+        }]
+        text = self.processor.apply_chat_template(
+            conversation,
+            add_generation_prompt=True,
+            tokenize=False
+        )
+
+        video = self._to_video_tensor(frames)
+        frame_indices = np.rint(np.asarray(timestamps) * video_fps).astype(np.int64).tolist()
+        metadata = {
+            "fps": video_fps,
+            "frames_indices": frame_indices,
+            "total_num_frames": len(frame_indices),
+            "video_backend": "opencv",
+        }
+
+        return self.processor(
+            text=[text],
+            videos=[video],
+            video_metadata=[metadata],
+            do_sample_frames=False,
+            do_resize=self._needs_resize(video),
+            do_rescale=not video.is_floating_point(),
+            return_tensors="pt"
+        )
+
+    def generate_description_from_frames(
+        self,
+        frames: FrameInput,
+        timestamps: np.ndarray,
+        video_fps: float,
+        prompt: str = "Describe this video in detail.",
+        max_new_tokens: int = 256,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> str:
+        """
+        Generate video description from frames decoded by VideoProcessor
+
+        The frames are passed straight to the processor with their source
+        frame indices, so the processor neither re-decodes nor re-samples the
+        video and timestamps in the prompt match the selected frames.
+
+        Args:
+            frames: RGB frames shaped (N, H, W, 3), NumPy array or tensor; uint8,
+                or float in [0, 1]
+            timestamps: Source timestamp of each frame in seconds, shaped (N,)
+            video_fps: Source video frame rate
+            prompt: Text prompt for description
+            max_new_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0.0-1.0)
+            top_p: Top-p sampling parameter
+            on_progress: Optional callback(text so far, tokens, tokens/sec, done)
 
-            description = self.processor.batch_decode(
-                generated_ids,
-                skip_special_tokens=True,
-                clean_up_tokenization_spaces=True
-            )[0]
+        Returns:
+            Generated description text
+        """
+        if timestamps is None or not video_fps:
+            raise ValueError("Pre-decoded frames need timestamps and video_fps")
+
+        logger.info(f"Generating description for {len(frames)} pre-decoded frames")
+        logger.info(f"Prompt: {prompt}")
+        logger.info(f"Max tokens: {max_new_tokens}")
 
-            logger.info(f"✓ Generated description ({len(description)} chars)")
+        try:
+            logger.info("Processing frames and tokenizing...")
+            inputs = self._prepare_frame_inputs(frames, timestamps, video_fps, prompt)
 
-            return description
+            return self._generate(inputs, max_new_tokens, temperature, top_p, on_progress)
 
         except Exception as e:
             logger.error(f"Error during inference: {e}")
             raise
 
+    def generate_text(
+        self,
+        prompt: str,
+        max_new_tokens: int = 256,
+        temperature: float = 0.7,
+        top_p: float = 0.9
+    ) -> str:
+        """
+        Generate from a text-only prompt (no visual input)
+
+        Args:
+            prompt: Text prompt
+            max_new_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0.0-1.0)
+            top_p: Top-p sampling parameter
+
+        Returns:
+            Generated text
+        """
+        conversation = [{
+            "role": "user",
+            "content": [{"type": "text", "text": prompt}]
+        }]
+        inputs = self.processor.apply_chat_template(
+            conversation,
+            add_generation_prompt=True,
+            tokenize=True,
+            return_dict=True,
+            return_tensors="pt"
+        ).to(self.device)
+
+        return self._generate(inputs, max_new_tokens, temperature, top_p)
+
+    def generate_batch(
+        self,
+        items: Sequence[BatchItem],
+        token_budget: Optional[int] = None,
+        max_batch_size: Optional[int] = None
+    ) -> List[str]:
+        """
+        Generate descriptions for many videos with one generate call per batch
+
+        Each item is a dict holding either pre-decoded "frames" with their
+        "timestamps" and "video_fps", a "load_frames" callable returning
+        (timestamps, frames) with "video_fps" and "video_shape", or a
+        "video_path" (with optional "fps" and "video_shape"), plus optional
+        "prompt", "max_new_tokens", "temperature" and "top_p" (same defaults
+        as generate_description).
+
+        Items are sorted by prompt length, so rows in a batch need little
+        padding, and packed greedily while batch size x (longest prompt +
+        longest output) stays within the token budget. Only items with the
+        same temperature and top_p share a batch. Lengths are estimated from
+        frame shapes (or "video_shape") and items are only decoded and encoded
+        when their batch runs, so with load_frames at most one batch of frames
+        and pixel tensors exists at a time. A batch that runs out of GPU memory
+        is split in half and retried. A load_frames item that fails to decode
+        (OSError, ValueError or no frames) gets "Error: <message>" as its
+        description instead of failing its batch.
+
+        Args:
+            items: Batch requests
+            token_budget: Padded tokens per batch (default BATCH_TOKEN_BUDGET)
+            max_batch_size: Items per batch (default MAX_BATCH_SIZE)
+
+        Returns:
+            Descriptions in input order
+        """
+        token_budget = token_budget or self.BATCH_TOKEN_BUDGET
+        max_batch_size = max_batch_size or self.MAX_BATCH_SIZE
+        items = [
+            {
+                "prompt": "Describe this video in detail.",
+                "max_new_tokens": 256,
+                "fps": 1.0,
+                "temperature": 0.7,
+                "top_p": 0.9,
+                **item,
+            }
+            for item in items
+        ]
+
+        lengths = [self._estimate_input_tokens(item) for item in items]
+        batches = self._pack_batches(items, lengths, token_budget, max_batch_size)
+        logger.info(f"Generating {len(items)} descriptions in {len(batches)} batches "
+                    f"(budget {token_budget} tokens, up to {max_batch_size} per batch)")
+
+        results: List[Optional[str]] = [None] * len(items)
+        for number, batch in enumerate(batches, 1):
+            logger.info(f"Batch {number}/{len(batches)}: {len(batch)} items")
+            for index, description in self._run_batch(items, batch):
+                results[index] = description
+
+        logger.info(f"✓ Generated {len(items)} descriptions")
+        return results
+
+    def _encode_item(self, item: BatchItem):
+        """Processor output for one generate_batch item, left on CPU"""
+        if item.get("frames") is not None:
+            if item.get("timestamps") is None or not item.get("video_fps"):
+                raise ValueError("Pre-decoded frames need timestamps and video_fps")
+            return self._encode_frames(item["frames"], item["timestamps"], item["video_fps"], item["prompt"])
+
+        content = [{"type": "text", "text": item["prompt"]}]
+        template_kwargs = {}
+        if item.get("video_path") is not None:
+            content.insert(0, {"type": "video", "video": str(item["video_path"])})
+            template_kwargs["fps"] = item["fps"]
+
+        return self.processor.apply_chat_template(
+            [{"role": "user", "content": content}],
+            add_generation_prompt=True,
+            tokenize=True,
+            return_dict=True,
+            return_tensors="pt",
+            **template_kwargs
+        )
+
+    def _estimate_input_tokens(self, item: BatchItem) -> int:
+        """
+        Approximate prompt length of a generate_batch item without running the processor
+
+        Each pair of frames becomes one temporal patch of (H/32) x (W/32)
+        tokens plus a short timestamp, scaled down when the clip exceeds the
+        processor's total pixel budget. Video paths are sized from the
+        caller's "video_shape"; without one they are assumed to fill the whole
+        pixel budget, so packing errs towards smaller batches.
+        """
+        # Chat template, role markers and vision start/end tokens
+        tokens = len(self.processor.tokenizer(item["prompt"])["input_ids"]) + 24
+        factor = self.PATCH_FACTOR
+        max_total_pixels = self._max_total_pixels()
+
+        shape = None
+        if item.get("frames") is not None:
+            shape = item["frames"].shape[:3]
+        elif item.get("video_shape") is not None:
+            shape = item["video_shape"]
+        elif (item.get("video_path") is not None or item.get("load_frames") is not None) and max_total_pixels:
+            tokens += max_total_pixels // factor ** 2
+
+        if shape is not None:
+            num_frames, height, width = shape
+            pixels = max(factor, round(height / factor) * factor) * max(factor, round(width / factor) * factor)
+
+            scale = 1.0
+            if max_total_pixels and num_frames * pixels > max_total_pixels:
+                scale = max_total_pixels / (num_frames * pixels)
+
+            temporal_patches = (num_frames + 1) // 2
+            tokens += int(temporal_patches * (pixels * scale / factor ** 2 + 8))
+
+        return tokens
+
+    @staticmethod
+    def _pack_batches(
+        items: Sequence[BatchItem],
+        lengths: Sequence[int],
+        token_budget: int,
+        max_batch_size: int
+    ) -> List[List[int]]:
+        """
+        Group item indices into batches under the padded token budget
+
+        An item that exceeds the budget on its own still runs, alone.
+        """
+        groups: Dict[Tuple[float, float], List[int]] = {}
+        for index in sorted(range(len(items)), key=lambda i: lengths[i]):
+            groups.setdefault((items[index]["temperature"], items[index]["top_p"]), []).append(index)
+
+        batches = []
+        for indices in groups.values():
+            batch: List[int] = []
+            longest_input = longest_output = 0
+            for index in indices:
+                input_tokens = max(longest_input, lengths[index])
+                output_tokens = max(longest_output, items[index]["max_new_tokens"])
+                if batch and (len(batch) >= max_batch_size
+                              or (len(batch) + 1) * (input_tokens + output_tokens) > token_budget):
+                    batches.append(batch)
+                    batch = []
+                    input_tokens, output_tokens = lengths[index], items[index]["max_new_tokens"]
+                batch.append(index)
+                longest_input, longest_output = input_tokens, output_tokens
+            if batch:
+                batches.append(batch)
+
+        return batches
+
+    @staticmethod
+    def _load_item(item: BatchItem) -> BatchItem:
+        """Decode a load_frames item into a frames item (other items pass through)"""
+        load_frames = item.get("load_frames")
+        if load_frames is None:
+            return item
+
+        timestamps, frames = load_frames()
+        if len(frames) == 0:
+            raise ValueError("No frames could be decoded")
+        return {**item, "timestamps": timestamps, "frames": frames}
+
+    def _run_batch(
+        self,
+        items: Sequence[BatchItem],
+        batch: List[int]
+    ) -> List[Tuple[int, str]]:
+        """Decode, encode, collate and generate one batch, halving it on out-of-memory"""
+        first = items[batch[0]]
+        results: List[Tuple[int, str]] = []
+        encoded, kept, inputs = [], [], None
+        try:
+            for index in batch:
+                try:
+                    item = self._load_item(items[index])
+                except (OSError, ValueError) as e:
+                    logger.error(f"Batch item {index} could not be decoded: {e}")
+                    results.append((index, f"Error: {e}"))
+                    continue
+                encoded.append(self._encode_item(item))
+                kept.append(index)
+
+            if not kept:
+                return results
+
+            inputs = self._collate(encoded).to(self.device)
+            encoded = None
+            descriptions = self._generate_batch(
+                inputs,
+                [items[index]["max_new_tokens"] for index in kept],
+                first["temperature"],
+                first["top_p"]
+            )
+        except torch.cuda.OutOfMemoryError:
+            if len(batch) == 1:
+                raise
+            encoded = inputs = None
+            torch.cuda.empty_cache()
+            half = len(batch) // 2
+            logger.warning(f"Out of memory on a batch of {len(batch)}, retrying as {half} + {len(batch) - half}")
+            return self._run_batch(items, batch[:half]) + self._run_batch(items, batch[half:])
+
+        return results + list(zip(kept, descriptions))
+
+    def _collate(self, encoded: List[Any]):
+        """
+        Merge per-item processor outputs into one left-padded batch
+
+        Per-token tensors (input_ids, attention_mask, ...) are left padded to
+        the longest row; visual tensors (pixel_values_videos, video_grid_thw)
+        are concatenated in row order, which is how the model pairs them with
+        the video tokens of each row.
+        """
+        from transformers import BatchFeature
+
+        if len(encoded) == 1:
+            return encoded[0]
+
+        pad_token_id = self.processor.tokenizer.pad_token_id
+        if pad_token_id is None:
+            pad_token_id = self.processor.tokenizer.eos_token_id
+        longest = max(item["input_ids"].shape[1] for item in encoded)
+
+        batch = {}
+        for key in dict.fromkeys(key for item in encoded for key in item.keys()):
+            holders = [item for item in encoded if key in item]
+            per_token = len(holders) == len(encoded) and all(
+                item[key].dim() == 2 and item[key].shape == item["input_ids"].shape for item in encoded
+            )
+            if per_token:
+                fill = pad_token_id if key == "input_ids" else 0
+                batch[key] = torch.cat([
+                    torch.nn.functional.pad(item[key], (longest - item[key].shape[1], 0), value=fill)
+                    for item in encoded
+                ])
+            else:
+                batch[key] = torch.cat([item[key] for item in holders])
+
+        return BatchFeature(data=batch)
+
+    def iter_window_descriptions(
+        self,
+        windows: Iterable[WindowInput],
+        video_fps: float,
+        prompt: str = "Describe this video in detail.",
+        max_new_tokens: int = WINDOW_MAX_NEW_TOKENS,
+        temperature: float = 0.7,
+        top_p: float = 0.9
+    ) -> Iterator[Dict[str, object]]:
+        """
+        Describe time windows one by one (map step)
+
+        Windows are consumed lazily, e.g. from VideoProcessor.iter_windows, so
+        only one window's frames are alive at a time and each result is
+        yielded as soon as it is generated.
+
+        Args:
+            windows: Iterable of (start, end, timestamps, frames)
+            video_fps: Source video frame rate
+            prompt: Text prompt applied to every window
+            max_new_tokens: Maximum tokens per window description
+            temperature: Sampling temperature (0.0-1.0)
+            top_p: Top-p sampling parameter
+
+        Yields:
+            Dicts with start, end and description
+        """
+        for start, end, timestamps, frames in windows:
+            window_prompt = (
+                f"This clip is the segment from {format_timestamp(start)} to "
+                f"{format_timestamp(end)} of a longer video. {prompt}"
+            )
+            # A whole-video feature key would not match any single window
+            with self.visual_features_key(None):
+                description = self.generate_description_from_frames(
+                    frames=frames,
+                    timestamps=timestamps,
+                    video_fps=video_fps,
+                    prompt=window_prompt,
+                    max_new_tokens=max_new_tokens,
+                    temperature=temperature,
+                    top_p=top_p
+                )
+            del frames
+
+            yield {"start": start, "end": end, "description": description}
+
+    def merge_window_descriptions(
+        self,
+        window_results: List[Dict[str, object]],
+        prompt: str = "Describe this video in detail.",
+        max_new_tokens: int = 256,
+        temperature: float = 0.7,
+        top_p: float = 0.9
+    ) -> str:
+        """
+        Merge per-window descriptions into one description (reduce step)
+
+        Runs a text-only pass, so its cost does not depend on video length
+        beyond the size of the window descriptions.
+
+        Args:
+            window_results: Results from iter_window_descriptions, in order
+            prompt: The original request the merged description must answer
+            max_new_tokens: Maximum tokens for the merged description
+            temperature: Sampling temperature (0.0-1.0)
+            top_p: Top-p sampling parameter
+
+        Returns:
+            Merged description text
+        """
+        if len(window_results) == 1:
+            return str(window_results[0]["description"])
+
+        merge_prompt = (
+            "Below are descriptions of consecutive, partly overlapping segments of one video, "
+            "in chronological order.\n\n"
+            f"{self.format_timeline(window_results)}\n\n"
+            "Using only this information, answer the following request about the whole video. "
+            "Do not describe the segments separately and do not repeat overlapping events.\n\n"
+            f"{prompt}"
+        )
+
+        logger.info(f"Merging {len(window_results)} window descriptions...")
+        return self.generate_text(merge_prompt, max_new_tokens, temperature, top_p)
+
+    def generate_windowed(
+        self,
+        windows: Iterable[WindowInput],
+        video_fps: float,
+        prompt: str = "Describe this video in detail.",
+        max_new_tokens: int = 256,
+        window_max_new_tokens: int = WINDOW_MAX_NEW_TOKENS,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        on_window: Optional[Callable[[Dict[str, object]], None]] = None
+    ) -> Tuple[str, List[Dict[str, object]]]:
+        """
+        Describe a long video by map-reduce over time windows
+
+        Args:
+            windows: Iterable of (start, end, timestamps, frames)
+            video_fps: Source video frame rate
+            prompt: Text prompt for the description
+            max_new_tokens: Maximum tokens for the merged description
+            window_max_new_tokens: Maximum tokens per window description
+            temperature: Sampling temperature (0.0-1.0)
+            top_p: Top-p sampling parameter
+            on_window: Called with each window result as soon as it is ready
+
+        Returns:
+            Tuple of (merged description, per-window results)
+        """
+        window_results = []
+        for result in self.iter_window_descriptions(
+            windows, video_fps, prompt, window_max_new_tokens, temperature, top_p
+        ):
+            logger.info(
+                f"Window {format_timestamp(result['start'])}-{format_timestamp(result['end'])} done"
+            )
+            window_results.append(result)
+            if on_window is not None:
+                on_window(result)
+
+        if not window_results:
+            raise ValueError("No frames could be decoded from any window")
+
+        description = self.merge_window_descriptions(
+            window_results, prompt, max_new_tokens, temperature, top_p
+        )
+        return description, window_results
+
+    @staticmethod
+    def format_timeline(window_results: List[Dict[str, object]]) -> str:
+        """Format window results as '[start-end] description' lines"""
+        return "\n".join(
+            f"[{format_timestamp(r['start'])}-{format_timestamp(r['end'])}] {str(r['description']).strip()}"
+            for r in window_results
+        )
+
     def generate_with_timestamps(
         self,
-        video_path: Union[str, Path],
+        video_path: Optional[Union[str, Path]] = None,
         prompt: str = "Describe what happens in this video, including when events occur.",
         max_new_tokens: int = 512,
-        fps: float = 1.0
+        fps: float = 1.0,
+        frames: Optional[FrameInput] = None,
+        timestamps: Optional[np.ndarray] = None,
+        video_fps: Optional[float] = None
     ) -> str:
         """
         Generate video description with temporal information
@@ -121,7 +985,10 @@ class Qwen3VLInference:
             video_path: Path to video file
             prompt: Temporal-focused prompt
             max_new_tokens: Maximum tokens to generate
-            fps: Frames per second for video sampling
+            fps: Frames per second for video sampling (video_path only)
+            frames: Pre-decoded RGB uint8 frames shaped (N, H, W, 3)
+            timestamps: Source timestamp of each frame in seconds
+            video_fps: Source video frame rate
 
         Returns:
             Generated description with timestamps
@@ -133,5 +1000,8 @@ class Qwen3VLInference:
             video_path=video_path,
             prompt=temporal_prompt,
             max_new_tokens=max_new_tokens,
-            fps=fps
+            fps=fps,
+            frames=frames,
+            timestamps=timestamps,
+            video_fps=video_fps
         )
@@ -0,0 +1,369 @@
+"""
+Vision Feature Cache for Qwen3-VL
+Keeps vision-encoder output per (video, sampling, model variant) in memory and
+on disk, so further prompts on the same clip only pay for text prefill and decode
+"""
+
+import importlib
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+class VisionFeatureCache:
+    """
+    Two-level LRU cache of Qwen3-VL video features
+
+    install() wraps the model's get_video_features. While a processor output
+    is bound to a key (bind()), the wrapper serves that video's features from
+    RAM, then disk, and only runs the vision tower on a miss. Entries also
+    record video_grid_thw, so a key that turns out to describe a different
+    grid is recomputed instead of injected.
+
+    In-memory entries are CPU tensors (copied back to the model device on a
+    hit, which costs far less than re-encoding); disk entries are torch.save
+    files loaded with weights_only=True. The disk level is off unless
+    VIDEO_DESCRIPTION_FEATURE_CACHE_GB is set, since entries run to hundreds
+    of MB and the frame cache already takes disk space by default.
+    """
+
+    DEFAULT_RAM_MB = 2048.0
+    DEFAULT_DISK_GB = 0.0
+
+    _default: Optional["VisionFeatureCache"] = None
+    _default_lock = threading.Lock()
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_ram_bytes: Optional[int] = None,
+        max_disk_bytes: Optional[int] = None
+    ):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Cache directory (None = default_cache_dir())
+            max_ram_bytes: In-memory budget (None = VIDEO_DESCRIPTION_FEATURE_CACHE_RAM_MB
+                environment variable, or DEFAULT_RAM_MB)
+            max_disk_bytes: On-disk budget (None = VIDEO_DESCRIPTION_FEATURE_CACHE_GB
+                environment variable, or DEFAULT_DISK_GB; 0 disables the disk level)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_cache_dir()
+
+        if max_ram_bytes is None:
+            ram_mb = float(os.environ.get("VIDEO_DESCRIPTION_FEATURE_CACHE_RAM_MB", self.DEFAULT_RAM_MB))
+            max_ram_bytes = int(ram_mb * 1024 ** 2)
+        if max_disk_bytes is None:
+            disk_gb = float(os.environ.get("VIDEO_DESCRIPTION_FEATURE_CACHE_GB", self.DEFAULT_DISK_GB))
+            max_disk_bytes = int(disk_gb * 1024 ** 3)
+        self.max_ram_bytes = max_ram_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._lock = threading.RLock()
+        # key -> {"grid": tensor, "features": packed features, "size_bytes": int}
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # key -> file size, oldest access first
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        # data_ptr of a bound pixel_values_videos tensor -> key
+        self._bound: Dict[int, str] = {}
+
+        if self.max_disk_bytes > 0:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._load_index()
+
+    @classmethod
+    def default(cls) -> "VisionFeatureCache":
+        """Get the process-wide cache instance"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @staticmethod
+    def default_cache_dir() -> Path:
+        """
+        Get the default cache directory
+
+        Uses VIDEO_DESCRIPTION_FEATURE_CACHE_DIR if set, otherwise
+        ComfyUI/models/video_description/feature_cache/, falling back to the
+        system temp directory outside ComfyUI.
+        """
+        override = os.environ.get("VIDEO_DESCRIPTION_FEATURE_CACHE_DIR")
+        if override:
+            return Path(override)
+
+        try:
+            import folder_paths
+            return Path(folder_paths.models_dir) / "video_description" / "feature_cache"
+        except ImportError:
+            return Path(tempfile.gettempdir()) / "comfyui_video_description" / "feature_cache"
+
+    def _load_index(self):
+        """Rebuild the disk LRU index, oldest access first"""
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if path.name.startswith("."):
+                # Leftover from an interrupted write
+                path.unlink(missing_ok=True)
+                continue
+            if path.suffix == ".pt":
+                stat = path.stat()
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+
+    @classmethod
+    def _pack(cls, value: Any) -> Any:
+        """Copy features to CPU as plain containers that torch.load(weights_only=True) accepts"""
+        if torch.is_tensor(value):
+            return value.detach().to("cpu")
+        if isinstance(value, (list, tuple)):
+            return type(value)(cls._pack(item) for item in value)
+        if isinstance(value, dict):
+            # ModelOutput subclasses are rebuilt by class name on the way out
+            return {
+                "__class__": f"{type(value).__module__}:{type(value).__qualname__}",
+                "items": {name: cls._pack(item) for name, item in value.items()},
+            }
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        raise TypeError(f"Unsupported vision feature type: {type(value).__name__}")
+
+    @classmethod
+    def _unpack(cls, value: Any, device: torch.device) -> Any:
+        """Inverse of _pack, moving tensors to device"""
+        if torch.is_tensor(value):
+            return value.to(device, non_blocking=True)
+        if isinstance(value, (list, tuple)):
+            return type(value)(cls._unpack(item, device) for item in value)
+        if isinstance(value, dict):
+            module_name, _, qualname = value["__class__"].partition(":")
+            items = {name: cls._unpack(item, device) for name, item in value["items"].items()}
+            if module_name == "builtins":
+                return items
+            if not module_name.startswith("transformers."):
+                raise TypeError(f"Refusing to rebuild cached features as {value['__class__']}")
+            return getattr(importlib.import_module(module_name), qualname)(**items)
+        return value
+
+    @classmethod
+    def _size_bytes(cls, value: Any) -> int:
+        if torch.is_tensor(value):
+            return value.numel() * value.element_size()
+        if isinstance(value, (list, tuple)):
+            return sum(cls._size_bytes(item) for item in value)
+        if isinstance(value, dict):
+            return sum(cls._size_bytes(item) for item in value.values())
+        return 0
+
+    def install(self, model: Any) -> Any:
+        """
+        Route a Qwen3-VL model's video encoding through this cache
+
+        Idempotent; unbound calls (e.g. batched or windowed inputs) go straight
+        to the original method.
+
+        Args:
+            model: Qwen3VLForConditionalGeneration (or its inner Qwen3VLModel)
+
+        Returns:
+            The model
+        """
+        # The conditional-generation wrapper delegates to .model, whose forward does the encoding
+        target = getattr(model, "model", model)
+        if not hasattr(target, "get_video_features"):
+            logger.warning("Model has no get_video_features; vision feature cache disabled")
+            return model
+        if getattr(target, "_vision_feature_cache", None) is self:
+            return model
+
+        original = target.get_video_features
+        target.get_video_features = self._wrap(original)
+        target._vision_feature_cache = self
+        return model
+
+    def _wrap(self, original: Callable) -> Callable:
+        def get_video_features(pixel_values_videos, video_grid_thw=None, *args, **kwargs):
+            key = self._bound.get(pixel_values_videos.data_ptr()) if torch.is_tensor(pixel_values_videos) else None
+            if key is None or video_grid_thw is None:
+                return original(pixel_values_videos, video_grid_thw, *args, **kwargs)
+
+            features = self.get(key, video_grid_thw, pixel_values_videos.device)
+            if features is not None:
+                return features
+
+            features = original(pixel_values_videos, video_grid_thw, *args, **kwargs)
+            try:
+                self.put(key, video_grid_thw, features)
+            except TypeError as e:
+                logger.warning(f"Vision features not cached: {e}")
+            return features
+
+        return get_video_features
+
+    @contextmanager
+    def bind(self, pixel_values_videos: Optional[torch.Tensor], key: Optional[str]) -> Iterator[None]:
+        """
+        Associate a processor output's video pixels with a cache key while generating
+
+        Args:
+            pixel_values_videos: The tensor that will be passed to the model
+            key: Cache key (None = no caching for this block)
+        """
+        if pixel_values_videos is None or key is None:
+            yield
+            return
+
+        pointer = pixel_values_videos.data_ptr()
+        with self._lock:
+            self._bound[pointer] = key
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._bound.pop(pointer, None)
+
+    def get(self, key: str, video_grid_thw: torch.Tensor, device: torch.device) -> Optional[Any]:
+        """
+        Look up features, checking memory first, then disk
+
+        Args:
+            key: Cache key
+            video_grid_thw: Grid of the video about to be encoded
+            device: Device to place the features on
+
+        Returns:
+            Features as returned by get_video_features, or None on a miss
+        """
+        grid = video_grid_thw.detach().to("cpu")
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            elif key in self._disk:
+                entry = self._read_disk(key)
+                if entry is not None:
+                    self.disk_hits += 1
+                    self._remember(key, entry)
+
+            if entry is None or not torch.equal(entry["grid"], grid):
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        logger.info(f"Vision feature cache hit: {key} ({entry['size_bytes'] / 1024 ** 2:.1f} MB)")
+        return self._unpack(entry["features"], device)
+
+    def put(self, key: str, video_grid_thw: torch.Tensor, features: Any):
+        """
+        Store features in memory and on disk, evicting least-recently-used entries
+
+        Args:
+            key: Cache key
+            video_grid_thw: Grid the features were computed for
+            features: get_video_features output
+        """
+        packed = self._pack(features)
+        entry = {
+            "grid": video_grid_thw.detach().to("cpu"),
+            "features": packed,
+            "size_bytes": self._size_bytes(packed),
+        }
+
+        with self._lock:
+            self._remember(key, entry)
+            if self.max_disk_bytes > 0:
+                self._write_disk(key, entry)
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        """Add an entry to the memory level (caller holds the lock)"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+
+        total = sum(item["size_bytes"] for item in self._memory.values())
+        while total > self.max_ram_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            total -= evicted["size_bytes"]
+
+        if total > self.max_ram_bytes:
+            # A single entry over the budget is still served from disk
+            self._memory.pop(key)
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a disk entry (caller holds the lock)"""
+        path = self.cache_dir / f"{key}.pt"
+        try:
+            entry = torch.load(path, map_location="cpu", weights_only=True)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable vision feature cache entry {key}: {e}")
+            self._disk.pop(key, None)
+            path.unlink(missing_ok=True)
+            return None
+
+        # File mtime records last access for LRU across restarts
+        os.utime(path)
+        self._disk.move_to_end(key)
+        return entry
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]):
+        """Persist an entry and evict old files over budget (caller holds the lock)"""
+        path = self.cache_dir / f"{key}.pt"
+        tmp_path = self.cache_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            torch.save(entry, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning(f"Vision feature cache write failed: {e}")
+            return
+
+        self._disk[key] = path.stat().st_size
+        self._disk.move_to_end(key)
+
+        total = sum(self._disk.values())
+        while total > self.max_disk_bytes and len(self._disk) > 1:
+            evicted, size = self._disk.popitem(last=False)
+            (self.cache_dir / f"{evicted}.pt").unlink(missing_ok=True)
+            total -= size
+            logger.info(f"Vision feature cache evicted: {evicted} ({size / 1024 ** 2:.1f} MB)")
+
+    def stats(self) -> dict:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "ram_entries": len(self._memory),
+                "ram_bytes": sum(item["size_bytes"] for item in self._memory.values()),
+                "max_ram_bytes": self.max_ram_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": sum(self._disk.values()),
+                "max_disk_bytes": self.max_disk_bytes,
+                "cache_dir": str(self.cache_dir),
+            }
+
+    def clear(self):
+        """Remove every entry from memory and disk"""
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._disk):
+                (self.cache_dir / f"{key}.pt").unlink(missing_ok=True)
+            self._disk.clear()
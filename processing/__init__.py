@@ -3,5 +3,7 @@ Video processing package
 """
 
 from .video_processor import VideoProcessor
+from .frame_cache import FrameCache
+from .result_cache import ResultCache
 
-__all__ = ['VideoProcessor']
+__all__ = ['VideoProcessor', 'FrameCache', 'ResultCache']
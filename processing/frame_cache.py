@@ -0,0 +1,234 @@
+"""
+Decoded frame cache
+Persists sampled frame arrays on disk as memory-mapped .npy files so repeat
+runs on the same video skip decoding entirely
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FrameCache:
+    """
+    On-disk LRU cache of decoded frames
+
+    Each entry is a directory holding frames.npy and timestamps.npy. Hits load
+    frames with mmap_mode="r", so they are read-only views backed by the page
+    cache rather than fresh copies. Entries are evicted least-recently-used
+    first once the total size exceeds the byte budget.
+    """
+
+    DEFAULT_MAX_GB = 10.0
+
+    _default: Optional["FrameCache"] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Cache directory (None = default_cache_dir())
+            max_bytes: Size budget in bytes (None = VIDEO_DESCRIPTION_FRAME_CACHE_GB
+                environment variable, or DEFAULT_MAX_GB)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_cache_dir()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        if max_bytes is None:
+            max_gb = float(os.environ.get("VIDEO_DESCRIPTION_FRAME_CACHE_GB", self.DEFAULT_MAX_GB))
+            max_bytes = int(max_gb * 1024 ** 3)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._load_index()
+
+    @classmethod
+    def default(cls) -> "FrameCache":
+        """Get the process-wide cache instance"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @staticmethod
+    def default_cache_dir() -> Path:
+        """
+        Get the default cache directory
+
+        Uses VIDEO_DESCRIPTION_FRAME_CACHE_DIR if set, otherwise
+        ComfyUI/models/video_description/frame_cache/, falling back to the
+        system temp directory outside ComfyUI.
+        """
+        override = os.environ.get("VIDEO_DESCRIPTION_FRAME_CACHE_DIR")
+        if override:
+            return Path(override)
+
+        try:
+            import folder_paths
+            return Path(folder_paths.models_dir) / "video_description" / "frame_cache"
+        except ImportError:
+            return Path(tempfile.gettempdir()) / "comfyui_video_description" / "frame_cache"
+
+    @staticmethod
+    def make_key(video_path: Union[str, Path], **params) -> str:
+        """
+        Build a cache key from the video's identity and sampling parameters
+
+        Args:
+            video_path: Path to video file (resolved; size and mtime are included)
+            **params: Sampling parameters that change the decoded output
+
+        Returns:
+            Hex digest identifying the entry
+        """
+        path = Path(video_path).resolve()
+        stat = path.stat()
+        payload = json.dumps({
+            "path": str(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            **params
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def _load_index(self):
+        """Rebuild the LRU index from disk, oldest access first"""
+        entries = []
+        for entry_dir in self.cache_dir.iterdir():
+            if entry_dir.name.startswith("."):
+                # Leftover from an interrupted put()
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                continue
+            if not entry_dir.is_dir() or not (entry_dir / "frames.npy").exists():
+                continue
+            size = sum(f.stat().st_size for f in entry_dir.iterdir() if f.is_file())
+            entries.append((entry_dir.stat().st_mtime, entry_dir.name, size))
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Look up an entry
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Tuple of (timestamps, frames) with frames memory-mapped read-only,
+            or None on a miss
+        """
+        entry_dir = self.cache_dir / key
+
+        with self._lock:
+            if key not in self._entries or not (entry_dir / "frames.npy").exists():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            try:
+                frames = np.load(entry_dir / "frames.npy", mmap_mode="r")
+                timestamps = np.load(entry_dir / "timestamps.npy")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Discarding unreadable frame cache entry {key}: {e}")
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            # Directory mtime records last access for LRU across restarts
+            os.utime(entry_dir)
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        logger.info(f"Frame cache hit: {key} ({len(frames)} frames)")
+        return timestamps, frames
+
+    def put(self, key: str, timestamps: np.ndarray, frames: np.ndarray):
+        """
+        Store an entry, evicting least-recently-used entries over budget
+
+        Entries larger than the whole budget are not stored.
+
+        Args:
+            key: Cache key from make_key()
+            timestamps: Frame timestamps shaped (N,)
+            frames: Frames shaped (N, H, W, 3)
+        """
+        if frames.nbytes > self.max_bytes:
+            logger.info(f"Frame cache skipped: {key} ({frames.nbytes / 1024 ** 2:.1f} MB exceeds the budget)")
+            return
+
+        entry_dir = self.cache_dir / key
+        tmp_dir = self.cache_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+        tmp_dir.mkdir(parents=True)
+
+        try:
+            np.save(tmp_dir / "frames.npy", np.ascontiguousarray(frames))
+            np.save(tmp_dir / "timestamps.npy", np.asarray(timestamps, dtype=np.float64))
+            size = sum(f.stat().st_size for f in tmp_dir.iterdir())
+
+            with self._lock:
+                if entry_dir.exists():
+                    # Another writer finished first; keep its entry
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+                else:
+                    os.replace(tmp_dir, entry_dir)
+                    self._entries[key] = size
+                self._entries.move_to_end(key)
+                self._evict()
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    def _remove(self, key: str):
+        """Delete an entry from disk and the index (caller holds the lock)"""
+        self._entries.pop(key, None)
+        shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+
+    def _evict(self):
+        """Evict least-recently-used entries until within budget (caller holds the lock)"""
+        total = sum(self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            key, size = next(iter(self._entries.items()))
+            self._remove(key)
+            self.evictions += 1
+            total -= size
+            logger.info(f"Frame cache evicted: {key} ({size / 1024 ** 2:.1f} MB)")
+
+    def stats(self) -> dict:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": sum(self._entries.values()),
+                "max_bytes": self.max_bytes,
+                "cache_dir": str(self.cache_dir),
+            }
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
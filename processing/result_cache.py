@@ -0,0 +1,256 @@
+"""
+Description result cache
+Persists generated descriptions in a local SQLite file keyed by video content
+and generation parameters, so unchanged re-runs skip the model entirely
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    SQLite-backed LRU cache of generated descriptions
+
+    Keys combine a content fingerprint of the video (size plus a hash of
+    evenly spaced blocks, so a multi-GB file costs a few reads rather than a
+    full pass) with every parameter that changes the output. Rows are evicted
+    least-recently-used first once their total text size exceeds the budget.
+    """
+
+    DEFAULT_MAX_MB = 64.0
+
+    # Fingerprint: this many blocks of BLOCK_SIZE bytes, spread over the file
+    FINGERPRINT_BLOCKS = 16
+    FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+    _default: Optional["ResultCache"] = None
+    _default_lock = threading.Lock()
+
+    # (path, size, mtime_ns) -> fingerprint LRU, so repeat lookups don't re-read the file
+    FINGERPRINT_MEMO_SIZE = 256
+    _fingerprints: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+    _fingerprints_lock = threading.Lock()
+
+    def __init__(self, cache_path: Optional[Union[str, Path]] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize cache
+
+        Args:
+            cache_path: SQLite file (None = default_cache_path())
+            max_bytes: Size budget in bytes (None = VIDEO_DESCRIPTION_RESULT_CACHE_MB
+                environment variable, or DEFAULT_MAX_MB)
+        """
+        self.cache_path = Path(cache_path) if cache_path else self.default_cache_path()
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if max_bytes is None:
+            max_mb = float(os.environ.get("VIDEO_DESCRIPTION_RESULT_CACHE_MB", self.DEFAULT_MAX_MB))
+            max_bytes = int(max_mb * 1024 ** 2)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " description TEXT NOT NULL,"
+                " params TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+
+    @classmethod
+    def default(cls) -> "ResultCache":
+        """Get the process-wide cache instance"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @staticmethod
+    def default_cache_path() -> Path:
+        """
+        Get the default cache file
+
+        Uses VIDEO_DESCRIPTION_RESULT_CACHE_PATH if set, otherwise
+        ComfyUI/models/video_description/result_cache.sqlite3, falling back to
+        the system temp directory outside ComfyUI.
+        """
+        override = os.environ.get("VIDEO_DESCRIPTION_RESULT_CACHE_PATH")
+        if override:
+            return Path(override)
+
+        try:
+            import folder_paths
+            return Path(folder_paths.models_dir) / "video_description" / "result_cache.sqlite3"
+        except ImportError:
+            return Path(tempfile.gettempdir()) / "comfyui_video_description" / "result_cache.sqlite3"
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection, committed on success (nodes run on ComfyUI's worker threads)"""
+        db = sqlite3.connect(self.cache_path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    @classmethod
+    def fingerprint(cls, video_path: Union[str, Path]) -> str:
+        """
+        Fast content fingerprint of a video file
+
+        Hashes the size and FINGERPRINT_BLOCKS blocks at evenly spaced offsets
+        (always including the start and the end, where containers keep their
+        headers and indexes). Unlike a path/mtime key it survives copies and
+        renames; files smaller than the sampled total are hashed whole.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            Hex digest of the sampled content
+        """
+        path = Path(video_path).resolve()
+        stat = path.stat()
+        memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+        with cls._fingerprints_lock:
+            cached = cls._fingerprints.get(memo_key)
+            if cached is not None:
+                cls._fingerprints.move_to_end(memo_key)
+                return cached
+
+        size = stat.st_size
+        block = cls.FINGERPRINT_BLOCK_SIZE
+        blocks = cls.FINGERPRINT_BLOCKS
+        digest = hashlib.blake2b(str(size).encode("ascii"), digest_size=16)
+
+        with open(path, "rb") as f:
+            if size <= block * blocks:
+                digest.update(f.read())
+            else:
+                step = (size - block) / (blocks - 1)
+                for index in range(blocks):
+                    f.seek(int(index * step))
+                    digest.update(f.read(block))
+
+        fingerprint = digest.hexdigest()
+        with cls._fingerprints_lock:
+            cls._fingerprints[memo_key] = fingerprint
+            while len(cls._fingerprints) > cls.FINGERPRINT_MEMO_SIZE:
+                cls._fingerprints.popitem(last=False)
+        return fingerprint
+
+    @staticmethod
+    def make_key(fingerprint: str, **params) -> str:
+        """
+        Build a cache key from a content fingerprint and generation parameters
+
+        Args:
+            fingerprint: Content fingerprint from fingerprint()
+            **params: Everything that changes the generated text (prompt,
+                sampling, max tokens, temperature, model variant, ...)
+
+        Returns:
+            Hex digest identifying the entry
+        """
+        payload = json.dumps({"fingerprint": fingerprint, **params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a description
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            The cached description, or None on a miss
+        """
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT description FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+
+        logger.info(f"Result cache hit: {key}")
+        return row[0]
+
+    def put(self, key: str, description: str, **params):
+        """
+        Store a description, evicting least-recently-used rows over budget
+
+        Args:
+            key: Cache key from make_key()
+            description: Generated text
+            **params: Parameters behind the key, stored for inspection
+        """
+        size = len(description.encode("utf-8"))
+        now = time.time()
+
+        with self._lock, self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO results (key, description, params, size, created, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, description, json.dumps(params, sort_keys=True, default=str), size, now, now)
+            )
+            self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection):
+        """Delete least-recently-used rows until within budget (caller holds the lock)"""
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = db.execute("SELECT key, size FROM results ORDER BY last_used").fetchall()
+        # Always keep the newest row, even if it alone exceeds the budget
+        for key, size in rows[:-1]:
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            logger.info(f"Result cache evicted: {key} ({size / 1024:.1f} KB)")
+
+    def stats(self) -> dict:
+        """Get cache statistics"""
+        with self._lock, self._connect() as db:
+            entries, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "cache_path": str(self.cache_path),
+        }
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock, self._connect() as db:
+            db.execute("DELETE FROM results")
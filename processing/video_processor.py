@@ -3,44 +3,912 @@ Video processing utilities
 Frame extraction and video preparation for Qwen3-VL
 """
 
+import math
+import os
 import cv2
 import numpy as np
 from pathlib import Path
-from typing import List, Union, Optional
+from typing import Any, Iterator, List, Optional, Tuple, Union
 import logging
+import multiprocessing
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .frame_cache import FrameCache
 
 logger = logging.getLogger(__name__)
 
+_END_OF_STREAM = object()
+
+
+def _prefetch_iterator(items: Iterator[Any], depth: int) -> Iterator[Any]:
+    """
+    Run an iterator in a background thread, buffering at most `depth` items
+
+    Exceptions raised by the producer are re-raised in the consumer. Closing
+    the returned generator stops the producer and releases its resources.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    break
+            else:
+                put(_END_OF_STREAM)
+        except BaseException as e:
+            put(e)
+        finally:
+            items.close()
+
+    worker = threading.Thread(target=produce, name="VideoProcessorPrefetch", daemon=True)
+    worker.start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END_OF_STREAM:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        worker.join()
+
+
+def _write_rgb(frame: np.ndarray, dst: np.ndarray, scratch: Optional[np.ndarray] = None):
+    """
+    Resize a BGR frame to the destination size and convert it into dst as RGB
+
+    Args:
+        frame: Decoded BGR frame
+        dst: Destination (H, W, 3) uint8 slice, written in place
+        scratch: Reusable (H, W, 3) uint8 buffer for the resize step
+    """
+    height, width = dst.shape[0], dst.shape[1]
+
+    if frame.shape[0] != height or frame.shape[1] != width:
+        downscale = height * width < frame.shape[0] * frame.shape[1]
+        frame = cv2.resize(
+            frame,
+            (width, height),
+            dst=scratch,
+            interpolation=cv2.INTER_AREA if downscale else cv2.INTER_LINEAR
+        )
+
+    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=dst)
+
+
+def _decode_segment_to_shm(
+    video_path: str,
+    shm_name: str,
+    shape: Tuple[int, int, int, int],
+    indices: List[int],
+    offset: int,
+    seek_threshold: int
+) -> int:
+    """
+    Worker entry point for parallel extraction
+
+    Decodes one segment of target indices with its own capture and writes
+    RGB frames into slots [offset, offset + len(indices)) of a shared
+    (N, H, W, 3) uint8 buffer, resizing to the buffer's frame size on decode.
+
+    Returns:
+        Number of frames written (a prefix of the segment)
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        scratch = np.empty(shape[1:], dtype=np.uint8)
+
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            return 0
+
+        written = 0
+        try:
+            for _, frame in VideoProcessor._decode_sparse(cap, indices, seek_threshold):
+                _write_rgb(frame, out[offset + written], scratch)
+                written += 1
+        finally:
+            cap.release()
+
+        del out
+        return written
+    finally:
+        shm.close()
+
 
 class VideoProcessor:
     """
     Video frame extraction and processing for vision-language models
     """
 
+    # Gaps (in source frames) wider than this are crossed with a container
+    # seek instead of grab()-skipping. Seeking decodes forward from the previous
+    # keyframe, so it only pays off once the gap is longer than a typical GOP.
+    SEEK_THRESHOLD_FRAMES = 250
+
+    # Start method for parallel extraction workers. "spawn" avoids forking a
+    # process that already runs decoder and inference threads.
+    PARALLEL_START_METHOD = "spawn"
+
+    # Scene-aware sampling: candidates are scanned at SCENE_ANALYSIS_FPS and
+    # compared by block-mean grayscale signatures (mean absolute difference in
+    # [0, 1]). Differences under the noise floor count as static; every
+    # SCENE_CHANGE_PER_FRAME of accumulated change earns one frame, plus one
+    # frame per SCENE_MAX_GAP_SECONDS so static spans keep some coverage.
+    SAMPLING_MODES = ("uniform", "scene", "keyframes")
+    SCENE_ANALYSIS_FPS = 4.0
+    SCENE_SIGNATURE_SIZE = 32
+    SCENE_NOISE_FLOOR = 0.01
+    SCENE_CHANGE_PER_FRAME = 0.05
+    SCENE_MAX_GAP_SECONDS = 30.0
+    SCENE_UNIFORM_WEIGHT = 0.2
+
+    # Near-duplicate elimination: a frame is merged into the last kept frame when
+    # their 64-bit difference hashes are within the Hamming threshold and at most
+    # DEDUP_CHANGED_FRACTION of their block-mean luma signatures (normalised to
+    # [0, 1]) moved by more than DEDUP_CHANGE_DELTA. The hash alone is blind to
+    # objects moving over a static background such as a gradient
+    DEDUP_HAMMING_THRESHOLD = 5
+    DEDUP_CHANGE_DELTA = 0.1
+    DEDUP_CHANGED_FRACTION = 0.01
+
+    # In-process metadata cache shared by probe() callers
+    PROBE_CACHE_SIZE = 256
+    _probe_cache: "OrderedDict[Tuple[str, int, int], dict]" = OrderedDict()
+    _probe_lock = threading.Lock()
+
+    # Qwen3-VL video geometry: 16px patches merged 2x2, so frame sides must be
+    # multiples of 32. Pixel bounds match qwen-vl-utils' per-frame video
+    # defaults (128..768 merged tokens per frame).
+    PATCH_FACTOR = 32
+    VIDEO_MIN_PIXELS = 128 * 32 * 32
+    VIDEO_MAX_PIXELS = 768 * 32 * 32
+
+    # Frame cap of the Qwen3-VL video processor; it never sent more frames than
+    # this, so callers use it as the default budget for our own decoding
+    VIDEO_MAX_FRAMES = 768
+
+    @staticmethod
+    def compute_sample_indices(
+        total_frames: int,
+        video_fps: float,
+        fps: float,
+        max_frames: Optional[int] = None,
+        spread: bool = False
+    ) -> List[int]:
+        """
+        Compute source frame indices for sampling at a target FPS
+
+        Targets are placed at exact timestamps (k / fps) and mapped to the
+        frame on screen at that time, so fractional rates (0.3 FPS sampling,
+        29.97 FPS sources) select the right frames instead of drifting.
+
+        Args:
+            total_frames: Number of frames in the source video
+            video_fps: Source video frame rate
+            fps: Target sampling rate (<= 0 or >= video_fps keeps every frame)
+            max_frames: Maximum number of indices to return (None = no limit);
+                the first max_frames targets are kept unless spread is set
+            spread: Thin the targets evenly over the whole video instead of
+                truncating, like the Qwen3-VL processor does (the result is
+                then no longer on the fps grid)
+
+        Returns:
+            Strictly increasing list of frame indices
+        """
+        if total_frames <= 0 or video_fps <= 0:
+            return []
+
+        if fps <= 0 or fps >= video_fps:
+            indices = list(range(total_frames))
+        else:
+            duration = total_frames / video_fps
+            num_samples = int(math.ceil(duration * fps - 1e-9))
+            indices = []
+            for k in range(num_samples):
+                # Frame i is on screen during [i / video_fps, (i + 1) / video_fps)
+                index = int((k / fps) * video_fps + 1e-6)
+                if index >= total_frames:
+                    break
+                if not indices or index != indices[-1]:
+                    indices.append(index)
+
+        if max_frames and len(indices) > max_frames:
+            if not spread or max_frames == 1:
+                return indices[:max_frames]
+            # Step is > 1, so rounded positions stay strictly increasing
+            step = (len(indices) - 1) / (max_frames - 1)
+            indices = [indices[int(round(k * step))] for k in range(max_frames)]
+
+        return indices
+
+    @staticmethod
+    def _decode_sparse(
+        cap: "cv2.VideoCapture",
+        indices: List[int],
+        seek_threshold: int
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Decode only the requested frames from an open capture
+
+        Short gaps are skipped with grab(), which advances the stream without
+        the retrieve/convert step; long gaps are crossed with a seek.
+
+        Yields:
+            Tuples of (frame_index, frame) with frames in BGR format
+        """
+        position = 0  # index of the frame the next read() returns
+
+        for index in indices:
+            gap = index - position
+
+            if gap > seek_threshold:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+                gap = 0
+
+            for _ in range(gap):
+                if not cap.grab():
+                    return
+
+            ret, frame = cap.read()
+            if not ret:
+                return
+
+            position = index + 1
+            yield index, frame
+
+    @staticmethod
+    def _decode_sequential(
+        cap: "cv2.VideoCapture",
+        indices: List[int]
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Decode every frame and keep the requested ones (full-decode path)
+
+        Yields:
+            Tuples of (frame_index, frame) with frames in BGR format
+        """
+        if not indices:
+            return
+
+        wanted = set(indices)
+        last_index = indices[-1]
+        frame_count = 0
+
+        while frame_count <= last_index:
+            ret, frame = cap.read()
+
+            if not ret:
+                return
+
+            if frame_count in wanted:
+                yield frame_count, frame
+
+            frame_count += 1
+
+    @staticmethod
+    def _generate_frames(
+        video_path: Union[str, Path],
+        fps: float,
+        max_frames: Optional[int],
+        decode_mode: str,
+        seek_threshold: Optional[int],
+        spread: bool = False
+    ) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        Decode sampled frames one at a time
+
+        Yields:
+            Tuples of (timestamp_seconds, frame) with frames in RGB format
+        """
+        video_path = Path(video_path)
+
+        if decode_mode not in ("sparse", "sequential"):
+            raise ValueError(f"Unknown decode mode: {decode_mode}")
+
+        # Get video properties
+        info = VideoProcessor.probe(video_path)
+        video_fps = info["fps"]
+        total_frames = info["total_frames"]
+
+        logger.info(f"Extracting frames from: {video_path.name}")
+        logger.info(f"Target FPS: {fps}")
+        logger.info(f"Video FPS: {video_fps:.2f}, Total frames: {total_frames}, Duration: {info['duration']:.2f}s")
+
+        cap = cv2.VideoCapture(str(video_path))
+
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video: {video_path}")
+
+        # Select target frames up front from exact timestamps
+        indices = VideoProcessor.compute_sample_indices(total_frames, video_fps, fps, max_frames, spread)
+
+        try:
+            if decode_mode == "sparse":
+                if seek_threshold is None:
+                    seek_threshold = VideoProcessor.SEEK_THRESHOLD_FRAMES
+                decoded = VideoProcessor._decode_sparse(cap, indices, seek_threshold)
+            else:
+                decoded = VideoProcessor._decode_sequential(cap, indices)
+
+            extracted_count = 0
+            for index, frame in decoded:
+                # Convert BGR to RGB
+                yield index / video_fps, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                extracted_count += 1
+
+            if max_frames and extracted_count >= max_frames:
+                logger.info(f"Reached max frames limit: {max_frames}" + (" (spread over the video)" if spread else ""))
+
+            logger.info(f"✓ Extracted {extracted_count} frames ({decode_mode})")
+
+        finally:
+            cap.release()
+
+    @staticmethod
+    def _chunk_frames(
+        frames: Iterator[Tuple[float, np.ndarray]],
+        chunk_size: int
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Group (timestamp, frame) pairs into stacked fixed-size chunks
+
+        Yields:
+            Tuples of (timestamps, frames) shaped (n,) and (n, H, W, 3);
+            the last chunk may be shorter than chunk_size
+        """
+        timestamps = []
+        chunk = []
+
+        for timestamp, frame in frames:
+            timestamps.append(timestamp)
+            chunk.append(frame)
+
+            if len(chunk) == chunk_size:
+                yield np.asarray(timestamps, dtype=np.float64), np.stack(chunk)
+                timestamps, chunk = [], []
+
+        if chunk:
+            yield np.asarray(timestamps, dtype=np.float64), np.stack(chunk)
+
+    @staticmethod
+    def iter_frames(
+        video_path: Union[str, Path],
+        fps: float = 1.0,
+        max_frames: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        prefetch: int = 2,
+        decode_mode: str = "sparse",
+        seek_threshold: Optional[int] = None,
+        spread: bool = False
+    ) -> Iterator[Tuple[Any, np.ndarray]]:
+        """
+        Stream frames from video at specified FPS with bounded memory
+
+        At most `prefetch` items are decoded ahead of the consumer, so peak
+        memory depends on prefetch and chunk_size, not on video length.
+
+        Args:
+            video_path: Path to video file
+            fps: Frames per second to extract (e.g., 1.0 = 1 frame per second)
+            max_frames: Maximum number of frames to extract (None = no limit);
+                extraction stops after the first max_frames unless spread is set
+            chunk_size: Yield stacked chunks of this many frames (None = single frames)
+            prefetch: Number of items decoded ahead in a background thread
+                (0 = decode synchronously in the caller's thread)
+            decode_mode: "sparse" or "sequential" (see extract_frames)
+            seek_threshold: Frame gap above which sparse mode seeks instead of
+                grabbing (None = SEEK_THRESHOLD_FRAMES)
+            spread: Spread max_frames evenly over the whole video instead of
+                truncating (see compute_sample_indices)
+
+        Yields:
+            (timestamp_seconds, frame) for single frames, or
+            (timestamps, frames) arrays shaped (n,) and (n, H, W, 3) for chunks.
+            Frames are RGB uint8.
+        """
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+
+        items = VideoProcessor._generate_frames(video_path, fps, max_frames, decode_mode, seek_threshold, spread)
+
+        if chunk_size is not None:
+            items = VideoProcessor._chunk_frames(items, chunk_size)
+
+        if prefetch > 0:
+            items = _prefetch_iterator(items, prefetch)
+
+        return items
+
     @staticmethod
     def extract_frames(
         video_path: Union[str, Path],
         fps: float = 1.0,
-        max_frames: Optional[int] = None
+        max_frames: Optional[int] = None,
+        decode_mode: str = "sparse",
+        seek_threshold: Optional[int] = None,
+        workers: int = 1,
+        spread: bool = False
     ) -> List[np.ndarray]:
         """
         Extract frames from video at specified FPS
 
+        Thin wrapper over iter_frames that collects every frame in memory.
+
         Args:
             video_path: Path to video file
             fps: Frames per second to extract (e.g., 1.0 = 1 frame per second)
-            max_frames: Maximum number of frames to extract (None = no limit)
+            max_frames: Maximum number of frames to extract (None = no limit);
+                extraction stops after the first max_frames unless spread is set
+            decode_mode: "sparse" decodes only the sampled frames (grab/seek),
+                "sequential" decodes every frame and discards the rest
+            seek_threshold: Frame gap above which sparse mode seeks instead of
+                grabbing (None = SEEK_THRESHOLD_FRAMES)
+            workers: Decode timeline segments in this many worker processes
+                (sparse mode only, see extract_frames_parallel)
+            spread: Spread max_frames evenly over the whole video instead of
+                truncating (see compute_sample_indices)
 
         Returns:
             List of frames as numpy arrays (RGB format)
         """
+        if workers > 1 and decode_mode == "sparse":
+            _, frames = VideoProcessor.extract_frames_parallel(
+                video_path,
+                fps=fps,
+                max_frames=max_frames,
+                workers=workers,
+                seek_threshold=seek_threshold,
+                spread=spread
+            )
+            return list(frames)
+
+        return [
+            frame for _, frame in VideoProcessor.iter_frames(
+                video_path,
+                fps=fps,
+                max_frames=max_frames,
+                prefetch=0,
+                decode_mode=decode_mode,
+                seek_threshold=seek_threshold,
+                spread=spread
+            )
+        ]
+
+    @staticmethod
+    def select_scene_indices(
+        video_path: Union[str, Path],
+        fps: float = 1.0,
+        max_frames: Optional[int] = None,
+        analysis_fps: Optional[float] = None,
+        seek_threshold: Optional[int] = None
+    ) -> List[int]:
+        """
+        Select frame indices where the content changes
+
+        Scans candidate frames at analysis_fps, computes a block-mean signature
+        on downscaled grayscale frames, and places the frame budget at evenly
+        spaced quantiles of accumulated change (mixed with elapsed time so
+        static spans are not skipped entirely). Static footage gets far fewer
+        frames than the budget; cuts and fast motion get more.
+
+        Args:
+            video_path: Path to video file
+            fps: Sampling rate that defines the frame budget
+            max_frames: Upper bound on the frame budget (None = no limit)
+            analysis_fps: Candidate scan rate (None = SCENE_ANALYSIS_FPS,
+                never lower than fps)
+            seek_threshold: Frame gap above which the scan seeks instead of
+                grabbing (None = SEEK_THRESHOLD_FRAMES)
+
+        Returns:
+            Strictly increasing list of frame indices
+        """
+        video_path = Path(video_path)
+        info = VideoProcessor.probe(video_path)
+        video_fps = info["fps"]
+        total_frames = info["total_frames"]
+
+        budget = len(VideoProcessor.compute_sample_indices(total_frames, video_fps, fps))
+        if max_frames:
+            budget = min(budget, max_frames)
+        if budget <= 0:
+            return []
+
+        analysis_fps = max(analysis_fps or VideoProcessor.SCENE_ANALYSIS_FPS, fps)
+        candidates = VideoProcessor.compute_sample_indices(total_frames, video_fps, analysis_fps)
+        if len(candidates) <= budget:
+            return candidates
+
+        if seek_threshold is None:
+            seek_threshold = VideoProcessor.SEEK_THRESHOLD_FRAMES
+
+        size = VideoProcessor.SCENE_SIGNATURE_SIZE
+        signatures = np.empty((len(candidates), size * size), dtype=np.float32)
+        kept = []
+
+        cap = cv2.VideoCapture(str(video_path))
+
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video: {video_path}")
+
+        try:
+            for index, frame in VideoProcessor._decode_sparse(cap, candidates, seek_threshold):
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                block_means = cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA)
+                signatures[len(kept)] = block_means.ravel()
+                kept.append(index)
+        finally:
+            cap.release()
+
+        if len(kept) <= budget:
+            return kept
+
+        signatures = signatures[:len(kept)] / 255.0
+        change = np.zeros(len(kept), dtype=np.float64)
+        change[1:] = np.abs(np.diff(signatures, axis=0)).mean(axis=1)
+        change = np.maximum(change - VideoProcessor.SCENE_NOISE_FLOOR, 0.0)
+        total_change = float(change.sum())
+
+        wanted = (
+            math.ceil(total_change / VideoProcessor.SCENE_CHANGE_PER_FRAME)
+            + math.ceil(info["duration"] / VideoProcessor.SCENE_MAX_GAP_SECONDS)
+        )
+        count = max(1, min(budget, wanted))
+
+        # Each candidate owns a slice of [0, 1] proportional to its change
+        uniform_weight = VideoProcessor.SCENE_UNIFORM_WEIGHT if total_change > 0 else 1.0
+        weights = np.full(len(kept), uniform_weight / len(kept))
+        if total_change > 0:
+            weights += (1.0 - uniform_weight) * change / total_change
+        cumulative = np.cumsum(weights)
+
+        quantiles = (np.arange(count) + 0.5) / count
+        picks = np.unique(np.minimum(np.searchsorted(cumulative, quantiles), len(kept) - 1))
+
+        logger.info(
+            f"Scene sampling: {len(picks)} frames (budget {budget}) "
+            f"from {len(kept)} candidates, total change {total_change:.3f}"
+        )
+
+        return [kept[i] for i in picks.tolist()]
+
+    @staticmethod
+    def select_indices(
+        video_path: Union[str, Path],
+        fps: float = 1.0,
+        max_frames: Optional[int] = None,
+        sampling_mode: str = "uniform",
+        seek_threshold: Optional[int] = None,
+        spread: bool = False
+    ) -> List[int]:
+        """
+        Select source frame indices for a sampling mode
+
+        Args:
+            video_path: Path to video file
+            fps: Sampling rate (uniform) or budget rate (scene)
+            max_frames: Maximum number of frames (None = no limit)
+            sampling_mode: One of SAMPLING_MODES
+            seek_threshold: Frame gap above which scans seek instead of grabbing
+            spread: Uniform mode: spread max_frames evenly over the whole video
+                instead of truncating (scene mode always covers the whole video)
+
+        Returns:
+            Strictly increasing list of frame indices
+        """
+        if sampling_mode == "uniform":
+            info = VideoProcessor.probe(video_path)
+            return VideoProcessor.compute_sample_indices(info["total_frames"], info["fps"], fps, max_frames, spread)
+
+        if sampling_mode == "scene":
+            return VideoProcessor.select_scene_indices(
+                video_path, fps=fps, max_frames=max_frames, seek_threshold=seek_threshold
+            )
+
+        raise ValueError(f"Unknown sampling mode: {sampling_mode}")
+
+    @staticmethod
+    def extract_keyframes(
+        video_path: Union[str, Path],
+        fps: float = 1.0,
+        max_frames: Optional[int] = None,
+        resize: bool = True,
+        max_pixels: int = VIDEO_MAX_PIXELS,
+        min_pixels: int = VIDEO_MIN_PIXELS,
+        factor: int = PATCH_FACTOR
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extract intra-coded frames only, for fast low-accuracy previews
+
+        Seeks through the container index to the keyframe at or before evenly
+        spaced targets, with the decoder told to skip non-key frames, so delta
+        frames are never decoded. Long-GOP sources yield fewer frames than the
+        budget, spaced by keyframe rather than by time. The stream's display
+        rotation is applied, so frames are oriented like the OpenCV paths.
+
+        Requires PyAV (bundled with recent ComfyUI; otherwise `pip install av`).
+
+        Args:
+            video_path: Path to video file
+            fps: Rate that defines the frame budget (duration * fps frames)
+            max_frames: Upper bound on the frame budget (None = no limit)
+            resize: Resize to the patch-aligned target size (False = native size)
+            max_pixels: Maximum area per frame when resizing
+            min_pixels: Minimum area per frame when resizing
+            factor: Side length granularity when resizing
+
+        Returns:
+            Tuple of (timestamps, frames) shaped (N,) and (N, H, W, 3).
+            Frames are RGB uint8.
+        """
+        try:
+            import av
+        except ImportError as e:
+            raise ImportError("Keyframe sampling requires PyAV. Install it with: pip install av") from e
+
+        video_path = Path(video_path)
+        info = VideoProcessor.probe(video_path)
+
+        budget = len(VideoProcessor.compute_sample_indices(info["total_frames"], info["fps"], fps, max_frames))
+        if budget <= 0:
+            return np.zeros((0,), dtype=np.float64), np.zeros((0, 0, 0, 3), dtype=np.uint8)
+
+        logger.info(f"Extracting keyframes from: {video_path.name} (budget {budget})")
+
+        container = av.open(str(video_path))
+        try:
+            stream = container.streams.video[0]
+            stream.codec_context.skip_frame = "NONKEY"
+            time_base = stream.time_base
+            start_pts = stream.start_time or 0
+
+            frames = None
+            seen_pts = set()
+            timestamps = []
+
+            targets = (np.arange(budget) + 0.5) / budget * info["duration"]
+            for target in targets.tolist():
+                container.seek(
+                    start_pts + int(target / time_base),
+                    stream=stream,
+                    backward=True,
+                    any_frame=False
+                )
+                frame = next(container.decode(stream), None)
+                if frame is None or frame.pts is None or frame.pts in seen_pts:
+                    continue
+
+                seen_pts.add(frame.pts)
+                turns = VideoProcessor._display_quarter_turns(stream, frame)
+                if frames is None:
+                    # Size the buffer for the displayed (rotated) orientation
+                    height, width = frame.height, frame.width
+                    if turns % 2:
+                        height, width = width, height
+                    if resize:
+                        height, width = VideoProcessor.compute_target_size(
+                            height, width, factor, min_pixels, max_pixels
+                        )
+                    frames = np.empty((budget, height, width, 3), dtype=np.uint8)
+
+                # Scale in coded orientation, then rotate into the slot
+                coded_height, coded_width = (width, height) if turns % 2 else (height, width)
+                image = frame.reformat(width=coded_width, height=coded_height, format="rgb24").to_ndarray()
+                frames[len(timestamps)] = np.rot90(image, turns)
+                timestamps.append(float((frame.pts - start_pts) * time_base))
+        finally:
+            container.close()
+
+        if frames is None:
+            return np.zeros((0,), dtype=np.float64), np.zeros((0, 0, 0, 3), dtype=np.uint8)
+
+        # Seeks can land on the same or an earlier keyframe; return timeline order
+        order = np.argsort(timestamps, kind="stable")
+        frames = frames[:len(timestamps)][order]
+        timestamps = np.asarray(timestamps, dtype=np.float64)[order]
+
+        logger.info(f"✓ Extracted {len(frames)} keyframes at {width}x{height}")
+
+        return timestamps, frames
+
+    @staticmethod
+    def _display_quarter_turns(stream, frame) -> int:
+        """
+        Quarter turns for np.rot90 that apply a PyAV stream's display rotation
+
+        PyAV decodes pictures as coded; the display matrix phone footage
+        carries (and OpenCV applies on decode) is only exposed as metadata:
+        VideoFrame.rotation on recent PyAV, stream side data on older releases.
+        Both give the counterclockwise angle, which is what np.rot90 turns by.
+        """
+        rotation = getattr(frame, "rotation", None)
+        if rotation is None:
+            side_data = getattr(stream, "side_data", None) or {}
+            rotation = side_data.get("DISPLAYMATRIX")
+
+        try:
+            return int(round(float(rotation or 0) / 90)) % 4
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def compute_target_size(
+        height: int,
+        width: int,
+        factor: int = PATCH_FACTOR,
+        min_pixels: int = VIDEO_MIN_PIXELS,
+        max_pixels: int = VIDEO_MAX_PIXELS
+    ) -> Tuple[int, int]:
+        """
+        Compute a patch-aligned frame size within a pixel budget
+
+        Mirrors the smart_resize rule used by the Qwen-VL processors: both
+        sides are rounded to multiples of `factor` and the aspect ratio is
+        kept while the area is clamped to [min_pixels, max_pixels].
+
+        Args:
+            height: Source frame height
+            width: Source frame width
+            factor: Side length granularity (patch size * merge size)
+            min_pixels: Minimum frame area
+            max_pixels: Maximum frame area
+
+        Returns:
+            Tuple of (target_height, target_width)
+        """
+        target_height = max(factor, round(height / factor) * factor)
+        target_width = max(factor, round(width / factor) * factor)
+
+        if target_height * target_width > max_pixels:
+            beta = math.sqrt((height * width) / max_pixels)
+            target_height = max(factor, math.floor(height / beta / factor) * factor)
+            target_width = max(factor, math.floor(width / beta / factor) * factor)
+        elif target_height * target_width < min_pixels:
+            beta = math.sqrt(min_pixels / (height * width))
+            target_height = math.ceil(height * beta / factor) * factor
+            target_width = math.ceil(width * beta / factor) * factor
+
+        return target_height, target_width
+
+    @staticmethod
+    def extract_frames_array(
+        video_path: Union[str, Path],
+        fps: float = 1.0,
+        max_frames: Optional[int] = None,
+        resize: bool = True,
+        max_pixels: int = VIDEO_MAX_PIXELS,
+        min_pixels: int = VIDEO_MIN_PIXELS,
+        factor: int = PATCH_FACTOR,
+        seek_threshold: Optional[int] = None,
+        workers: int = 1,
+        cache: Optional[FrameCache] = None,
+        sampling_mode: str = "uniform",
+        spread: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extract frames into one preallocated contiguous buffer
+
+        Frames are resized on decode to the patch-aligned size Qwen3-VL expects
+        and color-converted straight into their slot of the output, so the hot
+        loop makes no per-frame allocations and keeps no full-resolution copies.
+
+        Args:
+            video_path: Path to video file
+            fps: Frames per second to extract (e.g., 1.0 = 1 frame per second)
+            max_frames: Maximum number of frames to extract (None = no limit);
+                the first max_frames are kept unless spread is set
+            resize: Resize to the patch-aligned target size (False = native size)
+            max_pixels: Maximum area per frame when resizing
+            min_pixels: Minimum area per frame when resizing
+            factor: Side length granularity when resizing
+            seek_threshold: Frame gap above which sparse decoding seeks instead
+                of grabbing (None = SEEK_THRESHOLD_FRAMES)
+            workers: Decode timeline segments in this many worker processes
+            cache: FrameCache to look up and store results in (None = no caching).
+                Cache hits return read-only memory-mapped frames.
+            sampling_mode: Frame selection strategy, one of SAMPLING_MODES
+                ("scene" spends the budget where the content changes,
+                "keyframes" decodes intra-coded frames only, see extract_keyframes)
+            spread: Uniform mode: spread max_frames evenly over the whole video
+                instead of truncating (see compute_sample_indices)
+
+        Returns:
+            Tuple of (timestamps, frames) shaped (N,) and (N, H, W, 3).
+            Frames are RGB uint8.
+        """
         video_path = Path(video_path)
 
         if not video_path.exists():
             raise FileNotFoundError(f"Video not found: {video_path}")
 
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.make_key(
+                video_path,
+                fps=fps,
+                max_frames=max_frames,
+                resize=resize,
+                max_pixels=max_pixels,
+                min_pixels=min_pixels,
+                factor=factor,
+                sampling_mode=sampling_mode,
+                spread=spread
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        if sampling_mode == "keyframes":
+            timestamps, frames = VideoProcessor.extract_keyframes(
+                video_path,
+                fps=fps,
+                max_frames=max_frames,
+                resize=resize,
+                max_pixels=max_pixels,
+                min_pixels=min_pixels,
+                factor=factor
+            )
+        else:
+            indices = VideoProcessor.select_indices(video_path, fps, max_frames, sampling_mode, seek_threshold, spread)
+            timestamps, frames = VideoProcessor._decode_frames_array(
+                video_path, indices, resize, max_pixels, min_pixels, factor, seek_threshold, workers
+            )
+
+        if cache_key is not None and len(frames) > 0:
+            cache.put(cache_key, timestamps, frames)
+
+        return timestamps, frames
+
+    @staticmethod
+    def _decode_frames_array(
+        video_path: Path,
+        indices: List[int],
+        resize: bool,
+        max_pixels: int,
+        min_pixels: int,
+        factor: int,
+        seek_threshold: Optional[int],
+        workers: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode the given frames for extract_frames_array, bypassing the cache"""
+        if workers > 1:
+            return VideoProcessor.extract_frames_parallel(
+                video_path,
+                indices=indices,
+                workers=workers,
+                seek_threshold=seek_threshold,
+                resize=resize,
+                max_pixels=max_pixels,
+                min_pixels=min_pixels,
+                factor=factor
+            )
+
+        if seek_threshold is None:
+            seek_threshold = VideoProcessor.SEEK_THRESHOLD_FRAMES
+
+        video_fps = VideoProcessor.probe(video_path)["fps"]
+
         logger.info(f"Extracting frames from: {video_path.name}")
-        logger.info(f"Target FPS: {fps}")
 
         cap = cv2.VideoCapture(str(video_path))
 
@@ -48,63 +916,427 @@ class VideoProcessor:
             raise ValueError(f"Could not open video: {video_path}")
 
         try:
-            # Get video properties
-            video_fps = cap.get(cv2.CAP_PROP_FPS)
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            duration = total_frames / video_fps if video_fps > 0 else 0
+            frames = None
+            scratch = None
+            kept = []
 
-            logger.info(f"Video FPS: {video_fps:.2f}, Total frames: {total_frames}, Duration: {duration:.2f}s")
+            for index, frame in VideoProcessor._decode_sparse(cap, indices, seek_threshold):
+                if frames is None:
+                    # Size the buffer from the first decoded frame, which
+                    # already reflects any rotation applied by the backend
+                    height, width = frame.shape[0], frame.shape[1]
+                    if resize:
+                        height, width = VideoProcessor.compute_target_size(
+                            height, width, factor, min_pixels, max_pixels
+                        )
+                    frames = np.empty((len(indices), height, width, 3), dtype=np.uint8)
+                    scratch = np.empty((height, width, 3), dtype=np.uint8)
 
-            # Calculate frame interval
-            frame_interval = int(video_fps / fps) if fps > 0 else 1
+                _write_rgb(frame, frames[len(kept)], scratch)
+                kept.append(index)
 
-            frames = []
-            frame_count = 0
-            extracted_count = 0
+        finally:
+            cap.release()
 
-            while True:
-                ret, frame = cap.read()
+        if frames is None:
+            return np.zeros((0,), dtype=np.float64), np.zeros((0, 0, 0, 3), dtype=np.uint8)
 
-                if not ret:
-                    break
+        # Trim if the stream ended before every target was decoded
+        frames = frames[:len(kept)]
+        timestamps = np.asarray(kept, dtype=np.float64) / video_fps
+
+        logger.info(f"✓ Extracted {len(kept)} frames at {frames.shape[2]}x{frames.shape[1]}")
+
+        return timestamps, frames
+
+    @staticmethod
+    def compute_windows(
+        duration: float,
+        window_seconds: float,
+        overlap_seconds: float = 0.0
+    ) -> List[Tuple[float, float]]:
+        """
+        Split a timeline into overlapping fixed-length windows
+
+        Args:
+            duration: Video duration in seconds
+            window_seconds: Window length (<= 0 = one window for the whole video)
+            overlap_seconds: Overlap between consecutive windows
+
+        Returns:
+            List of (start, end) times in seconds; the last window ends at duration
+        """
+        if window_seconds <= 0 or duration <= window_seconds:
+            return [(0.0, duration)]
+
+        stride = window_seconds - overlap_seconds
+        if stride <= 0:
+            raise ValueError(f"Window overlap ({overlap_seconds}s) must be shorter than the window ({window_seconds}s)")
+
+        windows = []
+        start = 0.0
+        while True:
+            end = min(start + window_seconds, duration)
+            windows.append((start, end))
+            if end >= duration:
+                break
+            start += stride
+
+        return windows
+
+    @staticmethod
+    def iter_windows(
+        video_path: Union[str, Path],
+        window_seconds: float,
+        overlap_seconds: float = 0.0,
+        fps: float = 1.0,
+        max_frames_per_window: Optional[int] = None,
+        resize: bool = True,
+        max_pixels: int = VIDEO_MAX_PIXELS,
+        min_pixels: int = VIDEO_MIN_PIXELS,
+        factor: int = PATCH_FACTOR,
+        seek_threshold: Optional[int] = None
+    ) -> Iterator[Tuple[float, float, np.ndarray, np.ndarray]]:
+        """
+        Decode a video one time window at a time
+
+        Only the current window's frames are held in memory, so peak memory
+        depends on the window size, not on the video's duration.
+
+        Args:
+            video_path: Path to video file
+            window_seconds: Window length in seconds
+            overlap_seconds: Overlap between consecutive windows
+            fps: Sampling rate within each window
+            max_frames_per_window: Cap per window; frames are thinned evenly
+                across the window rather than truncated (None = no limit)
+            resize: Resize to the patch-aligned target size (False = native size)
+            max_pixels: Maximum area per frame when resizing
+            min_pixels: Minimum area per frame when resizing
+            factor: Side length granularity when resizing
+            seek_threshold: Frame gap above which decoding seeks instead of
+                grabbing (None = SEEK_THRESHOLD_FRAMES)
+
+        Yields:
+            Tuples of (start, end, timestamps, frames) per non-empty window
+        """
+        video_path = Path(video_path)
+        info = VideoProcessor.probe(video_path)
+        video_fps = info["fps"]
+
+        indices = np.asarray(
+            VideoProcessor.compute_sample_indices(info["total_frames"], video_fps, fps),
+            dtype=np.int64
+        )
+        times = indices / video_fps if video_fps > 0 else np.zeros(len(indices))
+
+        windows = VideoProcessor.compute_windows(info["duration"], window_seconds, overlap_seconds)
+        logger.info(f"Windowed extraction: {len(windows)} windows of {window_seconds}s ({overlap_seconds}s overlap)")
+
+        for start, end in windows:
+            window_indices = indices[np.searchsorted(times, start):np.searchsorted(times, end)]
+
+            if max_frames_per_window and len(window_indices) > max_frames_per_window:
+                picks = np.linspace(0, len(window_indices) - 1, max_frames_per_window).round().astype(np.int64)
+                window_indices = window_indices[np.unique(picks)]
+
+            if len(window_indices) == 0:
+                continue
+
+            timestamps, frames = VideoProcessor._decode_frames_array(
+                video_path, window_indices.tolist(), resize, max_pixels, min_pixels, factor, seek_threshold, 1
+            )
+            if len(frames) == 0:
+                continue
+
+            yield start, end, timestamps, frames
+
+    @staticmethod
+    def extract_frames_parallel(
+        video_path: Union[str, Path],
+        fps: float = 1.0,
+        max_frames: Optional[int] = None,
+        workers: Optional[int] = None,
+        seek_threshold: Optional[int] = None,
+        resize: bool = False,
+        max_pixels: int = VIDEO_MAX_PIXELS,
+        min_pixels: int = VIDEO_MIN_PIXELS,
+        factor: int = PATCH_FACTOR,
+        indices: Optional[List[int]] = None,
+        spread: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extract frames by decoding timeline segments in worker processes
+
+        The sampled indices are split into contiguous segments, one per worker.
+        Each worker opens its own capture and writes frames into a shared
+        memory buffer, so no frame data is pickled between processes.
+
+        Args:
+            video_path: Path to video file
+            fps: Frames per second to extract (e.g., 1.0 = 1 frame per second)
+            max_frames: Maximum number of frames to extract (None = no limit);
+                the first max_frames are kept unless spread is set
+            workers: Number of worker processes (None = os.cpu_count())
+            seek_threshold: Frame gap above which workers seek instead of
+                grabbing (None = SEEK_THRESHOLD_FRAMES)
+            resize: Resize on decode to the patch-aligned target size
+            max_pixels: Maximum area per frame when resizing
+            min_pixels: Minimum area per frame when resizing
+            factor: Side length granularity when resizing
+            indices: Explicit source frame indices to decode, strictly
+                increasing (None = sample at fps)
+            spread: Spread max_frames evenly over the whole video instead of
+                truncating (see compute_sample_indices)
+
+        Returns:
+            Tuple of (timestamps, frames) shaped (N,) and (N, H, W, 3), in
+            timeline order. Frames are RGB uint8.
+        """
+        video_path = Path(video_path)
+        info = VideoProcessor.probe(video_path)
+        video_fps = info["fps"]
+        if indices is None:
+            indices = VideoProcessor.compute_sample_indices(info["total_frames"], video_fps, fps, max_frames, spread)
+        if not indices:
+            return np.zeros((0,), dtype=np.float64), np.zeros((0, 0, 0, 3), dtype=np.uint8)
+
+        # Size the buffer from a decoded frame, like the serial path: container
+        # dimensions ignore the rotation the backend applies on decode
+        height, width = VideoProcessor._decoded_frame_size(video_path, indices[0], (info["height"], info["width"]))
+        if resize and height > 0 and width > 0:
+            height, width = VideoProcessor.compute_target_size(height, width, factor, min_pixels, max_pixels)
+        shape = (len(indices), height, width, 3)
+
+        if shape[1] <= 0 or shape[2] <= 0:
+            return np.zeros((0,), dtype=np.float64), np.zeros((0, max(shape[1], 0), max(shape[2], 0), 3), dtype=np.uint8)
+
+        if seek_threshold is None:
+            seek_threshold = VideoProcessor.SEEK_THRESHOLD_FRAMES
+
+        workers = max(1, min(workers or os.cpu_count() or 1, len(indices)))
+        segments = [segment.tolist() for segment in np.array_split(np.asarray(indices), workers)]
+        offsets = np.cumsum([0] + [len(segment) for segment in segments[:-1]]).tolist()
+
+        logger.info(f"Extracting {len(indices)} frames from {video_path.name} with {workers} workers")
+
+        shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        try:
+            context = multiprocessing.get_context(VideoProcessor.PARALLEL_START_METHOD)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = [
+                    pool.submit(
+                        _decode_segment_to_shm,
+                        str(video_path), shm.name, shape, segment, offset, seek_threshold
+                    )
+                    for segment, offset in zip(segments, offsets)
+                ]
+                counts = [future.result() for future in futures]
 
-                # Extract frame at specified interval
-                if frame_count % frame_interval == 0:
-                    # Convert BGR to RGB
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    frames.append(frame_rgb)
-                    extracted_count += 1
+            buffer = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
 
-                    # Check max frames limit
-                    if max_frames and extracted_count >= max_frames:
-                        logger.info(f"Reached max frames limit: {max_frames}")
-                        break
+            # Keep only the decoded prefix of each segment, in timeline order
+            if all(count == len(segment) for count, segment in zip(counts, segments)):
+                frames = buffer.copy()
+                kept = indices
+            else:
+                slots = np.concatenate([
+                    np.arange(offset, offset + count)
+                    for offset, count in zip(offsets, counts)
+                ]).astype(np.int64)
+                frames = buffer[slots]
+                kept = [indices[slot] for slot in slots.tolist()]
 
-                frame_count += 1
+            del buffer
+        finally:
+            shm.close()
+            shm.unlink()
+
+        timestamps = np.asarray(kept, dtype=np.float64) / video_fps
+
+        logger.info(f"✓ Extracted {len(frames)} frames ({workers} workers)")
 
-            logger.info(f"✓ Extracted {len(frames)} frames")
+        return timestamps, frames
+
+    @staticmethod
+    def _decoded_frame_size(video_path: Path, index: int, fallback: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Height and width of a frame as the backend decodes it
 
-            return frames
+        Args:
+            video_path: Path to video file
+            index: Frame to decode
+            fallback: Size returned if the frame can't be decoded
 
+        Returns:
+            Tuple of (height, width)
+        """
+        cap = cv2.VideoCapture(str(video_path))
+        try:
+            if cap.isOpened():
+                if index > 0:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+                ok, frame = cap.read()
+                if ok and frame is not None:
+                    return frame.shape[0], frame.shape[1]
         finally:
             cap.release()
+        return fallback
 
     @staticmethod
-    def get_video_info(video_path: Union[str, Path]) -> dict:
+    def compute_frame_hashes(frames: np.ndarray) -> np.ndarray:
         """
-        Get video metadata
+        Compute a 64-bit difference hash (dHash) for every frame in a batch
+
+        The whole batch is reduced at once: frames are subsampled, converted to
+        luma, averaged into an 8x9 block grid, and each bit records whether a
+        block is brighter than its left neighbour.
+
+        Args:
+            frames: RGB uint8 frames shaped (N, H, W, 3)
+
+        Returns:
+            Hashes as uint64 shaped (N,)
+        """
+        rows, cols = 8, 9
+        num_frames, height, width = frames.shape[0], frames.shape[1], frames.shape[2]
+
+        if height < rows or width < cols:
+            raise ValueError(f"Frames too small to hash: {width}x{height}")
+
+        # About 8x8 source pixels per block is plenty for a block mean
+        blocks = VideoProcessor._block_luma(frames, rows, cols, 8)
+
+        bits = blocks[:, :, 1:] > blocks[:, :, :-1]
+        packed = np.packbits(bits.reshape(num_frames, rows * (cols - 1)), axis=1)
+        return np.ascontiguousarray(packed).view(">u8").ravel().astype(np.uint64)
+
+    @staticmethod
+    def compute_frame_signatures(frames: np.ndarray, size: int = SCENE_SIGNATURE_SIZE) -> np.ndarray:
+        """
+        Compute block-mean luma signatures for every frame in a batch
+
+        Args:
+            frames: RGB uint8 frames shaped (N, H, W, 3)
+            size: Signature grid side (capped at the frame size)
+
+        Returns:
+            Signatures in [0, 1] shaped (N, rows * cols)
+        """
+        rows, cols = min(size, frames.shape[1]), min(size, frames.shape[2])
+        blocks = VideoProcessor._block_luma(frames, rows, cols, 2) / 255.0
+        return blocks.reshape(frames.shape[0], rows * cols)
+
+    @staticmethod
+    def _block_luma(frames: np.ndarray, rows: int, cols: int, samples: int) -> np.ndarray:
+        """
+        Mean luma of a rows x cols block grid per frame
+
+        Frames are strided down to about samples x samples pixels per block
+        first, so the whole batch is reduced without a full-resolution copy.
+
+        Returns:
+            Block means in [0, 255] shaped (N, rows, cols)
+        """
+        num_frames, height, width = frames.shape[0], frames.shape[1], frames.shape[2]
+        step_y = max(1, height // (rows * samples))
+        step_x = max(1, width // (cols * samples))
+        sub = frames[:, ::step_y, ::step_x]
+        crop_h = sub.shape[1] // rows * rows
+        crop_w = sub.shape[2] // cols * cols
+        sub = sub[:, :crop_h, :crop_w]
+
+        luma = sub.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        return luma.reshape(num_frames, rows, crop_h // rows, cols, crop_w // cols).mean(axis=(2, 4))
+
+    @staticmethod
+    def deduplicate_frames(
+        timestamps: np.ndarray,
+        frames: np.ndarray,
+        threshold: int = DEDUP_HAMMING_THRESHOLD,
+        changed_fraction: float = DEDUP_CHANGED_FRACTION
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Drop frames that are near-duplicates of the last kept frame
+
+        A frame is merged only if its dHash is within threshold bits of the
+        last kept frame and at most changed_fraction of its luma signature
+        changed noticeably, so a small object moving over a static background
+        (which barely moves the hash) still counts as new content.
+
+        Args:
+            timestamps: Source timestamp of each frame, shaped (N,)
+            frames: RGB uint8 frames shaped (N, H, W, 3)
+            threshold: Maximum Hamming distance between hashes to merge
+            changed_fraction: Maximum fraction of signature blocks whose luma
+                may change by more than DEDUP_CHANGE_DELTA to merge
+
+        Returns:
+            Tuple of (timestamps, frames, merged_counts) for the kept frames.
+            Kept frames keep their original timestamps; merged_counts[k] is how
+            many sampled frames (including itself) frame k stands for.
+        """
+        if len(frames) == 0:
+            return timestamps, frames, np.zeros((0,), dtype=np.int64)
+
+        hashes = VideoProcessor.compute_frame_hashes(frames).tolist()
+        signatures = VideoProcessor.compute_frame_signatures(frames)
+
+        keep = [0]
+        merged_counts = [1]
+        last = 0
+
+        for i in range(1, len(hashes)):
+            changed = float((np.abs(signatures[i] - signatures[last]) > VideoProcessor.DEDUP_CHANGE_DELTA).mean())
+            if bin(hashes[i] ^ hashes[last]).count("1") <= threshold and changed <= changed_fraction:
+                merged_counts[-1] += 1
+            else:
+                keep.append(i)
+                merged_counts.append(1)
+                last = i
+
+        logger.info(f"Dedup: kept {len(keep)} of {len(frames)} frames (threshold {threshold})")
+
+        if len(keep) == len(frames):
+            return timestamps, frames, np.asarray(merged_counts, dtype=np.int64)
+
+        keep = np.asarray(keep, dtype=np.int64)
+        return np.asarray(timestamps)[keep], frames[keep], np.asarray(merged_counts, dtype=np.int64)
+
+    @staticmethod
+    def probe(video_path: Union[str, Path]) -> dict:
+        """
+        Validate a video and read its metadata with a single open
+
+        Results are memoized per (resolved path, size, mtime), so repeat calls
+        on an unchanged file do no container I/O beyond a stat().
 
         Args:
             video_path: Path to video file
 
         Returns:
             Dictionary with video information
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file cannot be opened as a video
         """
         video_path = Path(video_path)
 
-        if not video_path.exists():
+        try:
+            resolved = video_path.resolve()
+            stat = resolved.stat()
+        except (FileNotFoundError, NotADirectoryError):
             raise FileNotFoundError(f"Video not found: {video_path}")
 
+        key = (str(resolved), stat.st_size, stat.st_mtime_ns)
+
+        with VideoProcessor._probe_lock:
+            cached = VideoProcessor._probe_cache.get(key)
+            if cached is not None:
+                VideoProcessor._probe_cache.move_to_end(key)
+                return {**cached, "path": str(video_path)}
+
         cap = cv2.VideoCapture(str(video_path))
 
         if not cap.isOpened():
@@ -116,19 +1348,38 @@ class VideoProcessor:
             width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             duration = total_frames / fps if fps > 0 else 0
-
-            return {
-                "fps": fps,
-                "total_frames": total_frames,
-                "width": width,
-                "height": height,
-                "duration": duration,
-                "path": str(video_path)
-            }
-
         finally:
             cap.release()
 
+        info = {
+            "fps": fps,
+            "total_frames": total_frames,
+            "width": width,
+            "height": height,
+            "duration": duration,
+            "path": str(video_path)
+        }
+
+        with VideoProcessor._probe_lock:
+            VideoProcessor._probe_cache[key] = info
+            while len(VideoProcessor._probe_cache) > VideoProcessor.PROBE_CACHE_SIZE:
+                VideoProcessor._probe_cache.popitem(last=False)
+
+        return dict(info)
+
+    @staticmethod
+    def get_video_info(video_path: Union[str, Path]) -> dict:
+        """
+        Get video metadata
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            Dictionary with video information
+        """
+        return VideoProcessor.probe(video_path)
+
     @staticmethod
     def validate_video(video_path: Union[str, Path]) -> bool:
         """
@@ -141,17 +1392,12 @@ class VideoProcessor:
             True if valid, False otherwise
         """
         try:
-            video_path = Path(video_path)
-
-            if not video_path.exists():
-                logger.error(f"Video file not found: {video_path}")
-                return False
+            VideoProcessor.probe(video_path)
+            return True
 
-            cap = cv2.VideoCapture(str(video_path))
-            is_valid = cap.isOpened()
-            cap.release()
-
-            return is_valid
+        except FileNotFoundError:
+            logger.error(f"Video file not found: {video_path}")
+            return False
 
         except Exception as e:
             logger.error(f"Error validating video: {e}")
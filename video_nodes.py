@@ -4,12 +4,17 @@ All heavy imports (transformers, model classes) are lazy-loaded
 to avoid blocking ComfyUI startup.
 """
 
+import functools
 import logging
 import os
 import sys
+import threading
+import time
 from pathlib import Path
 from typing import Tuple
 
+import numpy as np
+
 # ComfyUI imports
 import folder_paths
 
@@ -28,15 +33,257 @@ def _import_video_processor():
     return VideoProcessor
 
 
+def _import_frame_cache():
+    from processing.frame_cache import FrameCache
+    return FrameCache
+
+
+def _import_result_cache():
+    from processing.result_cache import ResultCache
+    return ResultCache
+
+
+def _import_feature_cache():
+    from models.vision_feature_cache import VisionFeatureCache
+    return VisionFeatureCache
+
+
 def _import_qwen3vl():
     from models.model_cache import ModelCache
     from models.qwen3vl_inference import Qwen3VLInference
     return ModelCache, Qwen3VLInference
 
 
+def _route_model(ModelCache, analysis_type, custom_prompt, model_size):
+    """
+    Pick the model size for a run
+
+    Presets are routed by analysis type; custom prompts can ask for anything,
+    so they go to the default size unless overridden.
+
+    Returns:
+        Tuple of (model size, info line)
+    """
+    if model_size != "auto":
+        return model_size, f"\nModel size: {model_size} (override)"
+
+    routed_type = "custom" if custom_prompt and custom_prompt.strip() else analysis_type
+    size = ModelCache.route(routed_type)
+    return size, f"\nModel size: {size} (auto, {routed_type})"
+
+
+def _model_info(ModelCache, use_4bit, model_size):
+    """
+    Describe how the model for this run was obtained, for the info output
+
+    Returns:
+        Info line with the load time breakdown on a fresh load, or the cache tier and use count,
+        plus a note when a 4-bit request was served by a different quantization
+    """
+    stats = ModelCache.variant_stats(use_4bit=use_4bit, model_size=model_size)
+    if stats is None:
+        return ""
+
+    variant = f"{stats['quantization']}/{stats['dtype']} on {stats['device']}"
+    note = ""
+    if use_4bit and stats["quantization"] != "4bit":
+        note = f"\nNote: 4-bit is not available here, using {variant} instead"
+
+    if stats["uses"] > 1:
+        return f"\nModel: cached ({variant}, use #{stats['uses']})" + note
+
+    phases = ", ".join(f"{name.replace('_', ' ')} {seconds:.1f}s" for name, seconds in stats["load_phases"].items())
+    return f"\nModel: {variant}, loaded in {stats['load_time_s']:.1f}s ({phases})" + note
+
+
+def _lookup_result(mode, video_path, params):
+    """
+    Check the description result cache before loading the model
+
+    Hits are only served when generation is deterministic (temperature 0) or
+    mode is "always"; otherwise the lookup just prepares the key for storing.
+
+    Args:
+        mode: "deterministic", "always" or "off"
+        video_path: Resolved video path (content fingerprinted)
+        params: Everything that changes the output, including the model variant
+
+    Returns:
+        Tuple of (cache, key, cached description or None); cache is None when
+        the result cache is off or unavailable
+    """
+    if mode == "off":
+        return None, None, None
+
+    try:
+        cache = _import_result_cache().default()
+        key = cache.make_key(cache.fingerprint(video_path), **params)
+        if params["temperature"] == 0 or mode == "always":
+            return cache, key, cache.get(key)
+        return cache, key, None
+    except Exception as e:
+        logger.warning(f"Result cache unavailable: {e}")
+        return None, None, None
+
+
+def _store_result(cache, key, description, params):
+    """Save a generated description in the result cache (no-op when it is off)"""
+    if cache is None:
+        return
+
+    try:
+        cache.put(key, description, **params)
+    except Exception as e:
+        logger.warning(f"Result cache write failed: {e}")
+
+
+def _feature_key(video_path, params):
+    """
+    Key for the vision feature cache: video content, frame sampling and model variant
+
+    The prompt is deliberately left out, so presets and custom prompts on the
+    same clip share one encoding.
+
+    Returns:
+        Key string, or None if the video can't be fingerprinted
+    """
+    try:
+        ResultCache = _import_result_cache()
+        return ResultCache.make_key(ResultCache.fingerprint(video_path), kind="vision_features", **params)
+    except OSError as e:
+        logger.warning(f"Vision feature cache skipped: {e}")
+        return None
+
+
+# Frame cap of the Qwen3-VL video processor; frames are decoded here and passed
+# with do_sample_frames=False, so the node applies it. VideoProcessor only
+# needs OpenCV and NumPy, so reading it at import doesn't slow startup
+MAX_VIDEO_FRAMES = _import_video_processor().VIDEO_MAX_FRAMES
+
+# Minimum seconds between partial-text pushes to the frontend
+PROGRESS_TEXT_INTERVAL_S = 0.25
+
+
+def _progress_channel(unique_id, total):
+    """
+    Get the ComfyUI progress bar and progress-text sender for a node
+
+    Returns:
+        Tuple of (ProgressBar, send_progress_text or None), or None outside ComfyUI
+    """
+    try:
+        import comfy.utils
+        from server import PromptServer
+    except ImportError:
+        return None
+
+    server = getattr(PromptServer, "instance", None)
+    send_text = getattr(server, "send_progress_text", None) if unique_id is not None else None
+    return comfy.utils.ProgressBar(total), send_text
+
+
+def _progress_reporter(unique_id, max_new_tokens):
+    """
+    Build an on_progress callback that streams generation to the ComfyUI frontend
+
+    Tokens advance the node's progress bar; the partial text and decode rate
+    are pushed over the websocket as the node's progress text (throttled).
+    Either part is skipped when the running ComfyUI doesn't provide it.
+
+    Returns:
+        Callback(text, tokens, tokens_per_s, done), or None outside ComfyUI
+    """
+    channel = _progress_channel(unique_id, max_new_tokens)
+    if channel is None:
+        return None
+
+    progress_bar, send_text = channel
+    last_sent = [0.0]
+
+    def report(text, tokens, tokens_per_s, done):
+        try:
+            progress_bar.update_absolute(max_new_tokens if done else min(tokens, max_new_tokens), max_new_tokens)
+
+            now = time.monotonic()
+            if send_text is None or (not done and now - last_sent[0] < PROGRESS_TEXT_INTERVAL_S):
+                return
+            last_sent[0] = now
+            status = "done" if done else "generating"
+            send_text(f"{status} · {tokens} tokens · {tokens_per_s:.1f} tok/s\n\n{text}", unique_id)
+        except Exception as e:
+            # The UI is best effort; never let it break generation
+            logger.debug(f"Progress update failed: {e}")
+
+    return report
+
+
+def _window_reporter(unique_id, total_windows, format_timeline):
+    """
+    Build an on_window callback that shows windowed results as they finish
+
+    Each finished window advances the progress bar (the merge pass is the last
+    step) and the timeline so far is pushed as the node's progress text.
+
+    Args:
+        unique_id: Node id for progress messages
+        total_windows: Number of windows, for the progress bar
+        format_timeline: Formatter for the window results so far
+
+    Returns:
+        Callback(window result), or None outside ComfyUI
+    """
+    channel = _progress_channel(unique_id, total_windows + 1)
+    if channel is None:
+        return None
+
+    progress_bar, send_text = channel
+    results = []
+
+    def report(result):
+        try:
+            results.append(result)
+            progress_bar.update_absolute(len(results), total_windows + 1)
+            if send_text is not None:
+                status = "merging" if len(results) >= total_windows else "describing"
+                send_text(f"{status} · window {len(results)}/{total_windows}\n\n{format_timeline(results)}",
+                          unique_id)
+        except Exception as e:
+            logger.debug(f"Progress update failed: {e}")
+
+    return report
+
+
+def _first(values, default):
+    """First value of an INPUT_IS_LIST input, or default when it wasn't connected"""
+    if values is None or len(values) == 0:
+        return default
+    return values[0]
+
+
+def _start_preload():
+    """
+    Start loading the model in the background if VIDEO_DESCRIPTION_PRELOAD is set
+
+    Only a thread is started here; the model modules (torch, transformers) are
+    imported, the variant resolved and the weights loaded off the import path,
+    so node discovery stays non-blocking.
+    """
+    if not os.environ.get("VIDEO_DESCRIPTION_PRELOAD"):
+        return
+
+    def run():
+        try:
+            ModelCache, _ = _import_qwen3vl()
+            ModelCache.preload_from_env()
+        except Exception as e:
+            logger.warning(f"Model preload could not be started: {e}")
+
+    threading.Thread(target=run, name="Qwen3VLPreloadStart", daemon=True).start()
+
+
 class VideoDescriptionQwen3VL:
     """
-    Video description node using Qwen3-VL-8B-Instruct model
+    Video description node using Qwen3-VL-Instruct (2B/4B/8B, routed by analysis type)
     Generates detailed descriptions of video content
     """
 
@@ -162,6 +409,61 @@ class VideoDescriptionQwen3VL:
             f"Tip: Place videos in ComfyUI/input/ directory or provide absolute path"
         )
 
+    @classmethod
+    def _describe_windowed(cls, VideoProcessor, ModelCache, Qwen3VLInference, resolved_path, video_info, info_text,
+                           prompt, max_tokens, temperature, fps, max_frames, dedup_threshold, use_4bit,
+                           model_size, window_seconds, window_overlap, stream_progress=True,
+                           unique_id=None) -> Tuple[str, str]:
+        """
+        Map-reduce description over overlapping time windows
+
+        Windows are decoded and described one at a time, so peak memory stays
+        flat as duration grows; a final text-only pass merges the results.
+        With stream_progress, each window's text is shown on the node as soon
+        as it is ready.
+
+        Returns:
+            Tuple of (description with per-window timeline, info)
+        """
+        windows = VideoProcessor.iter_windows(
+            resolved_path,
+            window_seconds=window_seconds,
+            overlap_seconds=window_overlap,
+            fps=fps,
+            max_frames_per_window=max_frames
+        )
+        if dedup_threshold:
+            windows = (
+                (start, end) + VideoProcessor.deduplicate_frames(timestamps, frames, threshold=dedup_threshold)[:2]
+                for start, end, timestamps, frames in windows
+            )
+
+        logger.info("Loading Qwen3-VL model...")
+        with ModelCache.lease(use_4bit=use_4bit, model_size=model_size) as (model, processor):
+            info_text += _model_info(ModelCache, use_4bit, model_size)
+            inference = Qwen3VLInference(model, processor)
+
+            on_window = None
+            if stream_progress:
+                total_windows = len(VideoProcessor.compute_windows(
+                    video_info["duration"], window_seconds, window_overlap
+                ))
+                on_window = _window_reporter(unique_id, total_windows, inference.format_timeline)
+
+            description, window_results = inference.generate_windowed(
+                windows,
+                video_fps=video_info["fps"],
+                prompt=prompt,
+                max_new_tokens=max_tokens,
+                temperature=temperature,
+                on_window=on_window
+            )
+
+        timeline = inference.format_timeline(window_results)
+        info_text += f"\nWindows: {len(window_results)} x {window_seconds:g}s ({window_overlap:g}s overlap)"
+
+        return (f"{description}\n\nTimeline:\n{timeline}", info_text)
+
     @classmethod
     def INPUT_TYPES(cls):
         return {
@@ -194,6 +496,57 @@ class VideoDescriptionQwen3VL:
                     "max": 1.0,
                     "step": 0.1
                 }),
+                "sampling_mode": (["uniform", "scene", "keyframes"], {
+                    "default": "uniform"
+                }),
+                "max_frames": ("INT", {
+                    "default": MAX_VIDEO_FRAMES,
+                    "min": 0,
+                    "max": MAX_VIDEO_FRAMES,
+                    "step": 1
+                }),
+                "dedup_threshold": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 32,
+                    "step": 1
+                }),
+                "use_frame_cache": ("BOOLEAN", {
+                    "default": True
+                }),
+                "window_seconds": ("FLOAT", {
+                    "default": 0.0,
+                    "min": 0.0,
+                    "max": 3600.0,
+                    "step": 5.0
+                }),
+                "window_overlap": ("FLOAT", {
+                    "default": 2.0,
+                    "min": 0.0,
+                    "max": 60.0,
+                    "step": 0.5,
+                    "tooltip": "Overlap between windows in seconds; at most half of window_seconds "
+                               "(larger values are clamped)"
+                }),
+                "model_size": (["auto", "2B", "4B", "8B"], {
+                    "default": "auto"
+                }),
+                "stream_progress": ("BOOLEAN", {
+                    "default": True
+                }),
+                "result_cache": (["deterministic", "always", "off"], {
+                    "default": "deterministic"
+                }),
+                "feature_cache": ("BOOLEAN", {
+                    "default": True,
+                    "tooltip": "Reuse the video's vision-encoder output across prompts on the same clip "
+                               "and sampling settings. Features are per model size: with model_size=auto, "
+                               "presets routed to different sizes (summary 2B, keywords 4B, detailed 8B) "
+                               "can't share them, so pick one size to get the reuse."
+                }),
+            },
+            "hidden": {
+                "unique_id": "UNIQUE_ID"
             }
         }
 
@@ -202,7 +555,10 @@ class VideoDescriptionQwen3VL:
     FUNCTION = "describe_video"
     CATEGORY = "video"
 
-    def describe_video(self, video_path, analysis_type, fps, custom_prompt="", use_4bit=False, temperature=0.7):
+    def describe_video(self, video_path, analysis_type, fps, custom_prompt="", use_4bit=False, temperature=0.7,
+                       sampling_mode="uniform", max_frames=MAX_VIDEO_FRAMES, dedup_threshold=0, use_frame_cache=True,
+                       window_seconds=0.0, window_overlap=2.0, model_size="auto", stream_progress=True,
+                       result_cache="deterministic", feature_cache=True, unique_id=None):
         """
         Generate video description using Qwen3-VL
 
@@ -216,11 +572,40 @@ class VideoDescriptionQwen3VL:
             custom_prompt: Optional custom prompt (overrides analysis_type preset)
             use_4bit: Use 4-bit quantization (saves VRAM)
             temperature: Sampling temperature (overrides analysis_type preset if custom_prompt used)
+            sampling_mode: Frame selection (uniform, scene, keyframes); "scene" spends
+                the frame budget where the content changes, "keyframes" decodes
+                intra-coded frames only (fast preview, e.g. for summaries)
+            max_frames: Maximum number of frames sent to the model, spread over the whole
+                video (0 = the processor's cap, MAX_VIDEO_FRAMES)
+            dedup_threshold: Merge frames whose perceptual hashes differ by at most
+                this many bits from the last kept frame (0 = off)
+            use_frame_cache: Reuse decoded frames from the on-disk frame cache
+            window_seconds: Describe the video in overlapping windows of this length
+                and merge the results (0 = single pass); uses uniform sampling and
+                applies max_frames per window
+            window_overlap: Overlap between consecutive windows in seconds (clamped to
+                half of window_seconds)
+            model_size: Qwen3-VL size (2B, 4B, 8B), or "auto" to route by analysis
+                type: summary → 2B, keywords → 4B, detailed and custom prompts → 8B,
+                preferring sizes that are already downloaded
+            stream_progress: Stream partial text and tokens/sec to the node while generating
+                (in windowed mode, each window's description as it finishes)
+            result_cache: Reuse descriptions stored for the same video content and settings:
+                "deterministic" only at temperature 0, "always" also for sampled output,
+                "off" neither reads nor stores
+            feature_cache: Reuse vision-encoder output from earlier runs on the same video,
+                sampling settings and model variant (single-pass mode only)
+            unique_id: Node id (hidden), used to address progress messages
 
         Returns:
             Tuple of (description, info)
         """
         try:
+            max_frames = min(max_frames or MAX_VIDEO_FRAMES, MAX_VIDEO_FRAMES)
+            if window_seconds > 0:
+                # Windows must advance; short windows would otherwise fail in compute_windows
+                window_overlap = min(window_overlap, window_seconds / 2)
+
             # Validate and resolve video path
             video_path = video_path.strip()
             if not video_path:
@@ -236,8 +621,10 @@ class VideoDescriptionQwen3VL:
             VideoProcessor = _import_video_processor()
             ModelCache, Qwen3VLInference = _import_qwen3vl()
 
-            # Validate video file
-            if not VideoProcessor.validate_video(resolved_path):
+            # Validate video file and read metadata in a single open
+            try:
+                video_info = VideoProcessor.probe(resolved_path)
+            except ValueError:
                 return (f"Error: Invalid video file: {resolved_path}", "Video validation failed")
 
             # Get analysis configuration
@@ -247,8 +634,6 @@ class VideoDescriptionQwen3VL:
             if not custom_prompt or not custom_prompt.strip():
                 temperature = config_temperature
 
-            # Get video info
-            video_info = VideoProcessor.get_video_info(resolved_path)
             video_source = Path(resolved_path).name
             info_text = (
                 f"Source: {video_source}\n"
@@ -257,33 +642,105 @@ class VideoDescriptionQwen3VL:
                 f"Duration: {video_info['duration']:.2f}s\n"
                 f"Resolution: {video_info['width']}x{video_info['height']}\n"
                 f"FPS: {video_info['fps']:.2f}\n"
-                f"Sampling: {fps} FPS\n"
+                f"Sampling: {fps} FPS ({sampling_mode})\n"
                 f"Max tokens: {max_tokens}\n"
                 f"Temperature: {temperature:.2f}\n"
                 f"4-bit: {use_4bit}"
             )
+            model_size, size_info = _route_model(ModelCache, analysis_type, custom_prompt, model_size)
+            info_text += size_info
 
             logger.info(f"Processing video: {video_source}")
             logger.info(f"Analysis type: {analysis_type}")
             logger.info(f"Resolved path: {resolved_path}")
             logger.info(f"Video duration: {video_info['duration']:.2f}s")
 
-            # Load model (cached after first load)
-            logger.info("Loading Qwen3-VL model...")
-            model, processor = ModelCache.get_qwen3vl(use_4bit=use_4bit)
+            windowed = window_seconds > 0 and video_info["duration"] > window_seconds
 
-            # Create inference wrapper
-            inference = Qwen3VLInference(model, processor)
+            # A hit returns before any frame is decoded or the model is loaded
+            result_params = {
+                "prompt": prompt,
+                "fps": fps,
+                "max_new_tokens": max_tokens,
+                "temperature": temperature,
+                "sampling_mode": "uniform" if windowed else sampling_mode,
+                "max_frames": max_frames,
+                "dedup_threshold": dedup_threshold,
+                "window": [window_seconds, window_overlap] if windowed else None,
+                "variant": list(ModelCache.resolve_variant(use_4bit=use_4bit, model_size=model_size)),
+            }
+            cache, result_key, cached = _lookup_result(result_cache, resolved_path, result_params)
+            if cached is not None:
+                return (cached, info_text + "\nResult cache: hit (model not loaded)")
 
-            # Generate description
-            description = inference.generate_description(
-                video_path=resolved_path,
-                prompt=prompt,
-                max_new_tokens=max_tokens,
+            if windowed:
+                description, info_text = self._describe_windowed(
+                    VideoProcessor, ModelCache, Qwen3VLInference, resolved_path, video_info, info_text,
+                    prompt, max_tokens, temperature, fps, max_frames, dedup_threshold, use_4bit,
+                    model_size, window_seconds, window_overlap, stream_progress, unique_id
+                )
+                _store_result(cache, result_key, description, result_params)
+                return (description, info_text)
+
+            # Decode once with our own pipeline; the processor gets the frames directly
+            frame_cache = _import_frame_cache().default() if use_frame_cache else None
+            cache_hits = frame_cache.hits if frame_cache else 0
+            timestamps, frames = VideoProcessor.extract_frames_array(
+                resolved_path,
                 fps=fps,
-                temperature=temperature
+                max_frames=max_frames,
+                sampling_mode=sampling_mode,
+                cache=frame_cache,
+                spread=True
             )
+            if len(frames) == 0:
+                return (f"Error: No frames could be decoded from: {resolved_path}", info_text)
+
+            sampled_count = len(frames)
+            if dedup_threshold:
+                timestamps, frames, _ = VideoProcessor.deduplicate_frames(
+                    timestamps, frames, threshold=dedup_threshold
+                )
 
+            info_text += f"\nFrames: {len(frames)} at {frames.shape[2]}x{frames.shape[1]}"
+            if len(frames) < sampled_count:
+                info_text += f" ({sampled_count - len(frames)} near-duplicates merged)"
+            if frame_cache is not None:
+                info_text += f"\nFrame cache: {'hit' if frame_cache.hits > cache_hits else 'miss'}"
+
+            feature_key = None
+            if feature_cache:
+                feature_key = _feature_key(resolved_path, {
+                    key: result_params[key]
+                    for key in ("fps", "sampling_mode", "max_frames", "dedup_threshold", "variant")
+                })
+
+            # Load model (cached after first load), leased so it stays put during generation
+            logger.info("Loading Qwen3-VL model...")
+            with ModelCache.lease(use_4bit=use_4bit, model_size=model_size) as (model, processor):
+                info_text += _model_info(ModelCache, use_4bit, model_size)
+
+                # Create inference wrapper
+                features = _import_feature_cache().default() if feature_key else None
+                inference = Qwen3VLInference(model, processor, feature_cache=features)
+                feature_hits = features.hits if features else 0
+
+                # Generate description
+                with inference.visual_features_key(feature_key):
+                    description = inference.generate_description(
+                        prompt=prompt,
+                        max_new_tokens=max_tokens,
+                        temperature=temperature,
+                        frames=frames,
+                        timestamps=timestamps,
+                        video_fps=video_info["fps"],
+                        on_progress=_progress_reporter(unique_id, max_tokens) if stream_progress else None
+                    )
+
+            if features is not None:
+                info_text += f"\nVision features: {'cached' if features.hits > feature_hits else 'encoded'}"
+
+            _store_result(cache, result_key, description, result_params)
             return (description, info_text)
 
         except FileNotFoundError as e:
@@ -297,12 +754,365 @@ class VideoDescriptionQwen3VL:
             return (f"Error: {error_msg}", f"Exception: {type(e).__name__}")
 
 
+class VideoDescriptionFromImagesQwen3VL:
+    """
+    Video description node for an in-memory IMAGE batch
+    Feeds frames from an upstream loader or generator straight to Qwen3-VL
+    without writing a video file
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "images": ("IMAGE",),
+                "source_fps": ("FLOAT", {
+                    "default": 24.0,
+                    "min": 0.1,
+                    "max": 240.0,
+                    "step": 0.1
+                }),
+                "analysis_type": (["detailed", "summary", "keywords"], {
+                    "default": "detailed"
+                }),
+                "fps": ("FLOAT", {
+                    "default": 1.0,
+                    "min": 0.0,
+                    "max": 240.0,
+                    "step": 0.1
+                }),
+            },
+            "optional": {
+                "custom_prompt": ("STRING", {
+                    "default": "",
+                    "multiline": True
+                }),
+                "use_4bit": ("BOOLEAN", {
+                    "default": False
+                }),
+                "temperature": ("FLOAT", {
+                    "default": 0.7,
+                    "min": 0.0,
+                    "max": 1.0,
+                    "step": 0.1
+                }),
+                "model_size": (["auto", "2B", "4B", "8B"], {
+                    "default": "auto"
+                }),
+                "stream_progress": ("BOOLEAN", {
+                    "default": True
+                }),
+                "max_frames": ("INT", {
+                    "default": MAX_VIDEO_FRAMES,
+                    "min": 0,
+                    "max": MAX_VIDEO_FRAMES,
+                    "step": 1
+                }),
+            },
+            "hidden": {
+                "unique_id": "UNIQUE_ID"
+            }
+        }
+
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("description", "info")
+    FUNCTION = "describe_images"
+    CATEGORY = "video"
+
+    def describe_images(self, images, source_fps, analysis_type, fps, custom_prompt="", use_4bit=False,
+                        temperature=0.7, model_size="auto", stream_progress=True, max_frames=MAX_VIDEO_FRAMES,
+                        unique_id=None):
+        """
+        Generate video description from an IMAGE batch using Qwen3-VL
+
+        Args:
+            images: ComfyUI IMAGE tensor shaped (B, H, W, 3), float in [0, 1]
+            source_fps: Frame rate of the batch, used for timestamps
+            analysis_type: Type of analysis (detailed, summary, keywords)
+            fps: Frames per second to sample from the batch (0 = every frame)
+            custom_prompt: Optional custom prompt (overrides analysis_type preset)
+            use_4bit: Use 4-bit quantization (saves VRAM)
+            temperature: Sampling temperature (overrides analysis_type preset if custom_prompt used)
+            model_size: Qwen3-VL size (2B, 4B, 8B), or "auto" to route by analysis type
+            stream_progress: Stream partial text and tokens/sec to the node while generating
+            max_frames: Maximum number of frames sent to the model, spread over the whole
+                batch (0 = the processor's cap, MAX_VIDEO_FRAMES)
+            unique_id: Node id (hidden), used to address progress messages
+
+        Returns:
+            Tuple of (description, info)
+        """
+        try:
+            max_frames = min(max_frames or MAX_VIDEO_FRAMES, MAX_VIDEO_FRAMES)
+
+            if images is None or images.shape[0] == 0:
+                return ("Error: Image batch is empty", "No frames")
+
+            VideoProcessor = _import_video_processor()
+            ModelCache, Qwen3VLInference = _import_qwen3vl()
+
+            prompt, max_tokens, config_temperature = VideoDescriptionQwen3VL._get_analysis_prompt(
+                analysis_type, custom_prompt
+            )
+            if not custom_prompt or not custom_prompt.strip():
+                temperature = config_temperature
+
+            total_frames = images.shape[0]
+            indices = VideoProcessor.compute_sample_indices(total_frames, source_fps, fps, max_frames, spread=True)
+
+            # Frames stay float in [0, 1]; the processor skips its own rescale
+            frames = images if len(indices) == total_frames else images[indices]
+            timestamps = np.asarray(indices, dtype=np.float64) / source_fps
+
+            info_text = (
+                f"Source: IMAGE batch\n"
+                f"Type: {analysis_type}\n"
+                f"Duration: {total_frames / source_fps:.2f}s\n"
+                f"Resolution: {images.shape[2]}x{images.shape[1]}\n"
+                f"FPS: {source_fps:.2f}\n"
+                f"Sampling: {fps} FPS\n"
+                f"Frames: {len(indices)} of {total_frames}\n"
+                f"Max tokens: {max_tokens}\n"
+                f"Temperature: {temperature:.2f}\n"
+                f"4-bit: {use_4bit}"
+            )
+            model_size, size_info = _route_model(ModelCache, analysis_type, custom_prompt, model_size)
+            info_text += size_info
+
+            logger.info("Loading Qwen3-VL model...")
+            with ModelCache.lease(use_4bit=use_4bit, model_size=model_size) as (model, processor):
+                info_text += _model_info(ModelCache, use_4bit, model_size)
+                inference = Qwen3VLInference(model, processor)
+
+                description = inference.generate_description(
+                    prompt=prompt,
+                    max_new_tokens=max_tokens,
+                    temperature=temperature,
+                    frames=frames,
+                    timestamps=timestamps,
+                    video_fps=source_fps,
+                    on_progress=_progress_reporter(unique_id, max_tokens) if stream_progress else None
+                )
+
+            return (description, info_text)
+
+        except Exception as e:
+            error_msg = f"Error during inference: {str(e)}"
+            logger.error(error_msg)
+            return (f"Error: {error_msg}", f"Exception: {type(e).__name__}")
+
+
+class VideoDescriptionBatchQwen3VL:
+    """
+    Batched video description node
+    Describes a list of videos with one generate call per batch of similar
+    length; descriptions come out as a list in input order
+    """
+
+    # ComfyUI passes every input as a list (upstream lists are not iterated node by node)
+    INPUT_IS_LIST = True
+    OUTPUT_IS_LIST = (True, False)
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "video_paths": ("STRING", {
+                    "default": "",
+                    "multiline": True
+                }),
+                "analysis_type": (["detailed", "summary", "keywords"], {
+                    "default": "detailed"
+                }),
+                "fps": ("FLOAT", {
+                    "default": 1.0,
+                    "min": 0.1,
+                    "max": 30.0,
+                    "step": 0.1
+                }),
+            },
+            "optional": {
+                "custom_prompt": ("STRING", {
+                    "default": "",
+                    "multiline": True
+                }),
+                "use_4bit": ("BOOLEAN", {
+                    "default": False
+                }),
+                "temperature": ("FLOAT", {
+                    "default": 0.7,
+                    "min": 0.0,
+                    "max": 1.0,
+                    "step": 0.1
+                }),
+                "max_frames": ("INT", {
+                    "default": 32,
+                    "min": 0,
+                    "max": MAX_VIDEO_FRAMES,
+                    "step": 1
+                }),
+                "use_frame_cache": ("BOOLEAN", {
+                    "default": True
+                }),
+                "model_size": (["auto", "2B", "4B", "8B"], {
+                    "default": "auto"
+                }),
+                "batch_token_budget": ("INT", {
+                    "default": 32768,
+                    "min": 1024,
+                    "max": 1048576,
+                    "step": 1024
+                }),
+                "max_batch_size": ("INT", {
+                    "default": 8,
+                    "min": 1,
+                    "max": 64,
+                    "step": 1
+                }),
+            }
+        }
+
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("descriptions", "info")
+    FUNCTION = "describe_videos"
+    CATEGORY = "video"
+
+    def describe_videos(self, video_paths, analysis_type, fps, custom_prompt=None, use_4bit=None, temperature=None,
+                        max_frames=None, use_frame_cache=None, model_size=None, batch_token_budget=None,
+                        max_batch_size=None):
+        """
+        Generate descriptions for several videos using batched Qwen3-VL inference
+
+        Every input arrives as a list. video_paths may come from an upstream
+        list of strings or a multiline string with one path per line; the
+        other inputs are settings and use their first value.
+
+        Args:
+            video_paths: Video paths (absolute, or relative to ComfyUI/input/)
+            analysis_type: Type of analysis (detailed, summary, keywords)
+            fps: Frames per second for sampling
+            custom_prompt: Optional custom prompt (overrides analysis_type preset)
+            use_4bit: Use 4-bit quantization (saves VRAM)
+            temperature: Sampling temperature (overrides analysis_type preset if custom_prompt used)
+            max_frames: Maximum number of frames per video (0 = the processor's cap)
+            use_frame_cache: Reuse decoded frames from the on-disk frame cache
+            model_size: Qwen3-VL size (2B, 4B, 8B), or "auto" to route by analysis type
+            batch_token_budget: Padded tokens per batch (batch size x (longest prompt + max tokens))
+            max_batch_size: Maximum videos per generate call
+
+        Returns:
+            Tuple of (descriptions in input order, info)
+        """
+        analysis_type = _first(analysis_type, "detailed")
+        fps = _first(fps, 1.0)
+        custom_prompt = _first(custom_prompt, "")
+        use_4bit = _first(use_4bit, False)
+        temperature = _first(temperature, 0.7)
+        max_frames = min(_first(max_frames, 32) or MAX_VIDEO_FRAMES, MAX_VIDEO_FRAMES)
+        use_frame_cache = _first(use_frame_cache, True)
+        model_size = _first(model_size, "auto")
+        batch_token_budget = _first(batch_token_budget, 32768)
+        max_batch_size = _first(max_batch_size, 8)
+
+        paths = [line.strip() for value in video_paths or [] for line in str(value).splitlines() if line.strip()]
+        if not paths:
+            return (["Error: No video paths given"], "Please provide one video filename or path per line")
+
+        try:
+            VideoProcessor = _import_video_processor()
+            ModelCache, Qwen3VLInference = _import_qwen3vl()
+
+            prompt, max_tokens, config_temperature = VideoDescriptionQwen3VL._get_analysis_prompt(
+                analysis_type, custom_prompt
+            )
+            if not custom_prompt or not custom_prompt.strip():
+                temperature = config_temperature
+
+            frame_cache = _import_frame_cache().default() if use_frame_cache else None
+
+            # Only probe here; frames are decoded per packed batch inside generate_batch,
+            # so peak memory doesn't grow with the number of videos. A bad path fails
+            # its own slot, not the batch
+            results = [None] * len(paths)
+            items, positions = [], []
+            for index, path in enumerate(paths):
+                try:
+                    resolved_path = VideoDescriptionQwen3VL._resolve_video_path(path)
+                    video_info = VideoProcessor.probe(resolved_path)
+                except (FileNotFoundError, ValueError) as e:
+                    results[index] = f"Error: {str(e)}"
+                    continue
+
+                num_frames = len(VideoProcessor.compute_sample_indices(
+                    video_info["total_frames"], video_info["fps"], fps, max_frames, spread=True
+                ))
+                items.append({
+                    "load_frames": functools.partial(
+                        VideoProcessor.extract_frames_array,
+                        resolved_path,
+                        fps=fps,
+                        max_frames=max_frames,
+                        cache=frame_cache,
+                        spread=True
+                    ),
+                    "video_fps": video_info["fps"],
+                    "video_shape": (num_frames,) + VideoProcessor.compute_target_size(
+                        video_info["height"], video_info["width"]
+                    ),
+                    "prompt": prompt,
+                    "max_new_tokens": max_tokens,
+                    "temperature": temperature,
+                })
+                positions.append(index)
+
+            info_text = (
+                f"Videos: {len(items)} of {len(paths)} readable\n"
+                f"Type: {analysis_type}\n"
+                f"Sampling: {fps} FPS (max {max_frames} frames)\n"
+                f"Max tokens: {max_tokens}\n"
+                f"Temperature: {temperature:.2f}\n"
+                f"4-bit: {use_4bit}\n"
+                f"Batching: {batch_token_budget} tokens, up to {max_batch_size} videos"
+            )
+            model_size, size_info = _route_model(ModelCache, analysis_type, custom_prompt, model_size)
+            info_text += size_info
+
+            if items:
+                logger.info(f"Loading Qwen3-VL model for {len(items)} videos...")
+                with ModelCache.lease(use_4bit=use_4bit, model_size=model_size) as (model, processor):
+                    info_text += _model_info(ModelCache, use_4bit, model_size)
+                    inference = Qwen3VLInference(model, processor)
+
+                    descriptions = inference.generate_batch(
+                        items,
+                        token_budget=batch_token_budget,
+                        max_batch_size=max_batch_size
+                    )
+
+                for index, description in zip(positions, descriptions):
+                    results[index] = description
+
+            return (results, info_text)
+
+        except Exception as e:
+            error_msg = f"Error during inference: {str(e)}"
+            logger.error(error_msg)
+            return ([f"Error: {error_msg}"] * len(paths), f"Exception: {type(e).__name__}")
+
+
+_start_preload()
+
+
 # Node class mappings for ComfyUI
 NODE_CLASS_MAPPINGS = {
     "VideoDescriptionQwen3VL": VideoDescriptionQwen3VL,
+    "VideoDescriptionFromImagesQwen3VL": VideoDescriptionFromImagesQwen3VL,
+    "VideoDescriptionBatchQwen3VL": VideoDescriptionBatchQwen3VL,
 }
 
 # Display name mappings for ComfyUI UI
 NODE_DISPLAY_NAME_MAPPINGS = {
     "VideoDescriptionQwen3VL": "Video Description (Qwen3-VL)",
+    "VideoDescriptionFromImagesQwen3VL": "Video Description from Images (Qwen3-VL)",
+    "VideoDescriptionBatchQwen3VL": "Video Description Batch (Qwen3-VL)",
 }